@@ -23,6 +23,11 @@ import uuid
 import time
 import string
 import math
+import multiprocessing
+import Queue
+import signal
+import errno
+import resource
 
 from pygraph.classes.digraph import digraph
 
@@ -34,13 +39,24 @@ from synthesis import *
 from library_linker import *
 from constants import *
 from utils import *
+from result_cache import *
+from run_report import *
+
+NB_WORKERS = multiprocessing.cpu_count() # maximum number of processes solving subtrees of the group order tree at once (the process launching the workers included)
+# Slots of the worker processes solving subtrees of the group order tree, shared by all the processes of the run (the workers inherit it), so that the
+# whole tree is solved by at most NB_WORKERS processes at once whatever its depth (see solve_subtrees_in_parallel)
+worker_slots = multiprocessing.BoundedSemaphore(max(NB_WORKERS-1, 0))
+progress_queue = None # queue in which the progress of the synthesis is reported when it runs under resource limits (see synthetize_with_limits)
+KILL_GRACE_TIME = 5 # time (in seconds) left to a process to stop after SIGTERM before it is killed with SIGKILL
     
 #### Solves the synthesis problem for formula and partition when player makes the first move, under a set of options        
-def synthetize(ltl_file, partition_file, player, options):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, tocheck, set_of_winning_strategies, path, filename) = options
+#### If run_info is a dictionary, it is filled with the names of the specs and the values of k and c for which a solution has been found
+def synthetize(ltl_file, partition_file, player, options, run_info=None):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename) = options
     unique_id = uuid.uuid4().hex
     
     start_time = os.times()[4]
+    phase = start_phase("parsing")
     
     # Partition parsing and values extraction
     (inputs, outputs, values_I, values_O, values_not_I, values_not_O, nu, dimension, c_start, c_bound, c_step) = parse_partition(partition_file)
@@ -77,6 +93,8 @@ def synthetize(ltl_file, partition_file, player, options):
     # Formula parsing
     (spec_names, formulas, group_order) = read_formula(ltl_file, nbw_constr)
     nb_spec = len(formulas)
+    end_phase(phase, nb_specs=nb_spec)
+    phase = start_phase("automata construction")
 
     if tool == WRING:
         subprocess.Popen(['mkdir', TMP_PATH])
@@ -125,7 +143,7 @@ def synthetize(ltl_file, partition_file, player, options):
         (tbucw_c_list, alphabet) = automata_construction(formulas, nb_spec,
                 spec_names, partition_file, mp_parameters, player, options, unique_id)
     if tocheck in [UNREAL, BOTH]: # unrealizability checking
-        (tbucw_c_list_unreal, alphabet) = automata_construction(formulas_unreal, nb_spec, spec_names_unreal, partition_unreal, mp_parameters_unreal, player_unreal, options, unique_id)
+        (tbucw_c_list_unreal, alphabet_unreal) = automata_construction(formulas_unreal, nb_spec, spec_names_unreal, partition_unreal, mp_parameters_unreal, player_unreal, options, unique_id)
 
     if tool == WRING:
         subprocess.Popen(['rm', '-rf', TMP_PATH])
@@ -137,10 +155,15 @@ def synthetize(ltl_file, partition_file, player, options):
         
     if nb_tbucw == 1 and chk_method == COMP: # Change chk_method to MONO if there is only one tbucw (user input error protection)
         chk_method = MONO
-        options = (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, tocheck, set_of_winning_strategies, path, filename)
+        options = (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename)
     if tocheck == REAL and nbw_constr == COMP and chk_method == MONO:
         spec_names[0] = "Phi" # rename to display
     tbucw_time = os.times()[4] - start_time
+    if tocheck in [REAL, BOTH]:
+        end_phase(phase, tbucw_sizes=[get_tbucw_size_c(tbucw_c) for tbucw_c in tbucw_c_list])
+    else:
+        end_phase(phase, tbucw_sizes=[get_tbucw_size_c(tbucw_c) for tbucw_c in tbucw_c_list_unreal])
+    phase = start_phase("realizability checking")
     
     # Group order tree building
     if tocheck in [REAL, BOTH]: # realizability checking
@@ -153,37 +176,55 @@ def synthetize(ltl_file, partition_file, player, options):
     # Find a winning strategy
     realizable = False
     unrealizable = False
-    if tocheck in [UNREAL, BOTH]: # Check realizability and unrealizability or only unrealizability (synthesis is done monolithicaly)
-        extract_solution = True
-        c_value = [0]
-        k_value = k_start-k_step
-        while not realizable and not unrealizable: # iterate while we have not prove realizability or unrealizability
-            if k_value == k_bound: # Bound on k reached -> abort computation
-                controled_print("Bound on k reached for spec "+ spec_names[0] +" -> computation aborted (no winning solution within the bound k = " + str(k_bound) + ")\n\n", [MINTEXT, ALLTEXT], verbosity) 
-                break
+    if tocheck == UNREAL: # Only check unrealizability (synthesis is done monolithicaly)
+        (unrealizable, k_value, c_value, solution, sol_extr_time) = sweep_k_values(tbucw_c_list_unreal[0], player_unreal, tree_root_unreal, group_order_tree_unreal, options, mp_parameters)
+        if unrealizable:
+            group_order_tree_unreal.add_node_attribute(tree_root_unreal, ("k_value", k_value))
+            group_order_tree_unreal.add_node_attribute(tree_root_unreal, ("c_value", c_value))
+    elif tocheck == BOTH: # Check realizability and unrealizability in parallel (synthesis is done monolithicaly)
+        queue = multiprocessing.Queue()
+        processes = {}
+        processes[REAL] = multiprocessing.Process(target=sweep_k_values_process, args=(queue, REAL, tbucw_c_list[0], player, tree_root, group_order_tree, options, mp_parameters))
+        processes[UNREAL] = multiprocessing.Process(target=sweep_k_values_process, args=(queue, UNREAL, tbucw_c_list_unreal[0], player_unreal, tree_root_unreal, group_order_tree_unreal, options, mp_parameters))
+        for p in processes.values():
+            p.start()
+        
+        # Wait for the first process proving its side (or for both to give up), then terminate the other one
+        nb_running = len(processes)
+        while nb_running > 0 and not realizable and not unrealizable:
+            try:
+                (side, found, k_value, c_value, solution, sol_extr_time, checks) = queue.get(True, 1)
+            except Queue.Empty: # No answer yet -> check that the processes have not died without answering
+                if queue.empty() and not [p for p in processes.values() if p.is_alive()]:
+                    break
+                continue
+            nb_running -= 1
+            extend_checks(checks)
+            if found and side == REAL:
+                realizable = True
+            elif found:
+                unrealizable = True
+        for p in processes.values():
+            if p.is_alive():
+                p.terminate()
+            p.join()
             
-            k_value = min(k_value+k_step, k_bound)
-                                
-            # Test realizability
-            if tocheck == BOTH:
-                (realizable, solution, sg, sol_extr_time) = test_realizability(tbucw_c_list[0], k_value, c_value, player, tree_root, group_order_tree, options, mp_parameters, extract_solution)
-            # If formula is not realizable for k = k_value, test the unrealizability for the same value of k
-            if not realizable:
-                (unrealizable, solution, sg, sol_extr_time) = test_realizability(tbucw_c_list_unreal[0], k_value, c_value, player_unreal, tree_root_unreal, group_order_tree_unreal, options, mp_parameters, extract_solution)
-                        
         if realizable:
             group_order_tree.add_node_attribute(tree_root, ("k_value", k_value))
             group_order_tree.add_node_attribute(tree_root, ("c_value", c_value))
         elif unrealizable:
             group_order_tree_unreal.add_node_attribute(tree_root_unreal, ("k_value", k_value))
             group_order_tree_unreal.add_node_attribute(tree_root_unreal, ("c_value", c_value))
+        else:
+            solution = None
+            sol_extr_time = 0
     else: # Only check realizability
         if dimension > 0:
             controled_print("First checking realizability of formula without costs\n\n", [MINTEXT, ALLTEXT], verbosity)
             extract_solution = False
             # Forced to apply backward algorithm here to compute all strategies (otherwise, when adding costs on the winning strategies (that is a subset of all 
             # winning strategies) computed by OTFUR, it might be no winning strategies for values of k and c for which there actually are)
-            options_with_back_algo = (tool, opt, critical, verbosity, nbw_constr, chk_method, BACKWARD, k_start, k_bound, k_step, tocheck, set_of_winning_strategies, path, filename)
+            options_with_back_algo = (tool, opt, critical, verbosity, nbw_constr, chk_method, BACKWARD, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename)
             cur_mp_parameters = (inputs, outputs, 0, values_I, values_O, values_not_I, values_not_O, nu, c_start, c_bound, c_step)
             (realizable, solution, sg, sol_extr_time) = find_a_winning_strategy(group_order_tree, tree_root, alphabet, player, options_with_back_algo, cur_mp_parameters, extract_solution)
             
@@ -191,7 +232,8 @@ def synthetize(ltl_file, partition_file, player, options):
                 c_value = dict(group_order_tree.node_attributes(tree_root))["c_value"]
                 controled_print("Formula is realizable -> check if it is still realizable with costs for c = " + str(c_value) + "\n\n", [MINTEXT, ALLTEXT], verbosity)
                 extract_solution = True
-                sg = add_credits_to_safety_game_c(sg, dimension, convert_list_to_c_format(c_value))
+                add_credits_to_safety_game_c(sg, dimension, convert_list_to_c_format(c_value)) # in place (keep the wrappers attached to sg)
+                credits_sg = sg
                 
                 if player == P_I:
                     start_antichain_1 = sg.contents.positions_I
@@ -203,6 +245,8 @@ def synthetize(ltl_file, partition_file, player, options):
                 spec_index = dict(group_order_tree.node_attributes(tree_root))["spec_index"]
                 
                 (realizable, solution, sg, sol_extr_time) = solve_safety_game(start_antichain_1, start_antichain_2, cf_info, alphabet, player, dimension, c_value, spec_index, options, mp_parameters, chk_dir, extract_solution)
+                free_c(credits_sg.release()) # its antichains have been freed by solve_safety_game (as start antichains)
+                close_attached(credits_sg)
                     
                 if not realizable:
                     controled_print("No solution found for spec " + spec_index + " with costs for current k and c values -> start over with higher values of k and c\n\n", [MINTEXT, ALLTEXT], verbosity)
@@ -215,16 +259,24 @@ def synthetize(ltl_file, partition_file, player, options):
 
     check_time = os.times()[4] - start_time - tbucw_time
     total_time = os.times()[4] - start_time
+    end_phase(phase, solution_extraction_time=sol_extr_time)
+    phase = start_phase("solution output")
   
     # Write the solution
     if realizable:
         print_solution(solution, inputs, outputs, player, filename, path, verbosity)
-        if len(solution.nodes()) <= 20:
-            display_solution(solution, inputs, outputs, player, filename, path) 
+        if solution.nb_states <= 20 or is_png_rendering_enabled():
+            display_solution(solution, inputs, outputs, player, filename, path)
+        if is_aig_output_enabled():
+            print_solution_aig(solution, inputs, outputs, player, filename, path)
     elif unrealizable:
         print_solution(solution, outputs, inputs, player_unreal, filename, path, verbosity)
-        if len(solution.nodes()) <= 20:
-            display_solution(solution, outputs, inputs, player_unreal, filename, path)      
+        if solution.nb_states <= 20 or is_png_rendering_enabled():
+            display_solution(solution, outputs, inputs, player_unreal, filename, path)
+        if is_aig_output_enabled():
+            print_solution_aig(solution, outputs, inputs, player_unreal, filename, path)
+    
+    end_phase(phase)
     
     # Print stats and finish
     if realizable:
@@ -235,6 +287,26 @@ def synthetize(ltl_file, partition_file, player, options):
         if tocheck == UNREAL:
             group_order_tree = group_order_tree_unreal
         print_stats(verbosity, tbucw_time, check_time, sol_extr_time, total_time, realizable, unrealizable, solution, player, group_order_tree, spec_names, nb_tbucw, dimension)
+        
+    result_info = {"realizable": realizable, "unrealizable": unrealizable}
+    if realizable:
+        result_info["spec_names"] = spec_names
+        (result_info["k_values"], result_info["c_values"]) = get_specs_k_and_c_values(group_order_tree, spec_names, nb_tbucw)
+    elif unrealizable:
+        result_info["spec_names"] = spec_names_unreal
+        (result_info["k_values"], result_info["c_values"]) = get_specs_k_and_c_values(group_order_tree_unreal, spec_names_unreal, nb_tbucw)
+    if realizable or unrealizable:
+        result_info["solution_size"] = solution.nb_states
+        result_info["solution_size_before_minimization"] = solution.nb_states_before_minimization
+    set_report_result(**result_info)
+    if run_info != None:
+        run_info.update(result_info)
+    
+    # Free the C structures (the tbUCWs before their alphabet)
+    if tocheck in [REAL, BOTH]:
+        free_automata(group_order_tree, tbucw_c_list, alphabet)
+    if tocheck in [UNREAL, BOTH]:
+        free_automata(group_order_tree_unreal, tbucw_c_list_unreal, alphabet_unreal)
     return (realizable != unrealizable, realizable)
               
 #### Opens the partition file and fills the inputs and outputs lists and read the optional values for mean-payoff objective        
@@ -508,11 +580,11 @@ def inverse_partition(inputs, outputs):
 
 #### Constructs an automaton UCW (digraph python) for each formula, applies optimization 0 and 1 considering opt parameter and builds equivalent tbUCW automaton (in C) (one for each formula if chk_method == COMP)    
 def automata_construction(formulas, nb_spec, spec_names, partition, mp_parameters, player, options, unique_id):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_winning_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_winning_strategies, warm_start, path, filename) = options
     (inputs, outputs, dimension, values_I, values_O, values_not_I, values_not_O, nu, c_start, c_bound, c_step) = mp_parameters
 
     # Build the alphabet
-    alphabet = build_alphabet(inputs, outputs)
+    alphabet = OwnedAlphabetInfo(build_alphabet(inputs, outputs), inputs, outputs)
 
     # Build the weight functions
     (weight_function_I, weight_function_O) = build_weight_functions(inputs, outputs, alphabet, mp_parameters, options)
@@ -537,10 +609,10 @@ def automata_construction(formulas, nb_spec, spec_names, partition, mp_parameter
     # tbUCW construction    
     tbucw_c_list = [] 
     if chk_method == MONO: 
-        tbucw_c_list.append(build_tbucw(ucw_python, accepting_states, alphabet, inputs, outputs, player, weight_function_I, weight_function_O, dimension))
+        tbucw_c_list.append(OwnedTBUCW(build_tbucw(ucw_python, accepting_states, alphabet, inputs, outputs, player, weight_function_I, weight_function_O, dimension), alphabet))
     else: 
         for i in range(nb_spec):       
-            tbucw_c_list.append(build_tbucw(ucw_python[i], accepting_states[i], alphabet, inputs, outputs, player, weight_function_I, weight_function_O, dimension))
+            tbucw_c_list.append(OwnedTBUCW(build_tbucw(ucw_python[i], accepting_states[i], alphabet, inputs, outputs, player, weight_function_I, weight_function_O, dimension), alphabet))
 
     if nbw_constr == COMP and chk_method == MONO:
         spec_names[0] = "Phi" # rename to display
@@ -688,10 +760,122 @@ def build_group_order_tree(group_order, spec_names, tbucw_c_list):
 
     return (group_order_tree, root)
 
+#### Frees the tbUCWs of tbucw_c_list, their alphabet and the fix points still kept for warm start in the nodes of group_order_tree
+def free_automata(group_order_tree, tbucw_c_list, alphabet):
+    for node in group_order_tree.nodes():
+        warm_start_sg = dict(group_order_tree.node_attributes(node)).get("warm_start_sg", None)
+        if warm_start_sg != None:
+            group_order_tree.add_node_attribute(node, ("warm_start_sg", None))
+            warm_start_sg.close()
+    for tbucw_c in tbucw_c_list:
+        tbucw_c.close()
+    alphabet.close()
+
+
+#### Iterates on the values of k (monolithicaly and without costs) until a winning strategy is found for tbucw_c when player starts, or until k_bound is reached
+def sweep_k_values(tbucw_c, player, tree_root, group_order_tree, options, mp_parameters):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename) = options
+    
+    extract_solution = True
+    grid = k_c_grid(k_start, k_bound, k_step, [0], [0], [0])
+    def test(i):
+        (k_value, c_value) = grid[i]
+        return test_realizability(tbucw_c, k_value, c_value[:], player, tree_root, group_order_tree, options, mp_parameters, extract_solution)
+    def discard(result):
+        pass # the solutions have already been extracted (nothing to free)
+    
+    (winning_strategy, i, result) = search_minimal_index(test, discard, 0, len(grid), k_search, k_budget, verbosity)
+    if not winning_strategy: # Bound on k reached -> abort computation
+        controled_print("Bound on k reached for spec "+ tree_root +" -> computation aborted (no winning solution within the bound k = " + str(k_bound) + ")\n\n", [MINTEXT, ALLTEXT], verbosity) 
+        return (False, k_bound, [0], None, 0)
+    
+    (winning_strategy, solution, sg, sol_extr_time) = result
+    (k_value, c_value) = grid[i]
+    return (winning_strategy, k_value, c_value, solution, sol_extr_time)
+
+#### Returns the list of the values of (k, c) which can be tested: the i-th element is (k_start+i*k_step, c_start+i*c_step), where the values are bounded by k_bound and c_bound
+def k_c_grid(k_start, k_bound, k_step, c_start, c_bound, c_step):
+    grid = []
+    i = 0
+    while True:
+        k_value = min(k_start+i*k_step, k_bound)
+        c_value = []
+        for j in range(len(c_bound)):
+            c_value.append(min(c_start[j]+i*c_step[j], c_bound[j]))
+        if len(grid) > 0 and grid[-1] == (k_value, c_value): # bounds reached (or null steps)
+            break
+        grid.append((k_value, c_value))
+        i += 1
+    return grid
+
+#### Searches the smallest index i >= i_start (of a grid of values of k and c built by k_c_grid) for which test(i) finds a winning strategy, according to k_search:
+####   - LINEAR: the indices are tested one by one
+####   - GALLOP: the gap between two tested indices is doubled until a winning strategy is found, then the interval between the last losing and the winning indices is bisected
+####   - ADAPTIVE: as GALLOP, but the gap is the largest one (at most the double of the previous gap) for which the time of the next test, extrapolated from the 
+####     growth of the time of the previous losing tests, remains within k_budget seconds
+#### As realizability is monotonic in k and c, the three methods return the same index
+#### test(i) returns a tuple of which first element tells if a winning strategy has been found, discard(result) frees a result of test which is not needed anymore
+#### Returns (found, index, result of test for that index)
+def search_minimal_index(test, discard, i_start, nb_indices, k_search, k_budget, verbosity):
+    losing_index = i_start-1 # greatest index for which no winning strategy has been found
+    winning_index = -1 # smallest index for which a winning strategy has been found
+    result = None
+    times = [] # (index, time) of the tests
+    gap = 1
+    i = i_start
+    
+    # Find a winning index
+    while i < nb_indices:
+        start_time = os.times()[4]
+        cur_result = test(i)
+        times.append((i, os.times()[4]-start_time))
+        if cur_result[0]:
+            (winning_index, result) = (i, cur_result)
+            break
+        losing_index = i
+        
+        if losing_index == nb_indices-1:
+            break
+        
+        if k_search == ADAPTIVE and gap > 1: # Reduce the gap while the extrapolated time of the next test exceeds the budget
+            (cur_index, cur_time) = times[-1]
+            growth = 2.
+            if len(times) > 1 and times[-2][1] > 0 and cur_time > 0:
+                (prev_index, prev_time) = times[-2]
+                growth = max(1., (cur_time/prev_time)**(1./(cur_index-prev_index))) # growth of the time of a test by index
+            while gap > 1 and cur_time*(growth**gap) > k_budget:
+                gap = gap/2
+        i = min(losing_index+gap, nb_indices-1)
+        if k_search != LINEAR:
+            controled_print("Search of k: jump to the values of k and c of index " + str(i) + "\n", [ALLTEXT, MINTEXT], verbosity)
+            gap = 2*gap
+        
+    if winning_index == -1:
+        return (False, -1, None)
+    
+    # Bisect between the last losing index and the winning index
+    while winning_index-losing_index > 1:
+        i = (losing_index+winning_index)/2
+        controled_print("Search of k: bisection between indices " + str(losing_index) + " and " + str(winning_index) + "\n", [ALLTEXT, MINTEXT], verbosity)
+        cur_result = test(i)
+        if cur_result[0]:
+            discard(result)
+            (winning_index, result) = (i, cur_result)
+        else:
+            losing_index = i
+    
+    return (True, winning_index, result)
+
+#### Target of the processes launched when realizability and unrealizability are checked in parallel: runs sweep_k_values and puts its result in queue, tagged by side (REAL or UNREAL)
+def sweep_k_values_process(queue, side, tbucw_c, player, tree_root, group_order_tree, options, mp_parameters):
+    take_checks() # fix point computations of the parent process
+    (found, k_value, c_value, solution, sol_extr_time) = sweep_k_values(tbucw_c, player, tree_root, group_order_tree, options, mp_parameters)
+    sys.stdout.flush()
+    queue.put((side, found, k_value, c_value, solution, sol_extr_time, take_checks()))
 
 #### Recursive method which computes a winning strategy according to a tree of which leafs corresponds to tbucw, starting from node tree_node
 def find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, options, mp_parameters, extract_solution):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_winning_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_winning_strategies, warm_start, path, filename) = options
     (inputs, outputs, dimension, values_I, values_O, values_not_I, values_not_O, nu, c_start, c_bound, c_step) = mp_parameters
     
     # If tree_node is a leaf: find a winning strategy for its associated spec monolithicaly
@@ -704,37 +888,33 @@ def find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, optio
             print "No tbUCW ?"
             exit(0) 
         
-        # If we have already found a winning strategy for this spec, try with a higher value of K, otherwise, start with 0
+        # If we have already found a winning strategy for this spec, try with higher values of k and c, otherwise, start with k_start and c_start
+        grid = k_c_grid(k_start, k_bound, k_step, c_start, c_bound, c_step)
         try:
-            k_value = dict(group_order_tree.node_attributes(tree_node))["k_value"]
-            c_value = dict(group_order_tree.node_attributes(tree_node))["c_value"]
+            i_start = dict(group_order_tree.node_attributes(tree_node))["k_index"]+1
         except KeyError:
-            k_value = k_start-k_step
-            c_value = []
-            for i in range(len(c_bound)):
-                c_value.append(c_start[i]-c_step[i])
-            
-        winning_strategy = False
-        sg = None
-        while not winning_strategy:
-            if k_value == k_bound and c_value == c_bound: # Bound on k and c reached -> abort computation
-                controled_print("Bound on k and c reached for spec "+ tree_node +" -> computation aborted (no winning solution within the bounds k = " + str(k_bound) + " and c = " + str(c_bound) + ")\n\n", [MINTEXT, ALLTEXT], verbosity) 
-                return (False, None, None, 0)
-                
-            k_value = min(k_value+k_step, k_bound) 
-            for i in range(len(c_bound)):
-                c_value[i] = min(c_value[i]+c_step[i], c_bound[i])
-                  
-            # Free previously computed fix point
+            i_start = 0
+        
+        # Test realizability for the i-th values of k and c
+        def test(i):
+            (k_value, c_value) = grid[i]
+            return test_realizability(tbucw_c, k_value, c_value[:], player, tree_node, group_order_tree, options, mp_parameters, extract_solution)
+        # Free a fix point which is not needed anymore (a winning strategy has been found for smaller values of k and c)
+        def discard(result):
+            sg = result[2]
             if sg != None:
-                free_antichain_full_c(sg.contents.positions_O, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
-                free_antichain_full_c(sg.contents.positions_I, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
-                
-            # Test realizability
-            (winning_strategy, solution, sg, sol_extr_time) = test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order_tree, options, mp_parameters, extract_solution)
-            
+                sg.close()
+        
+        (winning_strategy, i, result) = search_minimal_index(test, discard, i_start, len(grid), k_search, k_budget, verbosity)
+        if not winning_strategy: # Bound on k and c reached -> abort computation
+            controled_print("Bound on k and c reached for spec "+ tree_node +" -> computation aborted (no winning solution within the bounds k = " + str(k_bound) + " and c = " + str(c_bound) + ")\n\n", [MINTEXT, ALLTEXT], verbosity) 
+            return (False, None, None, 0)
+        
+        (winning_strategy, solution, sg, sol_extr_time) = result
+        (k_value, c_value) = grid[i]
+        group_order_tree.add_node_attribute(tree_node, ("k_index", i))
         group_order_tree.add_node_attribute(tree_node, ("k_value", k_value))
-        group_order_tree.add_node_attribute(tree_node, ("c_value", c_value))
+        group_order_tree.add_node_attribute(tree_node, ("c_value", c_value[:]))
         return (winning_strategy, solution, sg, sol_extr_time)
     
     # If tree_node is not a leaf: find a winning strategy recursively
@@ -745,24 +925,28 @@ def find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, optio
         start_antichains_PI = (POINTER(Antichain)*nb_sons)(None)
         cfs_info = (POINTER(GNode)*nb_sons)(None)
 
-        i = 0
-        # Compute the fix point for each son and compose them
-        sons_c_values = []
-        for son in group_order_tree.neighbors(tree_node):
-            (winning_strategy, cur_solution, cur_sg, sol_extr_time) = find_a_winning_strategy(group_order_tree, son, alphabet, player, options, mp_parameters, extract_solution)
-            
+        if nb_sons == 1:
+            print "Only one son?"
+            exit(0)
+
+        # Compute the fix point for each son (in worker processes) and compose them
+        sons = group_order_tree.neighbors(tree_node)
+        sons_results = solve_subtrees_in_parallel(group_order_tree, sons, alphabet, player, options, mp_parameters, extract_solution)
+        for (winning_strategy, serialized_PO, serialized_PI) in sons_results:
             if not winning_strategy:
                 return (False, None, None, 0)
-            
+
+        sons_c_values = []
+        owned_tbucws = [] # tbUCWs optimized by opt2 over which the composed fix point is defined
+        for i in range(nb_sons):
+            son = sons[i]
+            (winning_strategy, serialized_PO, serialized_PI) = sons_results[i]
             spec_index += str(dict(group_order_tree.node_attributes(son))["spec_index"]) + " "
             sons_c_values.append(dict(group_order_tree.node_attributes(son))["c_value"])
 
-            start_antichains_PO[i] = cur_sg.contents.positions_O
-            start_antichains_PI[i] = cur_sg.contents.positions_I
-
-            cfs_info[i] = get_link_data_c(cur_sg.contents.positions_O.contents.incomparable_elements).contents.cf.contents.info
-
-            i += 1
+            cfs_info[i] = rebuild_cf_info(group_order_tree, son, owned_tbucws)
+            start_antichains_PO[i] = deserialize_antichain(serialized_PO, cfs_info[i])
+            start_antichains_PI[i] = deserialize_antichain(serialized_PI, cfs_info[i])
 
         if len(c_start) == 0:
             c_value = [0]
@@ -774,27 +958,26 @@ def find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, optio
         group_order_tree.add_node_attribute(tree_node, ("c_value", c_value))
         
         # Build the start antichains
-        if nb_sons > 1:
-            cf_info = compose_cf_info_c(cfs_info, nb_sons)
-            if player == P_O:
-                start_antichain1 = compose_antichains_c(start_antichains_PO, nb_sons, COMPOSE_TUPLES_FUNC(compose_tuples_c), cf_info)
-                start_antichain2 = compose_antichains_c(start_antichains_PI, nb_sons, COMPOSE_TUPLES_FUNC(compose_tuples_c), cf_info)
-            else:
-                start_antichain1 = compose_antichains_c(start_antichains_PI, nb_sons, COMPOSE_TUPLES_FUNC(compose_tuples_c), cf_info)
-                start_antichain2 = compose_antichains_c(start_antichains_PO, nb_sons, COMPOSE_TUPLES_FUNC(compose_tuples_c), cf_info)
-            
-            # Free the former fix points    
-            for a in start_antichains_PO:
-                free_antichain_full_c(a, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
-            for a in start_antichains_PI:
-                free_antichain_full_c(a, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
+        cf_info = compose_cf_info_c(cfs_info, nb_sons)
+        if player == P_O:
+            start_antichain1 = compose_antichains_c(start_antichains_PO, nb_sons, COMPOSE_TUPLES_C_FUNC, cf_info)
+            start_antichain2 = compose_antichains_c(start_antichains_PI, nb_sons, COMPOSE_TUPLES_C_FUNC, cf_info)
         else:
-            print "Only one son?"
-            exit(0)
+            start_antichain1 = compose_antichains_c(start_antichains_PI, nb_sons, COMPOSE_TUPLES_C_FUNC, cf_info)
+            start_antichain2 = compose_antichains_c(start_antichains_PO, nb_sons, COMPOSE_TUPLES_C_FUNC, cf_info)
+        
+        # Free the former fix points    
+        for a in start_antichains_PO:
+            free_antichain_full_c(a, FREE_TUPLE_FULL_C_FUNC)
+        for a in start_antichains_PI:
+            free_antichain_full_c(a, FREE_TUPLE_FULL_C_FUNC)
                 
         spec_index = spec_index[0:len(spec_index)-1]+")"
         group_order_tree.add_node_attribute(tree_node, ("spec_index", spec_index))
         controled_print("Composition of fix points of specs " + str(spec_index)+"\n", [ALLTEXT, MINTEXT], verbosity)
+        add_check(node=tree_node, spec=spec_index, c=c_value, composition=True)
+        (start_wall, start_cpu) = report_clock()
+        reset_solver_stats_c()
             
         if chk_dir == FORWARD and len(group_order_tree.incidents(tree_node)) == 0: # Root -> Forward algorithm (OTFUR)
             sg = otfur(start_antichain1, start_antichain2, cf_info, alphabet, player, dimension, convert_list_to_c_format(c_value), options)
@@ -808,10 +991,16 @@ def find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, optio
             sol_extr_time = 0
             winning_strategy = has_a_winning_strategy_c(sg, alphabet, player)
             if not winning_strategy: # no winning strategy -> free the fix point
-                free_antichain_full_c(sg.contents.positions_O, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
-                free_antichain_full_c(sg.contents.positions_I, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
+                sg.close()
                 sg = None
+        for owned in owned_tbucws:
+            if sg != None:
+                attach_owned(sg, owned)
+            else:
+                owned.close()
 
+        (wall, cpu) = report_clock()
+        update_check(winning=winning_strategy, wall_time=wall-start_wall, cpu_time=cpu-start_cpu, solver_stats=get_solver_stats())
         if winning_strategy:
             controled_print("Solution found for composition of specs " + str(spec_index)+"\n\n", [ALLTEXT, MINTEXT], verbosity)
         else:
@@ -824,17 +1013,147 @@ def find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, optio
         else:
             return find_a_winning_strategy(group_order_tree, tree_node, alphabet, player, options, mp_parameters, extract_solution)  
 
+#### Computes a winning strategy for each subtree of group_order_tree rooted in a node of sons, in worker processes if there are free worker slots (see
+#### worker_slots), otherwise in this process
+#### Returns, for each son, whether a winning strategy has been found and the serialized fix point antichains (see serialize_antichain)
+#### The attributes computed by the workers for the nodes of the subtrees (k_value, c_value, spec_index,...) are copied in group_order_tree
+#### If a worker dies, the other workers are stopped and the process exits with status 1
+def solve_subtrees_in_parallel(group_order_tree, sons, alphabet, player, options, mp_parameters, extract_solution):
+    queue = multiprocessing.Queue()
+    results = len(sons)*[None]
+    waiting = range(len(sons))
+    running = {}
+    try:
+        while len(waiting) > 0 or len(running) > 0:
+            # Launch new workers while there are free slots
+            while len(waiting) > 0 and worker_slots.acquire(False):
+                i = waiting.pop(0)
+                running[i] = multiprocessing.Process(target=solve_subtree_process, args=(queue, i, group_order_tree, sons[i], alphabet, player, options, mp_parameters, extract_solution))
+                running[i].start()
+
+            # No free slot -> solve a subtree in this process instead of waiting
+            if len(waiting) > 0:
+                i = waiting.pop(0)
+                results[i] = solve_subtree(group_order_tree, sons[i], alphabet, player, options, mp_parameters, extract_solution)[0:3]
+                continue
+
+            # Wait for a worker to finish (results must be read before joining the process)
+            try:
+                (i, winning_strategy, serialized_PO, serialized_PI, subtree_attributes, checks) = queue.get(True, 1)
+            except Queue.Empty: # No answer yet -> check that the workers have not died without answering
+                dead = [j for j in running if not running[j].is_alive()]
+                if queue.empty() and len(dead) > 0:
+                    print "A worker process died while computing the fix point of a subtree (exit code " + str(running[dead[0]].exitcode) + ")"
+                    sys.stdout.flush()
+                    exit(1)
+                continue
+            running.pop(i).join()
+            worker_slots.release()
+            extend_checks(checks)
+
+            for (node, attributes) in subtree_attributes:
+                for attribute in attributes:
+                    group_order_tree.add_node_attribute(node, attribute)
+            results[i] = (winning_strategy, serialized_PO, serialized_PI)
+    finally: # Stop the workers still running (a worker has died or this process is stopped)
+        stop_workers(running.values())
+
+    return results
+
+#### Stops the worker processes launched by solve_subtrees_in_parallel and frees their slots
+#### They are sent SIGTERM (they then stop their own workers), then SIGKILL if they are still alive after KILL_GRACE_TIME seconds
+def stop_workers(processes):
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    deadline = time.time()+KILL_GRACE_TIME
+    for process in processes:
+        process.join(max(0, deadline-time.time()))
+        if process.is_alive():
+            try:
+                os.kill(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+            process.join()
+        worker_slots.release()
+
+#### Computes a winning strategy for the subtree of group_order_tree rooted in son
+#### Returns whether a winning strategy has been found, the serialized fix point antichains (see serialize_antichain) and the attributes of the nodes of
+#### the subtree (except C structures), which can be sent to another process
+def solve_subtree(group_order_tree, son, alphabet, player, options, mp_parameters, extract_solution):
+    (winning_strategy, solution, sg, sol_extr_time) = find_a_winning_strategy(group_order_tree, son, alphabet, player, options, mp_parameters, extract_solution)
+    
+    serialized_PO = serialized_PI = None
+    if winning_strategy:
+        serialized_PO = serialize_antichain(sg.contents.positions_O)
+        serialized_PI = serialize_antichain(sg.contents.positions_I)
+        sg.close()
+    
+    # Retrieve the attributes of the nodes of the subtree (except C structures which cannot be sent to the parent process)
+    subtree_attributes = []
+    nodes = [son]
+    while len(nodes) > 0:
+        node = nodes.pop()
+        attributes = dict(group_order_tree.node_attributes(node))
+        subtree_attributes.append((node, [(key, attributes[key]) for key in attributes if key not in ["tbucw", "warm_start_sg"]]))
+        nodes.extend(group_order_tree.neighbors(node))
+
+    return (winning_strategy, serialized_PO, serialized_PI, subtree_attributes)
+
+#### Target of the worker processes launched by solve_subtrees_in_parallel: computes a winning strategy for the subtree rooted in son and puts the serialized fix point in queue
+def solve_subtree_process(queue, son_position, group_order_tree, son, alphabet, player, options, mp_parameters, extract_solution):
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1)) # stop the workers of this worker (see solve_subtrees_in_parallel) when stopped between two C calls
+    take_checks() # fix point computations of the parent process
+    (winning_strategy, serialized_PO, serialized_PI, subtree_attributes) = solve_subtree(group_order_tree, son, alphabet, player, options, mp_parameters, extract_solution)
+    sys.stdout.flush()
+    queue.put((son_position, winning_strategy, serialized_PO, serialized_PI, subtree_attributes, take_checks()))
+
+#### Rebuilds the cf_info of the fix point computed (by a worker process) for the subtree rooted in tree_node from the attributes of the nodes of this subtree
+#### The tbUCWs optimized by opt2 are rebuilt from the states removed by the worker (OPT2_removed_states), without detecting the loosing states again
+#### The rebuilt tbUCWs are appended to owned_tbucws (they must live as long as the fix points defined over the cf_info)
+def rebuild_cf_info(group_order_tree, tree_node, owned_tbucws):
+    attributes = dict(group_order_tree.node_attributes(tree_node))
+    if len(group_order_tree.neighbors(tree_node)) == 0:
+        tbucw_c = attributes["tbucw"]
+        k_value = attributes["k_value"]
+        tbucw_c_k = tbucw_c
+        removed_states = attributes.get("OPT2_removed_states", [])
+        if len(removed_states) > 0:
+            reset_tbucw_states_labels_c(tbucw_c)
+            tbucw_c_k = remove_tbucw_states(tbucw_c, removed_states)
+            owned_tbucws.append(OwnedOptimizedTBUCW(tbucw_c_k, tbucw_c))
+        return build_cf_info_c(tbucw_c_k, k_value)
+    else:
+        sons = group_order_tree.neighbors(tree_node)
+        cfs_info = (POINTER(GNode)*len(sons))(None)
+        for i in range(len(sons)):
+            cfs_info[i] = rebuild_cf_info(group_order_tree, sons[i], owned_tbucws)
+        return compose_cf_info_c(cfs_info, len(sons))
+
+#### Converts the antichain of tuples antichain_c to a list of integers (which can be sent to another process)
+def serialize_antichain(antichain_c):
+    data = serialize_tuples_antichain_c(antichain_c)
+    serialized = data[0:data[0]]
+    free_c(data)
+    return serialized
+
+#### Builds an antichain of tuples of which counting functions are defined on cf_info from a list built by serialize_antichain
+def deserialize_antichain(serialized, cf_info):
+    return deserialize_tuples_antichain_c((c_int*len(serialized))(*serialized), cf_info)
+
 #### Tests the realizability of formula represented by tbucw_c for K=k_value and C=c_value when player starts
 #### 1) applies optimization 2 on tbucw_c if enabled
 #### 2) builds starting antichains and cf_info
 #### 3) calls corresponding algorithm (forward or backward) for solving the safety game
 def test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order_tree, options, mp_parameters, extract_solution):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_winning_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_winning_strategies, warm_start, path, filename) = options
     (inputs, outputs, dimension, values_I, values_O, values_not_I, values_not_O, nu, c_start, c_bound, c_step) = mp_parameters
     
     tbucw_c_k = tbucw_c # tbucw_c_k is an instance of tbucw_c which will be optimized for k=k_value if opt2 is enabled
+    owned_tbucw_c_k = None # wrapper of tbucw_c_k if it is a new automaton
     
     controled_print("Realizability checking for " + tree_node + ", k = " + str(k_value), [ALLTEXT, MINTEXT], verbosity)
+    report_progress(("k", tree_node, k_value, c_value))
     if dimension > 0:
         controled_print("and c = " + str(c_value), [ALLTEXT, MINTEXT], verbosity)
     controled_print("\n", [ALLTEXT, MINTEXT], verbosity)
@@ -847,6 +1166,7 @@ def test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order
         
     # Apply optimization 2 (be careful, a new automaton will be created but the labels of the states of automaton_c will be modified -> don't forget to reset them when finished)
     opt2_time = 0
+    removed_states = []
     if opt2 == True and opt in [OPT12, OPT2]:
         controled_print("Optimization: Detect k-surely losing states...\n", [ALLTEXT, MINTEXT], verbosity)
        
@@ -854,7 +1174,10 @@ def test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order
         # If k_value > 0, reset the state labels of the starting automaton_c
         if k_value > 0: # Only if k_value > 0 because otherwise, optimization 2 hasn't been applied yet
             reset_tbucw_states_labels_c(tbucw_c)
-        tbucw_c_k = tbucw_size_optimization(tbucw_c, k_value)
+        removed_states = k_surely_losing_states(tbucw_c, k_value)
+        tbucw_c_k = remove_tbucw_states(tbucw_c, removed_states)
+        if tbucw_c_k is not tbucw_c:
+            owned_tbucw_c_k = tbucw_c_k = OwnedOptimizedTBUCW(tbucw_c_k, tbucw_c)
         opt2_time = time.clock()-start_opt2_time
         
         # Test whether optimization 2 has affected the tbucw
@@ -863,6 +1186,9 @@ def test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order
             controled_print("Detect k-surely losing states optimization is now turned off for specification " + tree_node + " (useless for larger values of k)\n\n", [ALLTEXT, MINTEXT], verbosity)
             group_order_tree.add_node_attribute(tree_node, ("OPT2", False))
             reset_tbucw_states_labels_c(tbucw_c)
+            if owned_tbucw_c_k != None:
+                owned_tbucw_c_k.close()
+                owned_tbucw_c_k = None
             tbucw_c_k = tbucw_c
         else:    
             controled_print("Optimized turn-based automaton: \n", [ALLTEXT, MINTEXT], verbosity)
@@ -873,24 +1199,64 @@ def test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order
             controled_print("Optimization time: " + str(opt2_time) + "\n", [ALLTEXT, MINTEXT], verbosity)
             controled_print("\n", [ALLTEXT, MINTEXT], verbosity)
     
+    if tbucw_c_k is tbucw_c:
+        removed_states = []
+    group_order_tree.add_node_attribute(tree_node, ("OPT2_removed_states", removed_states)) # needed to rebuild cf_info when the fix point is sent to another process
+    
     # Build the counting functions information structure
     cf_info = build_cf_info_c(tbucw_c_k, k_value)
     c_values_c_format = convert_list_to_c_format(c_value)
     
-    # Compute the starting antichains
-    start_antichain_1 = build_start_antichain_c(player, cf_info, dimension, c_values_c_format)
-    start_antichain_2 = build_start_antichain_c(switch_player(player), cf_info, dimension, c_values_c_format)
-    
     # Realizability checking
     if chk_method == MONO and chk_dir == FORWARD:
         direction = FORWARD
     else:
         direction = BACKWARD
+    
+    # Compute the starting antichains
+    start_antichain_1 = start_antichain_2 = None
+    warm_start_sg = dict(group_order_tree.node_attributes(tree_node)).get("warm_start_sg", None)
+    if warm_start_sg != None: # Warm start: lift the fix point computed for the previous value of k (it contains the fix point for k_value)
+        group_order_tree.add_node_attribute(tree_node, ("warm_start_sg", None))
+        if direction == BACKWARD and dimension == 0:
+            if player == P_O:
+                start_antichain_1 = lift_start_antichain_c(warm_start_sg.contents.positions_O, cf_info)
+                start_antichain_2 = lift_start_antichain_c(warm_start_sg.contents.positions_I, cf_info)
+            else:
+                start_antichain_1 = lift_start_antichain_c(warm_start_sg.contents.positions_I, cf_info)
+                start_antichain_2 = lift_start_antichain_c(warm_start_sg.contents.positions_O, cf_info)
+            if not start_antichain_1 or not start_antichain_2: # not lifted (automaton modified by opt2 in the meantime, see lift_start_antichain)
+                controled_print("No warm start: the automaton has been modified by the detection of k-surely losing states\n", [ALLTEXT], verbosity)
+                if start_antichain_1:
+                    free_antichain_full_c(start_antichain_1, FREE_TUPLE_FULL_C_FUNC)
+                if start_antichain_2:
+                    free_antichain_full_c(start_antichain_2, FREE_TUPLE_FULL_C_FUNC)
+                start_antichain_1 = start_antichain_2 = None
+            else:
+                controled_print("Warm start from the fix point computed for the previous value of k\n", [ALLTEXT, MINTEXT], verbosity)
+        warm_start_sg.close()
+    if start_antichain_1 == None:
+        start_antichain_1 = build_start_antichain_c(player, cf_info, dimension, c_values_c_format)
+        start_antichain_2 = build_start_antichain_c(switch_player(player), cf_info, dimension, c_values_c_format)
+    
     if chk_method == COMP:
         extract_solution = False
     spec_index = dict(group_order_tree.node_attributes(tree_node))["spec_index"]
     
+    add_check(node=tree_node, spec=spec_index, k=k_value, c=c_value, tbucw_size=get_tbucw_size_c(tbucw_c_k), opt2_time=opt2_time)
+    (start_wall, start_cpu) = report_clock()
+    reset_solver_stats_c()
     (winning_strategy, solution, sg, sol_extr_time) = solve_safety_game(start_antichain_1, start_antichain_2, cf_info, tbucw_c_k.contents.alphabet, player, dimension, c_value, spec_index, options, mp_parameters, direction, extract_solution)
+    (wall, cpu) = report_clock()
+    update_check(winning=winning_strategy, wall_time=wall-start_wall, cpu_time=cpu-start_cpu, solution_extraction_time=sol_extr_time, solver_stats=get_solver_stats())
+    if owned_tbucw_c_k != None: # the optimized tbUCW lives as long as the fix point (which is defined over it)
+        if sg != None:
+            attach_owned(sg, owned_tbucw_c_k)
+        else:
+            owned_tbucw_c_k.close()
+    if not winning_strategy and sg != None: # losing safety game kept by solve_safety_game to warm start the computation for the next value of k
+        group_order_tree.add_node_attribute(tree_node, ("warm_start_sg", sg))
+        sg = None
 
     if winning_strategy:
         controled_print("Solution found for spec " + str(spec_index) + " for k = " + str(k_value), [MINTEXT, ALLTEXT], verbosity)
@@ -904,7 +1270,7 @@ def test_realizability(tbucw_c, k_value, c_value, player, tree_node, group_order
 
 #### Solves the safety game (forwardly or backwardly according to direction) represented by start_antichain_1 and start_antichain_2
 def solve_safety_game(start_antichain_1, start_antichain_2, cf_info, alphabet, player, dimension, c_value, spec_index, options, mp_parameters, direction, extract_solution):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_winning_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_winning_strategies, warm_start, path, filename) = options
     chk_dir = direction
 
     # Solve the safety game
@@ -912,8 +1278,11 @@ def solve_safety_game(start_antichain_1, start_antichain_2, cf_info, alphabet, p
         sg = otfur(start_antichain_1, start_antichain_2, cf_info, alphabet, player, dimension, convert_list_to_c_format(c_value), options)
     else: # Backward algorithm
         sg = compute_fix_point(start_antichain_1, start_antichain_2, alphabet, player, critical, verbosity)
+    report_progress(("antichains", spec_index, sg.contents.positions_O.contents.size, sg.contents.positions_I.contents.size))
     
     # Analyze the solved safety game    
+    if warm_start == ON and chk_dir == BACKWARD and dimension == 0 and not has_a_winning_strategy_c(sg, alphabet, player): # No winning strategy -> keep the safety game for warm start
+        return (False, None, sg, 0)
     if extract_solution: # Extract winning strategies from the safety game (if there are)
         (winning_strategy, solution, sg, sol_extr_time) = extract_solution_from_safety_game(sg, alphabet, player, mp_parameters, options)
     else: # Check if there is a winning strategy, but do not extract a solution
@@ -921,14 +1290,14 @@ def solve_safety_game(start_antichain_1, start_antichain_2, cf_info, alphabet, p
         sol_extr_time = 0
         winning_strategy = has_a_winning_strategy_c(sg, alphabet, player)
         if not winning_strategy: # no winning strategy -> free the safety game
-            free_safety_game_c(sg)
+            sg.close()
             sg = None
             
     return (winning_strategy, solution, sg, sol_extr_time)
 
 #### Extracts one or several strategies from safety game and represents them as a transition system
 def extract_solution_from_safety_game(sg, alphabet, player, mp_parameters, options):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_winning_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_winning_strategies, warm_start, path, filename) = options
     start_extr_time = os.times()[4]
     solution = None
     if critical == ON and chk_dir == BACKWARD:
@@ -936,14 +1305,15 @@ def extract_solution_from_safety_game(sg, alphabet, player, mp_parameters, optio
     else:
         crit = FALSE
     
-    strategy = extract_strategies_from_safety_game_c(sg, alphabet, player, crit, set_of_winning_strategies)
-    
     winning_strategy = False
-    if strategy.contents.nb_states_PO > 0:
-        winning_strategy = True
-        solution = convert_transition_system_into_digraph(strategy, player, alphabet, mp_parameters, options)
-    free_transition_system_c(strategy)
-    free_safety_game_c(sg)
+    with OwnedTransitionSystem(extract_strategies_from_safety_game_c(sg, alphabet, player, crit, set_of_winning_strategies)) as strategy:
+        if strategy.contents.nb_states_PO > 0:
+            winning_strategy = True
+            solution = convert_transition_system_into_strategy(strategy, player, alphabet, mp_parameters, options)
+    if solution != None and is_strategy_minimization_enabled():
+        solution = minimize_strategy(solution, player == P_I)
+        controled_print("Solution minimized: %d states -> %d states\n" % (solution.nb_states_before_minimization, solution.nb_states), [ALLTEXT], verbosity)
+    sg.close()
     sg = None
     sol_extr_time = os.times()[4]-start_extr_time
 
@@ -960,13 +1330,10 @@ def print_stats(verbosity, tbucw_time, check_time, sol_extr_time, total_time, re
         controled_print("Neither realizability nor unrealizability has been proved. You may retry with higher k and c values.\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
     
     if realizable or unrealizable:    
-        spec_k_values = nb_tbucw*[-1]
-        spec_c_values = nb_tbucw*[-1]
+        (spec_k_values, spec_c_values) = get_specs_k_and_c_values(group_order_tree, spec_names, nb_tbucw)
         tbucw_sizes = nb_tbucw*[-1]
         for node in group_order_tree.nodes():
             if len(group_order_tree.neighbors(node)) == 0:
-               spec_k_values[index(spec_names, node)] = dict(group_order_tree.node_attributes(node))["k_value"]
-               spec_c_values[index(spec_names, node)] = dict(group_order_tree.node_attributes(node))["c_value"]
                tbucw_sizes[index(spec_names, node)] = get_tbucw_size_c(dict(group_order_tree.node_attributes(node))["tbucw"])
     
         controled_print("Automata construction time: %.2fs\n" % tbucw_time, [ALLTEXT, MINTEXT, RECAP], verbosity)
@@ -983,10 +1350,13 @@ def print_stats(verbosity, tbucw_time, check_time, sol_extr_time, total_time, re
         controled_print("Synthesis time: %.2fs\n" % check_time, [ALLTEXT, MINTEXT, RECAP], verbosity)
         controled_print("\n", [ALLTEXT, MINTEXT, RECAP], verbosity)        
         if player == P_O:
-            nb_states_in_solution = len(solution.nodes())
+            nb_states_in_solution = solution.nb_states
         else: # if starting player = P_I, there is a fake node in the graph (the initial node) which do not belong to the solution (but there might be several initial states)
-            nb_states_in_solution = (len(solution.nodes())-1)
-        controled_print("Number of states of transition system representing the solution(s): %d\n" % nb_states_in_solution, [ALLTEXT, MINTEXT, RECAP], verbosity)
+            nb_states_in_solution = (solution.nb_states-1)
+        if solution.nb_states_before_minimization == None:
+            controled_print("Number of states of transition system representing the solution(s): %d\n" % nb_states_in_solution, [ALLTEXT, MINTEXT, RECAP], verbosity)
+        else:
+            controled_print("Number of states of transition system representing the solution(s): %d (%d before minimization)\n" % (nb_states_in_solution, nb_states_in_solution + solution.nb_states_before_minimization - solution.nb_states), [ALLTEXT, MINTEXT, RECAP], verbosity)
         controled_print("\n", [ALLTEXT, MINTEXT, RECAP], verbosity)        
         controled_print("Solution(s) extraction time: %.2fs\n" % sol_extr_time, [ALLTEXT, MINTEXT, RECAP], verbosity)    
         controled_print("\n", [ALLTEXT, MINTEXT, RECAP], verbosity)        
@@ -994,6 +1364,302 @@ def print_stats(verbosity, tbucw_time, check_time, sol_extr_time, total_time, re
     controled_print("Total time: %.2fs\n" % total_time, [ALLTEXT, MINTEXT, RECAP], verbosity)    
     controled_print("\n", [ALLTEXT, MINTEXT, RECAP], verbosity)        
 
+#### Portfolio mode: solves the synthesis problem with each configuration (algorithm, critical signals optimization, optimizations) of configurations
+#### in parallel processes, returns the first conclusive verdict and kills the other processes
+#### The solution files of the winning configuration are renamed as in the normal mode and the winner is logged in path/portfolio.log
+def run_portfolio(ltl_file, partition_file, player, options, configurations):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename) = options
+    start_time = os.times()[4]
+    
+    controled_print("Portfolio mode: racing " + str(len(configurations)) + " configurations (algorithm:critical signals:optimizations)\n", [ALLTEXT, MINTEXT], verbosity)
+    queue = multiprocessing.Queue()
+    processes = []
+    for i in range(len(configurations)):
+        (cur_chk_dir, cur_critical, cur_opt) = configurations[i]
+        controled_print("  Configuration " + str(i) + ": " + cur_chk_dir + ":" + cur_critical + ":" + cur_opt + "\n", [ALLTEXT, MINTEXT], verbosity)
+        cur_options = (tool, cur_opt, cur_critical, NONE, nbw_constr, chk_method, cur_chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, portfolio_filename(filename, i))
+        processes.append(multiprocessing.Process(target=portfolio_process, args=(queue, i, ltl_file, partition_file, player, cur_options)))
+    controled_print("\n", [ALLTEXT, MINTEXT], verbosity)
+    for p in processes:
+        p.start()
+        set_process_group(p)
+    
+    # Wait for the first conclusive verdict (or for all processes to finish)
+    winner = -1
+    result = (False, False)
+    nb_running = len(processes)
+    try:
+        while nb_running > 0 and winner == -1:
+            try:
+                (i, cur_result, cur_report) = queue.get(True, 1)
+            except Queue.Empty: # No answer yet -> check that the processes have not died without answering
+                if queue.empty() and not [p for p in processes if p.is_alive()]:
+                    break
+                continue
+            nb_running -= 1
+            if cur_result[0]: # conclusive (realizability or unrealizability proved)
+                (winner, result) = (i, cur_result)
+                if get_run_report() is not None:
+                    set_run_report(cur_report)
+    finally: # Kill the other processes (and the processes they have launched), even if interrupted
+        for p in processes:
+            if p.is_alive():
+                try:
+                    os.killpg(p.pid, signal.SIGTERM)
+                except OSError: # the process group is already gone
+                    p.terminate()
+            p.join()
+    
+    # Keep the solution files of the winner and remove the others
+    for i in range(len(configurations)):
+        for extension in [".txt", ".png", ".dot", ".aag"]:
+            cur_file = path+portfolio_filename(filename, i)+extension
+            if os.path.exists(cur_file):
+                if i == winner:
+                    os.rename(cur_file, path+filename+extension)
+                else:
+                    os.remove(cur_file)
+    
+    total_time = os.times()[4] - start_time
+    controled_print("################ Portfolio recap ####################\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+    if winner == -1:
+        controled_print("No configuration has been conclusive. You may retry with higher k and c values.\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        winning_configuration = "none"
+    else:
+        (cur_chk_dir, cur_critical, cur_opt) = configurations[winner]
+        winning_configuration = cur_chk_dir + ":" + cur_critical + ":" + cur_opt
+        if result[1]:
+            controled_print("Formula is realizable", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        else:
+            controled_print("Formula is unrealizable", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        controled_print("-> proved first by configuration " + str(winner) + " (" + winning_configuration + ")\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+    controled_print("Total time: %.2fs\n\n" % total_time, [ALLTEXT, MINTEXT, RECAP], verbosity)
+    set_report_result(portfolio_winner=winning_configuration)
+    
+    log = open(path+"portfolio.log", "a")
+    log.write(filename + "\t" + winning_configuration + "\t" + "%.2f" % total_time + "\n")
+    log.close()
+    
+    return result
+
+#### Returns the name of the solution files of the index-th configuration of the portfolio mode
+def portfolio_filename(filename, index):
+    return filename + "_portfolio" + str(index)
+
+#### Target of the processes launched by run_portfolio: solves the synthesis problem and puts the result in queue, tagged by the index of the configuration
+#### The process leads its own process group so that run_portfolio can kill it together with the processes it launches
+def portfolio_process(queue, index, ltl_file, partition_file, player, options):
+    os.setpgrp()
+    result = synthetize(ltl_file, partition_file, player, options)
+    wait_for_renderings() # before run_portfolio renames the solution files and kills the process group
+    sys.stdout.flush()
+    queue.put((index, result, get_run_report()))
+
+#### Solves the synthesis problem as synthetize (or as run_portfolio if configurations is not None), unless it has already been solved
+#### and is found in the cache stored in cache_dir: then the verdict is returned and the solution file is restored without solving anything
+#### The verdicts (inconclusive ones too, as the bound on k is part of the key) are added to the cache, which takes at most cache_size bytes
+#### If timeout > 0 or max_memory > 0, the synthesis problem is solved under these limits (see synthetize_with_limits) and resource outs are not cached
+def cached_synthetize(ltl_file, partition_file, player, options, cache_dir, cache_size, configurations=None, timeout=0, max_memory=0):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename) = options
+    start_time = os.times()[4]
+    
+    phase = start_phase("cache lookup")
+    key = compute_cache_key(ltl_file, partition_file, player, options, configurations, is_strategy_minimization_enabled(), get_qm_max_nodes())
+    entry = get_from_result_cache(cache_dir, key)
+    end_phase(phase, hit=(entry is not None))
+    if entry is not None:
+        set_report_result(realizable=(entry["conclusive"] and entry["realizable"]), unrealizable=(entry["conclusive"] and not entry["realizable"]),
+                          spec_names=entry["spec_names"], k_values=entry["k_values"], c_values=entry["c_values"], from_cache=True)
+        if entry["conclusive"] and restore_solution_from_result_cache(cache_dir, key, path+filename+".txt"):
+            write_solution_files_from_cache(partition_file, player, entry["realizable"], path, filename)
+        controled_print("################ Recap (from cache) #################\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        if not entry["conclusive"]:
+            controled_print("Formula is neither realizable nor unrealizable for the values of k considered\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        elif entry["realizable"]:
+            controled_print("Formula is realizable\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        else:
+            controled_print("Formula is unrealizable\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        if entry["k_values"] is not None:
+            for i in range(len(entry["spec_names"])):
+                controled_print("  Spec " + entry["spec_names"][i] + ": k = " + str(entry["k_values"][i]) + ", c = " + str(entry["c_values"][i]) + "\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        controled_print("Cache lookup time: %.2fs\n\n" % (os.times()[4] - start_time), [ALLTEXT, MINTEXT, RECAP], verbosity)
+        return (entry["conclusive"], entry["realizable"])
+    
+    run_info = {"spec_names": None, "k_values": None, "c_values": None}
+    if timeout > 0 or max_memory > 0:
+        (conclusive, realizable) = synthetize_with_limits(ltl_file, partition_file, player, options, timeout, max_memory, configurations, run_info)
+        if conclusive == None: # resource out
+            return (conclusive, realizable)
+    elif configurations is not None:
+        (conclusive, realizable) = run_portfolio(ltl_file, partition_file, player, options, configurations)
+    else:
+        (conclusive, realizable) = synthetize(ltl_file, partition_file, player, options, run_info)
+        
+    entry = {"conclusive": conclusive, "realizable": realizable, "spec_names": run_info["spec_names"], "k_values": run_info["k_values"], "c_values": run_info["c_values"]}
+    if conclusive:
+        add_to_result_cache(cache_dir, key, entry, path+filename+".txt", cache_size)
+    else: # no solution written (the solution file may be an old one)
+        add_to_result_cache(cache_dir, key, entry, None, cache_size)
+    return (conclusive, realizable)
+
+#### Writes the other files of the solution restored from the cache in path+filename+".txt" (DOT, PNG and AIGER files, as synthetize)
+def write_solution_files_from_cache(partition_file, player, realizable, path, filename):
+    (inputs, outputs) = parse_partition(partition_file)[0:2]
+    if not realizable: # strategy of the environment
+        (inputs, outputs) = (outputs, inputs)
+        player = switch_player(player)
+    solution = read_solution(path+filename+".txt", inputs, outputs, player)
+    if solution.nb_states <= 20 or is_png_rendering_enabled():
+        display_solution(solution, inputs, outputs, player, filename, path)
+    if is_aig_output_enabled():
+        print_solution_aig(solution, inputs, outputs, player, filename, path)
+
+#### Solves the synthesis problem as synthetize (or as run_portfolio if configurations is not None) in a supervised child process
+#### which is stopped after timeout seconds (if timeout > 0) and of which processes may use at most max_memory bytes each (if max_memory > 0)
+#### If a budget is exhausted, (None, False) is returned (neither solved nor unsolved), and partial_stats (if it is a dictionary) is filled with the last values
+#### of k and c tested for each node of the group order tree and the sizes of the last antichains computed for each spec
+#### run_info is filled as by synthetize
+def synthetize_with_limits(ltl_file, partition_file, player, options, timeout, max_memory, configurations=None, run_info=None, partial_stats=None):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_winning_strategies, warm_start, path, filename) = options
+    start_time = time.time()
+    
+    if partial_stats == None:
+        partial_stats = {}
+    partial_stats["k_values"] = {}
+    partial_stats["c_values"] = {}
+    partial_stats["antichain_sizes"] = {}
+    
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=limited_synthetize_process, args=(queue, ltl_file, partition_file, player, options, max_memory, configurations))
+    process.start()
+    set_process_group(process)
+    
+    # Collect the progress reports until the result is received, the child process dies or the time is out
+    result = None
+    resource_out = None
+    try:
+        while result == None:
+            if timeout > 0 and time.time()-start_time > timeout:
+                resource_out = "time"
+                break
+            try:
+                message = queue.get(True, 1)
+            except Queue.Empty: # No message -> check that the child process has not died without answering
+                if queue.empty() and not process.is_alive():
+                    if max_memory > 0:
+                        resource_out = "memory"
+                    else:
+                        print "Error: the synthesis process has died unexpectedly (exit code " + str(process.exitcode) + ")"
+                        result = (False, False)
+                    break
+                continue
+            if message[0] == "k":
+                partial_stats["k_values"][message[1]] = message[2]
+                partial_stats["c_values"][message[1]] = message[3]
+            elif message[0] == "antichains":
+                partial_stats["antichain_sizes"][message[1]] = (message[2], message[3])
+            elif message[0] == "memory":
+                resource_out = "memory"
+                break
+            else: # "result"
+                (result, child_run_info, child_report) = (message[1], message[2], message[3])
+                if run_info != None:
+                    run_info.update(child_run_info)
+                if get_run_report() is not None:
+                    set_run_report(child_report)
+    finally: # Stop the child process and the processes it has launched
+        if result != None: # the child process is about to finish
+            process.join(KILL_GRACE_TIME)
+        stop_process_group(process)
+    
+    if resource_out != None:
+        controled_print("################ Execution recap ####################\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        if resource_out == "time":
+            controled_print("Resource out: time budget of %.2fs exhausted\n" % timeout, [ALLTEXT, MINTEXT, RECAP], verbosity)
+        else:
+            controled_print("Resource out: memory budget of %d MB exhausted\n" % (max_memory/(1024*1024)), [ALLTEXT, MINTEXT, RECAP], verbosity)
+        for node in sorted(partial_stats["k_values"].keys()):
+            controled_print("  Last value of k tested for " + node + ": " + str(partial_stats["k_values"][node]), [ALLTEXT, MINTEXT, RECAP], verbosity)
+            if partial_stats["c_values"][node] != [0]:
+                controled_print("and c = " + str(partial_stats["c_values"][node]), [ALLTEXT, MINTEXT, RECAP], verbosity)
+            controled_print("\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        for spec_index in sorted(partial_stats["antichain_sizes"].keys()):
+            (size_O, size_I) = partial_stats["antichain_sizes"][spec_index]
+            controled_print("  Size of the last antichains computed for spec " + str(spec_index) + ": " + str(size_O) + " (P_O), " + str(size_I) + " (P_I)\n", [ALLTEXT, MINTEXT, RECAP], verbosity)
+        controled_print("Total time: %.2fs\n\n" % (time.time()-start_time), [ALLTEXT, MINTEXT, RECAP], verbosity)
+        partial_stats["resource"] = resource_out
+        set_report_result(resource_out=resource_out, partial_stats={"k_values": partial_stats["k_values"], "c_values": partial_stats["c_values"],
+                                                                    "antichain_sizes": dict([(str(spec_index), sizes) for (spec_index, sizes) in partial_stats["antichain_sizes"].items()])})
+        return (None, False)
+    return result
+
+#### Target of the child process launched by synthetize_with_limits: limits the memory of the process, solves the synthesis problem and puts the result in queue
+#### The progress of the synthesis is put in the same queue (see report_progress)
+#### The process leads its own process group so that synthetize_with_limits can stop it together with the processes it launches
+def limited_synthetize_process(queue, ltl_file, partition_file, player, options, max_memory, configurations):
+    global progress_queue
+    os.setpgrp()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1)) # run the clean-up code (e.g. of run_portfolio) when stopped between two C calls
+    if max_memory > 0:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+    progress_queue = queue
+    
+    run_info = {"spec_names": None, "k_values": None, "c_values": None}
+    try:
+        if configurations is not None:
+            result = run_portfolio(ltl_file, partition_file, player, options, configurations)
+        else:
+            result = synthetize(ltl_file, partition_file, player, options, run_info)
+    except MemoryError:
+        sys.stdout.flush()
+        queue.put(("memory",))
+        return
+    wait_for_renderings() # before synthetize_with_limits kills the process group
+    sys.stdout.flush()
+    queue.put(("result", result, run_info, get_run_report()))
+
+#### Reports the progress of the synthesis to the process supervising it, if any (see synthetize_with_limits)
+def report_progress(progress):
+    if progress_queue != None:
+        progress_queue.put(progress)
+
+#### Stops the process (which leads its own process group) and the processes it has launched: sends them SIGTERM, then SIGKILL after KILL_GRACE_TIME seconds
+def stop_process_group(process):
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError: # the process group is already gone
+            process.terminate()
+        process.join(KILL_GRACE_TIME)
+    try: # kill the processes of the group still alive
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        if process.is_alive():
+            try:
+                os.kill(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+    process.join()
+
+#### Makes the process just started lead its own process group, as the process does itself when it starts (whichever comes first, the group
+#### exists as soon as process.start() returns, so that it can be killed even if the process has not run yet)
+def set_process_group(process):
+    try:
+        os.setpgid(process.pid, process.pid)
+    except OSError, e:
+        if e.errno not in [errno.EACCES, errno.ESRCH]: # the process has already exec'd or exited
+            raise
+
+#### Returns the values of k and c for which a winning strategy has been found for each spec (i.e. each leaf of group_order_tree)
+def get_specs_k_and_c_values(group_order_tree, spec_names, nb_tbucw):
+    spec_k_values = nb_tbucw*[-1]
+    spec_c_values = nb_tbucw*[-1]
+    for node in group_order_tree.nodes():
+        if len(group_order_tree.neighbors(node)) == 0:
+            spec_k_values[index(spec_names, node)] = dict(group_order_tree.node_attributes(node))["k_value"]
+            spec_c_values[index(spec_names, node)] = dict(group_order_tree.node_attributes(node))["c_value"]
+    return (spec_k_values, spec_c_values)
+
 #### Displays an error message and exit    
 def exit_acaciaplus(error_text):
     print error_text
@@ -1015,11 +1681,24 @@ def main(hardargs=None):
     parser.add_option("-k", "--kstart", dest="k_start", default=0, type="int", help="starting value of k (<= 30), default: 0")
     parser.add_option("-K", "--kbound", dest="k_bound", default=5, type="int", help="bound on k (<= 30), default: 5")
     parser.add_option("-y", "--kstep", dest="k_step", default=1, type="int", help="incremental step for k (to range on values of k), default: 1")
+    parser.add_option("--ksearch", "--ksearch", dest="k_search", default=LINEAR, type="string", help="search method on the values of k and c (LINEAR: one step at a time, GALLOP: doubling steps then bisection, ADAPTIVE: steps chosen according to the time of the previous checks and the time budget given by --kbudget), default: LINEAR")
+    parser.add_option("--kbudget", "--kbudget", dest="k_budget", default=60., type="float", help="time budget (in seconds) of one realizability check for the ADAPTIVE search method, default: 60")
     parser.add_option("-C", "--check", dest="tocheck", default=REAL, type="string", help="to check realizability (REAL), unrealizability (UNREAL) or both in parallel (BOTH), default: REAL")
     parser.add_option("-v", "--verb", dest="verbosity", default=1, type=int, help="verbosity (0, 1 or 2), default: 1")
     parser.add_option("-c", "--crit", dest="critical", default=ON, type="string", help="critical signals optimization (ON or OFF), default: ON")
     parser.add_option("-o", "--opt", dest="opt", default=OPT12, type="string", help="to enable/disable optimizations 1 (detect bounded/unbounded states) and 2 (detect k-surely losing states) (1, 2, 12 or none), default: 12 (both enabled)")
     parser.add_option("-f", "--format", dest="ltl_format", default=WRING, type="string", help="LTL formula format (Wring or LTL2BA), default: WRING")
+    parser.add_option("-w", "--warmstart", dest="warm_start", default=OFF, type="string", help="warm start of the backward algorithm with the fix point computed for the previous value of k (ON or OFF), only applied for the values of k for which the detection of k-surely losing states (-o 2) does not modify the automaton, default: OFF")
+    parser.add_option("--portfolio", "--portfolio", dest="portfolio", default="", type="string", help="races several configurations in parallel processes and keeps the first conclusive one; configurations are given as algo:crit:opt separated by commas (e.g. forward:on:12,backward:off:2), or DEFAULT for " + DEFAULT_PORTFOLIO)
+    parser.add_option("--cache", "--cache", dest="cache", default="", type="string", help="directory of the cache of the verdicts and solutions of the already solved synthesis problems (disabled if not given)")
+    parser.add_option("--cachesize", "--cachesize", dest="cache_size", default=100, type="int", help="maximum size (in MB) of the cache, the least recently used entries are removed first, default: 100")
+    parser.add_option("--timeout", "--timeout", dest="timeout", default=0., type="float", help="time budget (in seconds) of the synthesis, after which it is stopped and reported as a resource out, default: 0 (no limit)")
+    parser.add_option("--max-memory", "--max-memory", dest="max_memory", default=0, type="int", help="memory budget (in MB) of each process of the synthesis, after which it is stopped and reported as a resource out, default: 0 (no limit)")
+    parser.add_option("--report", "--report", dest="report", default="", type="string", help="file in which a report of the run (time, CPU time and peak memory of each phase, statistics of each fix point computation) is written in JSON format")
+    parser.add_option("--png", "--png", dest="png", default=OFF, type="string", help="to also render the solution in PNG with Graphviz, in a background process waited for at exit (the solution is written in DOT if it has at most 20 states or if this option is ON) (ON or OFF), default: OFF")
+    parser.add_option("--minimize", "--minimize", dest="minimize", default=OFF, type="string", help="to minimize the strategy extracted (bisimilar states merged, labels compared as sets of terms) (ON or OFF), default: OFF")
+    parser.add_option("--qmnodes", "--qmnodes", dest="qm_nodes", default=QM_MAX_NODES, type="int", help="maximum number of nodes of the branch and bound computing a minimal cover of the label of each transition of the solution, after which the best cover found is kept (it may then not be minimal, a warning is printed), default: " + str(QM_MAX_NODES))
+    parser.add_option("--aig", "--aig", dest="aig", default=OFF, type="string", help="to also write the solution as an AIGER circuit (.aag file): states of the strategy binary-encoded in latches, signals of the opponent as inputs and signals of the player as outputs (ON or OFF), default: OFF")
     parser.add_option("--setofstrategies", "--setofstrategies", dest="set_of_strategies", default=FALSE, type="string", help="Set to TRUE to obtain a set of winning strategies instead of one winning strategy, default= FALSE")
 
     if hardargs is not None:
@@ -1096,6 +1775,13 @@ def main(hardargs=None):
     if k_start > k_bound:
         k_bound = k_start   
         
+    k_search = str(options.k_search).lower()
+    if k_search not in [LINEAR, GALLOP, ADAPTIVE]:
+        exit_acaciaplus("Wrong argument for --ksearch (LINEAR, GALLOP or ADAPTIVE)")
+    k_budget = options.k_budget
+    if k_budget <= 0:
+        exit_acaciaplus("The time budget given by --kbudget must be positive")
+        
     tocheck = str(options.tocheck).lower()
     if tocheck == "real":
         tocheck = REAL
@@ -1122,6 +1808,42 @@ def main(hardargs=None):
     if opt not in [NO_OPT, OPT1, OPT2, OPT12]:
         exit_acaciaplus("Wrong argument for -o, --opt")
         
+    warm_start = str(options.warm_start).lower()
+    if warm_start == "on":
+        warm_start = ON
+    elif warm_start == "off":
+        warm_start = OFF
+    else:
+        exit_acaciaplus("Wrong argument for -w, --warmstart")
+        
+    png = str(options.png).lower()
+    if png == "on":
+        png = ON
+    elif png == "off":
+        png = OFF
+    else:
+        exit_acaciaplus("Wrong argument for --png")
+        
+    minimize = str(options.minimize).lower()
+    if minimize == "on":
+        minimize = ON
+    elif minimize == "off":
+        minimize = OFF
+    else:
+        exit_acaciaplus("Wrong argument for --minimize")
+        
+    qm_nodes = options.qm_nodes
+    if qm_nodes <= 0:
+        exit_acaciaplus("The number of nodes given by --qmnodes must be positive")
+        
+    aig = str(options.aig).lower()
+    if aig == "on":
+        aig = ON
+    elif aig == "off":
+        aig = OFF
+    else:
+        exit_acaciaplus("Wrong argument for --aig")
+        
     set_of_strategies = str(options.set_of_strategies).lower()
     if set_of_strategies == "false" or set_of_strategies == "0":
         set_of_strategies = FALSE
@@ -1132,9 +1854,72 @@ def main(hardargs=None):
 
     if tocheck in [UNREAL, BOTH] and nbw_constr == COMP:
         exit_acaciaplus("Unrealizability checking is only available for monolithic formulas")
+    if warm_start == ON and chk_method == MONO and chk_dir == FORWARD:
+        print "Warning: warm start turned off since it is only available for the backward algorithm"
+        warm_start = OFF
+    elif warm_start == ON and opt in [OPT2, OPT12]:
+        print "Warning: warm start only applied once the detection of k-surely losing states no longer modifies the automaton (use -o 1 or -o none to warm start every value of k)"
+        
+    portfolio = str(options.portfolio).lower()
+    if portfolio != "":
+        if portfolio == "default":
+            portfolio = DEFAULT_PORTFOLIO
+        if tool == WRING:
+            exit_acaciaplus("Portfolio mode is not available with Wring (the processes would share its temporary directory)")
+        configurations = []
+        for configuration in portfolio.split(","):
+            try:
+                (cur_chk_dir, cur_critical, cur_opt) = configuration.strip().split(":")
+            except ValueError:
+                exit_acaciaplus("Wrong configuration for --portfolio: " + configuration + " (algo:crit:opt expected)")
+            if cur_chk_dir.startswith("back"):
+                cur_chk_dir = BACKWARD
+            elif cur_chk_dir.startswith("for"):
+                cur_chk_dir = FORWARD
+            else:
+                exit_acaciaplus("Wrong algorithm in --portfolio configuration " + configuration + " (FORWARD or BACKWARD)")
+            if cur_critical not in [ON, OFF]:
+                exit_acaciaplus("Wrong critical signals optimization in --portfolio configuration " + configuration + " (ON or OFF)")
+            if cur_opt not in [NO_OPT, OPT1, OPT2, OPT12]:
+                exit_acaciaplus("Wrong optimizations in --portfolio configuration " + configuration + " (1, 2, 12 or none)")
+            configurations.append((cur_chk_dir, cur_critical, cur_opt))
+        
+    timeout = options.timeout
+    max_memory = options.max_memory
+    if timeout < 0 or max_memory < 0:
+        exit_acaciaplus("The budgets given by --timeout and --max-memory must be positive (or 0 for no limit)")
+    max_memory = max_memory*1024*1024
         
-    display_parameters(player, tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, tocheck, set_of_strategies)
-    return synthetize(formula, partition, player, (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, tocheck, set_of_strategies, path, filename))
+    options_report = options.report
+    cache_dir = options.cache
+    cache_size = options.cache_size
+    if cache_size <= 0:
+        exit_acaciaplus("The maximum size of the cache given by --cachesize must be positive")
+        
+    display_parameters(player, tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_strategies, warm_start)
+    options = (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_strategies, warm_start, path, filename)
+    if portfolio == "":
+        configurations = None
+    if options_report != "":
+        start_run_report()
+    if aig == ON:
+        enable_aig_output()
+    if png == ON:
+        enable_png_rendering()
+    if minimize == ON:
+        enable_strategy_minimization()
+    set_qm_max_nodes(qm_nodes)
+    if cache_dir != "":
+        result = cached_synthetize(formula, partition, player, options, cache_dir, cache_size*1024*1024, configurations, timeout, max_memory)
+    elif timeout > 0 or max_memory > 0:
+        result = synthetize_with_limits(formula, partition, player, options, timeout, max_memory, configurations)
+    elif configurations is not None:
+        result = run_portfolio(formula, partition, player, options, configurations)
+    else:
+        result = synthetize(formula, partition, player, options)
+    if options_report != "":
+        write_run_report(options_report)
+    return result
 
 
 if __name__ == "__main__":
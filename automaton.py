@@ -15,12 +15,13 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
+import os
 import sys
 import subprocess
 import re
 
 from string import *
-from pygraph.classes.digraph import digraph
+from ctypes import Structure, POINTER, c_int, c_char, c_char_p, cdll
 
 from constants import *
 from utils import *
@@ -207,6 +208,204 @@ def wring_to_ltl2ba(formula,inputs,outputs):
         
     return newformula
 
+#### Compact representation of an automaton:
+####   - the states are the integers 0, ..., len(states)-1, states[s] being the name of state s (the initial state is named "initial")
+####   - accepting is the set of accepting states
+####   - edges is the list of (from, to, index of the label in labels), where each distinct label is stored once in labels
+####   - unbounded[s] is FALSE if state s cannot carry a counter value at least k (see counters_optimization), TRUE otherwise
+class Automaton(object):
+    def __init__(self):
+        self.states = []
+        self.states_index = {} # name -> state
+        self.accepting = set()
+        self.edges = []
+        self.edges_index = {} # (from, to) -> index of the edge in edges
+        self.labels = []
+        self.labels_index = {} # label -> index in labels
+        self.unbounded = []
+
+    #### Returns the state named name (a new state is added if needed)
+    def add_state(self, name):
+        try:
+            return self.states_index[name]
+        except KeyError:
+            self.states_index[name] = len(self.states)
+            self.states.append(name)
+            self.unbounded.append(TRUE)
+            return len(self.states)-1
+
+    #### Adds an edge labeled label from state_from to state_to (if there is already such an edge, label is added to its label as a disjunction)
+    def add_edge(self, state_from, state_to, label):
+        try:
+            edge = self.edges_index[(state_from, state_to)]
+            label = self.labels[self.edges[edge][2]] + " || " + label
+            self.edges[edge] = (state_from, state_to, self.intern_label(label))
+        except KeyError:
+            self.edges_index[(state_from, state_to)] = len(self.edges)
+            self.edges.append((state_from, state_to, self.intern_label(label)))
+
+    #### Returns the index of label in labels (label is added if needed)
+    def intern_label(self, label):
+        try:
+            return self.labels_index[label]
+        except KeyError:
+            self.labels_index[label] = len(self.labels)
+            self.labels.append(label)
+            return len(self.labels)-1
+
+    #### Returns the initial state
+    def initial(self):
+        return self.states_index["initial"]
+
+    #### Returns the label of edge
+    def label(self, edge):
+        return self.labels[self.edges[edge][2]]
+
+    #### Returns the number of disjuncts of the label of edge
+    def disj_size(self, edge):
+        return self.label(edge).count("||")+1
+
+    #### Returns the list of the outgoing edges of each state
+    def out_edges(self):
+        out_edges = [[] for state in self.states]
+        for edge in range(len(self.edges)):
+            out_edges[self.edges[edge][0]].append(edge)
+        return out_edges
+
+    #### Returns the list of the incoming edges of each state
+    def in_edges(self):
+        in_edges = [[] for state in self.states]
+        for edge in range(len(self.edges)):
+            in_edges[self.edges[edge][1]].append(edge)
+        return in_edges
+
+#### Builds an Automaton from a never claim (output of ltl2ba, ltl3ba or SPOT) in a single pass over its lines
+#### The states whose name contains "init" are renamed "initial", and the prefix "accept_" of the names of the accepting states is removed
+#### Returns None if never_claim contains no automaton (e.g. LTL syntax error)
+def parse_never_claim(never_claim, tool):
+    aut = Automaton()
+    in_claim = False
+    state = None
+    for line in never_claim.splitlines():
+        comment = line.find("/*")
+        if comment >= 0:
+            line = line[:comment]
+        line = line.strip()
+        if not in_claim:
+            in_claim = line.startswith("never")
+        elif line.startswith("}"):
+            break
+        elif line.startswith("::"): # transition ":: label -> goto state"
+            (label, goto_state) = line[2:].split("-> goto")
+            label = label.strip()
+            if tool == SPOT:
+                label = label.replace("true", "1")
+            aut.add_edge(state, aut.add_state(get_never_claim_state_name(goto_state.split()[0])[0]), label)
+        elif line.endswith(":"): # state "name:"
+            (name, accept) = get_never_claim_state_name(line[:-1].strip())
+            state = aut.add_state(name)
+            if accept:
+                aut.accepting.add(state)
+        elif line.startswith("skip"):
+            aut.add_edge(state, state, "(1)")
+        # "if", "fi;" and "false;" (no transition) are skipped
+
+    if state == None:
+        return None
+    return aut
+
+#### Returns (name of the state in the Automaton, True if the state is accepting) for the name of a state of a never claim
+def get_never_claim_state_name(name):
+    accept = name.startswith("accept_")
+    if accept:
+        name = name[len("accept_"):]
+    if "init" in name:
+        name = "initial"
+    return (name, accept)
+
+#### LTL2BAAutomaton C structure (tools/ltl2ba-1.1/ltl2ba_lib.c)
+class LTL2BAAutomaton(Structure):
+    _fields_ = [("nb_symbols", c_int),
+                ("symbols", POINTER(c_char_p)),
+                ("nb_states", c_int),
+                ("state_ids", POINTER(c_int)),
+                ("state_finals", POINTER(c_int)),
+                ("accepting", POINTER(c_char)),
+                ("nb_trans", c_int),
+                ("trans_from", POINTER(c_int)),
+                ("trans_to", POINTER(c_int)),
+                ("literals_offsets", POINTER(c_int)),
+                ("literals", POINTER(c_int))]
+
+# ltl2ba library (built with ltl2ba by the makefile), loaded by load_ltl2ba_library
+ltl2ba_library = None
+ltl2ba_library_loaded = False
+
+#### Loads the ltl2ba library, returns False if it is not built (the ltl2ba executable is then used)
+def load_ltl2ba_library():
+    global ltl2ba_library, ltl2ba_library_loaded
+    if not ltl2ba_library_loaded:
+        ltl2ba_library_loaded = True
+        if os.uname()[0] == "Darwin":
+            library_file = LTL2BA_PATH+"libltl2ba.dylib"
+        else:
+            library_file = LTL2BA_PATH+"libltl2ba.so"
+        try:
+            ltl2ba_library = cdll.LoadLibrary(library_file)
+        except OSError:
+            return False
+        ltl2ba_library.ltl2ba_translate.argtypes = [c_char_p]
+        ltl2ba_library.ltl2ba_translate.restype = POINTER(LTL2BAAutomaton)
+        ltl2ba_library.ltl2ba_free.argtypes = [POINTER(LTL2BAAutomaton)]
+        ltl2ba_library.ltl2ba_free.restype = None
+    return ltl2ba_library != None
+
+#### Builds an Automaton from formula with the ltl2ba library, without running the ltl2ba executable nor parsing its never claim
+#### The Automaton is the same as parse_never_claim on the output of ltl2ba -f formula (same names, order of states and labels)
+#### Returns None if formula cannot be translated (e.g. LTL syntax error)
+def translate_ltl2ba(formula):
+    c_aut = ltl2ba_library.ltl2ba_translate(formula)
+    if not c_aut:
+        return None
+    a = c_aut.contents
+    symbols = [a.symbols[i] for i in range(a.nb_symbols)]
+    names = []
+    for s in range(a.nb_states):
+        if a.state_ids[s] == -1:
+            names.append("initial")
+        elif a.state_ids[s] == 0:
+            names.append("all")
+        elif a.accepting[s] != "\0":
+            names.append("S%d" % a.state_ids[s])
+        else:
+            names.append("T%d_S%d" % (a.state_finals[s], a.state_ids[s]))
+
+    aut = Automaton()
+    # States and transitions in the order of the never claim (see parse_never_claim)
+    t = 0
+    for s in range(a.nb_states):
+        state = aut.add_state(names[s])
+        if a.accepting[s] != "\0":
+            aut.accepting.add(state)
+        # The cubes of the transitions to the same state form the label of one edge (in order of the first transition)
+        targets = []
+        cubes = {}
+        while t < a.nb_trans and a.trans_from[t] == s:
+            literals = [a.literals[i] for i in range(a.literals_offsets[t], a.literals_offsets[t+1])]
+            if len(literals) == 0:
+                cube = "(1)"
+            else:
+                cube = "(" + " && ".join([symbols[l-1] if l > 0 else "!" + symbols[-l-1] for l in literals]) + ")"
+            if a.trans_to[t] not in cubes:
+                targets.append(a.trans_to[t])
+                cubes[a.trans_to[t]] = []
+            cubes[a.trans_to[t]].append(cube)
+            t += 1
+        for target in targets:
+            aut.add_edge(state, aut.add_state(names[target]), " || ".join(cubes[target]))
+    ltl2ba_library.ltl2ba_free(c_aut)
+    return aut
+
 #### Constructs an automaton from ltl2ba or ltl3ba for each formula in formulas_list
 def construct_automata(formulas_list, spec_names, verbosity, tool):
     nb_formulas = len(formulas_list)
@@ -225,108 +424,42 @@ def construct_automata(formulas_list, spec_names, verbosity, tool):
         print "Wrong tool!"
         exit(0)
 
+    # ltl2ba is called in process if its library is built
+    in_process = tool == LTL2BA and load_ltl2ba_library()
+
     formula_index = 0
     for formula in formulas_list:
-        try:
+        if in_process:
             controled_print("spec " + spec_names[formula_index] + "...", [ALLTEXT, MINTEXT], verbosity)
-            controled_print("executing: " + str(tool_cmd + [formula]), [ALLTEXT, MINTEXT], verbosity)
-            out = subprocess.Popen(tool_cmd+[formula],stdout=subprocess.PIPE)
-            (automata,err) = out.communicate()
-        except:
-            print "Unexpected error:", sys.exc_info()[0]
-            print "Don't forget to install " + tool + " and set the " + tool + "_PATH static variable in file constants.py."
-            exit(0)
-    
-        controled_print(" done\n", [ALLTEXT, MINTEXT], verbosity)
-        controled_print(tool + " output for " + spec_names[formula_index] + ": \n", [ALLTEXT], verbosity)
-        controled_print(automata+"\n", [ALLTEXT], verbosity)
+            controled_print("translating (ltl2ba library): " + formula, [ALLTEXT, MINTEXT], verbosity)
+            aut = translate_ltl2ba(formula)
+            controled_print(" done\n", [ALLTEXT, MINTEXT], verbosity)
+        else:
+            try:
+                controled_print("spec " + spec_names[formula_index] + "...", [ALLTEXT, MINTEXT], verbosity)
+                controled_print("executing: " + str(tool_cmd + [formula]), [ALLTEXT, MINTEXT], verbosity)
+                out = subprocess.Popen(tool_cmd+[formula],stdout=subprocess.PIPE)
+                (automata,err) = out.communicate()
+            except:
+                print "Unexpected error:", sys.exc_info()[0]
+                print "Don't forget to install " + tool + " and set the " + tool + "_PATH static variable in file constants.py."
+                exit(0)
 
-        accepting_states = []
+            controled_print(" done\n", [ALLTEXT, MINTEXT], verbosity)
+            controled_print(tool + " output for " + spec_names[formula_index] + ": \n", [ALLTEXT], verbosity)
+            controled_print(automata+"\n", [ALLTEXT], verbosity)
 
-        # automaton parsing
-        s = automata.split('*/\n')
-        if s.__len__()<2:
+            aut = parse_never_claim(automata, tool)
+        if aut == None:
             print("empty automaton, LTL syntax error?")
             exit(0)
+        accepting_states = sorted(aut.accepting)
     
-        automata = s[1]
-   
-        r=re.compile(';\n\}?\n?')
-        transitions=re.split(r,automata)
-        nb_states = len(transitions)
-        nb_trans = 0
-    
-        # create a new graph
-        g = digraph()
-        g.__init__()
-    
-        #local function which determines if a state is initial
-        def isinitial(s):
-            return re.match(re.compile('.*init'),s)
-    
-        # iterate over transitions (except the last which is the empty string)
-        l = transitions.__len__()-1
-        if transitions[l] == '':
-            tobound = l
-        else:
-            tobound = l+1
-    
-        for t in transitions[0:tobound]:
-            # split transition into head (state) and body (rules)
-            rstate = re.compile(':\n')
-            trans = re.split(rstate,t)
-            
-            # state extraction
-            s = re.split(re.compile('\Aaccept_'),trans[0])
-            if len(s)==1:
-                state = s[0]
-                accept = False
-            elif len(s)==2:
-                state = s[1]
-                accept = True
-            if isinitial(state):
-                state = 'initial'
-            if accept:
-                accepting_states.append(state)
-            if not g.has_node(state):
-                g.add_node(state)
-    
-            # rules extraction
-            if re.match(re.compile('(.|\n)*skip(.|\n)*'), trans[1]):
-                tuple = (state, state)
-                g.add_edge(tuple, wt=1, label='(1)')
-                nb_trans += 1
-            
-            elif not re.match(re.compile('(.|\n)*false(.|\n)*'),trans[1]): # if match then it's false (no transition)
-                l = re.split(re.compile('::'),trans[1])
-                for y in l:
-                    if not re.match(re.compile('\s*if\s'),y):
-                        fr = re.split(re.compile(' -> goto '), y)
-                        edgelab = fr[0]
-                        if tool == SPOT:
-                            edgelab = edgelab.replace("true", "1")
-                        if re.match(re.compile('.*accept.*'),fr[1]):
-                            accept = True # the state is accepting
-                        else:
-                            accept = False
-                        gre = re.split(re.compile('accept_'), fr[1])
-                        gre = re.split(re.compile('\s+f?i?'),gre[len(gre)-1])
-                        goto_state = gre[0]
-                        if isinitial(goto_state):
-                            goto_state = 'initial'
-                        if not g.has_node(goto_state): # if the goto state is new then add it
-                            g.add_node(goto_state)
-                        
-                        tuple = (state, goto_state)
-                        disj_size = edgelab.count("||")+1
-                        g.add_edge(tuple, wt=disj_size, label=edgelab)
-                        nb_trans = nb_trans + 1
-    
-        controled_print('Nb states: %d\n' % len(g.nodes()), [ALLTEXT], verbosity)
-        controled_print('Nb transitions: %d\n' % nb_trans, [ALLTEXT], verbosity)
-        controled_print('Accepting states ('+str(len(accepting_states))+'): ' + str(accepting_states)+"\n\n", [ALLTEXT], verbosity)
+        controled_print('Nb states: %d\n' % len(aut.states), [ALLTEXT], verbosity)
+        controled_print('Nb transitions: %d\n' % len(aut.edges), [ALLTEXT], verbosity)
+        controled_print('Accepting states ('+str(len(accepting_states))+'): ' + str([aut.states[state] for state in accepting_states])+"\n\n", [ALLTEXT], verbosity)
                     
-        g_list.append(g)
+        g_list.append(aut)
         accepting_list.append(accepting_states)
         formula_index += 1
     
@@ -428,9 +561,8 @@ def construct_automata_wring(formulas, spec_names, partition, inputs, outputs, u
                         all_transitions.append((state_from, label, state_to)) # add the transition
                         break
         
-        # create a new graph
-        g = digraph()
-        g.__init__()
+        # create a new automaton
+        aut = Automaton()
     
         for state in states:
             if state == initial_state:
@@ -438,25 +570,18 @@ def construct_automata_wring(formulas, spec_names, partition, inputs, outputs, u
                     non_accepting_states.remove(state)
                     non_accepting_states.append("initial")
                 state = "initial"
-            g.add_node(state)
+            aut.add_state(state)
         
         for (state_from, label, state_to) in all_transitions:
             if state_from == initial_state:
                 state_from = "initial"
             if state_to == initial_state:
                 state_to = "initial"
-                
-            if not g.has_edge((state_from, state_to)):
-                g.add_edge((state_from, state_to), wt=1, label=label)
-            else:
-                new_label = g.edge_label((state_from, state_to))
-                new_label += " || " + label 
-                weight = g.edge_weight((state_from, state_to)) + 1
-                g.set_edge_label((state_from, state_to), new_label)
-                g.set_edge_weight((state_from, state_to), weight)
-
-        g_list.append(g)
-        accepting_list.append(non_accepting_states)
+            aut.add_edge(aut.add_state(state_from), aut.add_state(state_to), label)
+
+        aut.accepting = set([aut.states_index[state] for state in non_accepting_states if state in aut.states_index])
+        g_list.append(aut)
+        accepting_list.append(sorted(aut.accepting))
      
     return (g_list, accepting_list)     
 
@@ -491,11 +616,12 @@ def call_wring(formulas_list, spec_names, partition, verbosity, unique_id):
 
 #### Optimization 1: computes an under approximation of the set of states which cannot carry a counter value at least k (bounded vs unbounded states)
 def counters_optimization(aut, accepting_states, verbosity):
-    nb_states = len(aut.nodes())
+    nb_states = len(aut.states)
     nb_accepting_states = len(accepting_states)
     c = nb_states*[0]
-    if "initial" in accepting_states:
-        c[aut.nodes().index("initial")] = 1
+    if aut.initial() in accepting_states:
+        c[aut.initial()] = 1
+    predecessors = [[aut.edges[edge][0] for edge in in_edges] for in_edges in aut.in_edges()]
     
     has_changed = True
     c_prime = nb_states*[0]
@@ -503,26 +629,24 @@ def counters_optimization(aut, accepting_states, verbosity):
         has_changed = False
         c_prime = c[:]
 
-        i = 0
-        for state in aut.nodes():
-            new_counter = c[i]
+        for state in range(nb_states):
+            new_counter = c[state]
                         
-            for pred_state in aut.incidents(state):
+            for pred_state in predecessors[state]:
                 if pred_state in accepting_states:
-                    temp = min(nb_accepting_states+1, c[aut.nodes().index(pred_state)]+1)
+                    temp = min(nb_accepting_states+1, c[pred_state]+1)
                 else:
-                    temp = min(nb_accepting_states+1, c[aut.nodes().index(pred_state)])
+                    temp = min(nb_accepting_states+1, c[pred_state])
               
                 if(temp > new_counter):
                     new_counter = temp
                     has_changed = True        
-            c_prime[i] = new_counter
-            i += 1                    
+            c_prime[state] = new_counter
         c = c_prime[:]
  
     for i in range(0, nb_states):
         if c[i] < nb_accepting_states+1:
-            aut.add_node_attribute(aut.nodes()[i], ('unbounded', FALSE))
-            controled_print("state %s is bounded\n" % aut.nodes()[i], [ALLTEXT], verbosity)
+            aut.unbounded[i] = FALSE
+            controled_print("state %s is bounded\n" % aut.states[i], [ALLTEXT], verbosity)
 
     return aut
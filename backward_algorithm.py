@@ -21,6 +21,7 @@ from constants import *
 from library_linker import *
 from synthesis import *
 from utils import *
+from run_report import *
 
 #### Computes the fix point from start_antichain_1 which belongs to starting_player (calls a dylib C)
 def compute_fix_point(start_antichain_1, start_antichain_2, alphabet, starting_player, critical, verbosity):
@@ -45,11 +46,12 @@ def compute_fix_point(start_antichain_1, start_antichain_2, alphabet, starting_p
     else:
         controled_print('Antichain size (Environment): %d\n' % a1.contents.size, [ALLTEXT], verbosity)
     if verbosity == ALLTEXT:
-        print_antichain_c(a1, PRINT_TUPLE_FUNC(print_tuple_c))
+        print_antichain_c(a1, PRINT_TUPLE_C_FUNC)
         
     (a2, size_crit_set) = compute_pre(a1, start_antichain_2, alphabet, critical, switch_player(starting_player), verbosity)
     fp_comp_antichain.append(a2)
     size_max_crit_set = size_crit_set
+    crit_set_sizes = [size_crit_set]
     (a3, size_crit_set) = compute_pre(a2, a1, alphabet, critical, starting_player, verbosity)
     size_max_crit_set = max(size_max_crit_set, size_crit_set)
     fp_comp_antichain.append(a3)
@@ -59,7 +61,7 @@ def compute_fix_point(start_antichain_1, start_antichain_2, alphabet, starting_p
     size_max_other_player = a2.contents.size
     
     # Iterate while the fix point isn't reached
-    while not compare_antichains_c(a1, a3, COMPARE_TUPLES_FUNC(compare_tuples_c)):
+    while not compare_antichains_c(a1, a3, COMPARE_TUPLES_C_FUNC):
         nb_iter += 1
  
         a1 = a3
@@ -67,6 +69,7 @@ def compute_fix_point(start_antichain_1, start_antichain_2, alphabet, starting_p
         fp_comp_antichain.append(a2)
 
         size_max_crit_set = max(size_max_crit_set, size_crit_set)
+        crit_set_sizes.append(size_crit_set)
 
         if starting_player == P_O and size_crit_set == 0: # if there were no critical signals, we don't need to recompute Pre_O(a2) as a2 hasn't changed since last iteration so the fix point is reached
             break
@@ -83,9 +86,11 @@ def compute_fix_point(start_antichain_1, start_antichain_2, alphabet, starting_p
     controled_print("Maximum sizes of antichains (Starting player, Other player): (%d, %d)\n" % (size_max_starting_player, size_max_other_player), [ALLTEXT, MINTEXT], verbosity)
     controled_print("Nb elements in fix point (Starting player, Other player): (%d, %d)\n" % (a1.contents.size, a2.contents.size), [ALLTEXT, MINTEXT], verbosity)
     controled_print("Elapsed time: " + str(time.clock()-start_time) + "\n\n", [ALLTEXT, MINTEXT], verbosity)
+    update_check(algorithm=BACKWARD, nb_iter=nb_iter, critical_set_sizes=crit_set_sizes, max_critical_set_size=size_max_crit_set, starting_player=starting_player,
+                 max_antichain_sizes=(size_max_starting_player, size_max_other_player), fix_point_sizes=(a1.contents.size, a2.contents.size))
     
-    a1_sg = clone_antichain_c(a1, CLONE_TUPLE_FUNC(clone_tuple_c))
-    a2_sg = clone_antichain_c(a2, CLONE_TUPLE_FUNC(clone_tuple_c))
+    a1_sg = clone_antichain_c(a1, CLONE_TUPLE_C_FUNC)
+    a2_sg = clone_antichain_c(a2, CLONE_TUPLE_C_FUNC)
 
     # Build the safety game (structure containing the two antichains (one for each player))
     if starting_player == P_O:
@@ -99,9 +104,9 @@ def compute_fix_point(start_antichain_1, start_antichain_2, alphabet, starting_p
         clean_cache_critical_set_c()
     free_not_defined_tuple_c()
     for a in fp_comp_antichain:
-        free_antichain_full_c(a, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
+        free_antichain_full_c(a, FREE_TUPLE_FULL_C_FUNC)
 
-    return sg
+    return OwnedSafetyGame(sg)
     
 #### Applies the Pre function
 #### Implements the critical signals optimization   
@@ -124,6 +129,6 @@ def compute_pre(antichain, prev_antichain, alphabet, critical, player, verbosity
     else:
         controled_print('Antichain size (System): %d\n' % pre.contents.size, [ALLTEXT], verbosity)
     if verbosity == ALLTEXT:
-        print_antichain_c(pre, PRINT_TUPLE_FUNC(print_tuple_c))
+        print_antichain_c(pre, PRINT_TUPLE_C_FUNC)
 
     return (pre, nb_critical_signals)
\ No newline at end of file
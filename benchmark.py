@@ -0,0 +1,282 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import re
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+import tempfile
+import shutil
+
+# Benchmark families (directories of examples/ containing .ltl/.part pairs)
+BENCHMARK_FAMILIES = {"demo-lily": "examples/demo-lily/",
+                      "buffer": "examples/buffer/",
+                      "LoadBalancing": "examples/LoadBalancing/",
+                      "SRA": "examples/SRA/",
+                      "LTL2DBA": "examples/LTL2DBA/",
+                      "LTL2DPA": "examples/LTL2DPA/",
+                      "generated": "examples/generated/"} # instances written by benchmark_generators.py
+ACACIA = "acacia"
+LTL2AIG = "ltl2aig"
+
+# Fixed options of the runs (the compositional options are added for the instances in [spec_unit] layout)
+ACACIA_OPTIONS = ["--player", "2", "--kbound", "5", "--verb", "0"]
+ACACIA_COMP_OPTIONS = ["--nbw", "COMP", "--syn", "COMP"]
+LTL2AIG_K = 3
+LTL2AIG_VERDICTS = {10: "REAL", 20: "UNREAL", 30: "UNKNOWN"}
+
+#### Returns the list of instances (name, ltl file, partition file, compositional) of the families whose name matches the filter regular expression
+def find_instances(families, instance_filter):
+    instances = []
+    for family in families:
+        for (directory, subdirectories, files) in sorted(os.walk(BENCHMARK_FAMILIES[family])):
+            for f in sorted(files, key=natural_sort_key):
+                if not f.endswith(".ltl"):
+                    continue
+                ltl_file = os.path.join(directory, f)
+                part_file = ltl_file[:-4] + ".part"
+                name = family + "/" + os.path.relpath(ltl_file, BENCHMARK_FAMILIES[family])[:-4]
+                if not os.path.exists(part_file) or not re.search(instance_filter, name):
+                    continue
+                instances.append((name, ltl_file, part_file, is_compositional(ltl_file)))
+    return instances
+
+#### Sorts gb_s2_r10 after gb_s2_r9
+def natural_sort_key(s):
+    return [int(token) if token.isdigit() else token for token in re.split("([0-9]+)", s)]
+
+#### Returns True if the formula of ltl_file is split in [spec_unit] blocks
+def is_compositional(ltl_file):
+    f = open(ltl_file, "r")
+    compositional = "[spec_unit" in f.read()
+    f.close()
+    return compositional
+
+#### Runs command in its own process group, kills it after timeout seconds (if timeout > 0)
+#### Returns (exit code or None if timed out, wall time, peak RSS in kB)
+def run_command(command, timeout):
+    start_time = time.time()
+    devnull = open(os.devnull, "w")
+    process = subprocess.Popen(command, stdout=devnull, stderr=devnull, preexec_fn=os.setpgrp)
+    timed_out = False
+    while True:
+        (pid, status, rusage) = os.wait4(process.pid, os.WNOHANG)
+        if pid != 0:
+            break
+        if timeout > 0 and time.time()-start_time > timeout:
+            os.killpg(process.pid, signal.SIGKILL)
+            (pid, status, rusage) = os.wait4(process.pid, 0)
+            timed_out = True
+            break
+        time.sleep(0.05)
+    process.returncode = status # the process has been waited for by os.wait4
+    devnull.close()
+    wall_time = time.time()-start_time
+    if timed_out:
+        return (None, wall_time, rusage.ru_maxrss)
+    return (os.WEXITSTATUS(status), wall_time, rusage.ru_maxrss)
+
+#### Copies the formula and partition files of the instance in a new temporary directory, in which the tools write their output files next to them
+#### Returns (temporary directory, ltl file, partition file), the temporary directory being removed by the caller
+def copy_instance_to_temporary_directory(instance):
+    (name, ltl_file, part_file, compositional) = instance
+    work_dir = tempfile.mkdtemp(prefix="acacia_benchmark_")
+    work_ltl_file = os.path.join(work_dir, os.path.basename(ltl_file))
+    work_part_file = os.path.join(work_dir, os.path.basename(part_file))
+    shutil.copyfile(ltl_file, work_ltl_file)
+    shutil.copyfile(part_file, work_part_file)
+    return (work_dir, work_ltl_file, work_part_file)
+
+#### Runs Acacia+ on the instance and returns its record (verdict, minimal values of k, time of each phase, peak memory)
+#### The instance is solved in a temporary directory, so that its solution files are not written in examples/
+def run_acacia(instance, extra_options, timeout):
+    (name, ltl_file, part_file, compositional) = instance
+    (work_dir, ltl_file, part_file) = copy_instance_to_temporary_directory(instance)
+    report_file = os.path.join(work_dir, "report.json")
+    command = [sys.executable, "acacia_plus.py", "--ltl", ltl_file, "--part", part_file, "--report", report_file] + ACACIA_OPTIONS + extra_options
+    if compositional:
+        command += ACACIA_COMP_OPTIONS
+    try:
+        (exit_code, wall_time, peak_rss) = run_command(command, timeout)
+        try:
+            f = open(report_file, "r")
+            report = json.load(f)
+            f.close()
+        except (IOError, ValueError):
+            report = None
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    record = {"wall_time": wall_time, "peak_rss_kb": peak_rss}
+
+    if exit_code is None:
+        record["verdict"] = "TIMEOUT"
+    elif report is None:
+        record["verdict"] = "ERROR"
+    else:
+        result = report["result"]
+        if result.get("realizable"):
+            record["verdict"] = "REAL"
+        elif result.get("unrealizable"):
+            record["verdict"] = "UNREAL"
+        else:
+            record["verdict"] = "UNKNOWN"
+        record["k_values"] = result.get("k_values")
+        record["cpu_time"] = sum([phase["cpu_time"] for phase in report["phases"]])
+        record["phases"] = dict([(phase["name"], phase["wall_time"]) for phase in report["phases"]])
+    return record
+
+#### Runs ltl2aig on the instance and returns its record (verdict, time, peak memory, size of the AIG)
+#### The instance is solved in a temporary directory, so that its AIG files are not written in examples/
+def run_ltl2aig(instance, k, timeout):
+    (name, ltl_file, part_file, compositional) = instance
+    (work_dir, ltl_file, part_file) = copy_instance_to_temporary_directory(instance)
+    command = [sys.executable, "ltl2aig.py", ltl_file, part_file, str(k)]
+    if compositional:
+        command.append("-c")
+    try:
+        (exit_code, wall_time, peak_rss) = run_command(command, timeout)
+
+        record = {"wall_time": wall_time, "peak_rss_kb": peak_rss}
+        if exit_code is None:
+            record["verdict"] = "TIMEOUT"
+            return record
+        record["verdict"] = LTL2AIG_VERDICTS.get(exit_code, "ERROR")
+        suffix = "comp" + str(k) if compositional else str(k)
+        for verdict in ["REAL", "UNREAL"]:
+            aig_file = ltl_file[:-4] + "_" + suffix + "_" + verdict + ".aag"
+            if os.path.exists(aig_file):
+                f = open(aig_file, "r")
+                header = f.readline().split() # aag M I L O A
+                f.close()
+                if len(header) >= 6:
+                    record["aig_size"] = dict(zip(["max_var", "inputs", "latches", "outputs", "ands"], [int(x) for x in header[1:6]]))
+        return record
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+#### Writes results in CSV format in filename (one line per run: tool, instance, size, verdict, wall time, peak RSS, number of AND gates)
+def write_csv(filename, results):
+    f = open(filename, "w")
+    f.write("tool,instance,size,verdict,wall_time,peak_rss_kb,ands\n")
+    for key in sorted(results.keys(), key=natural_sort_key):
+        (tool, instance) = key.split(":", 1)
+        numbers = re.findall("[0-9]+", instance)
+        size = numbers[-1] if len(numbers) > 0 else ""
+        record = results[key]
+        ands = record["aig_size"]["ands"] if "aig_size" in record else ""
+        f.write("%s,%s,%s,%s,%.3f,%d,%s\n" % (tool, instance, size, record["verdict"], record["wall_time"], record["peak_rss_kb"], ands))
+    f.close()
+
+#### Compares the records of results to the ones of baseline
+#### Returns the list of regressions: time or memory larger by more than the thresholds (relative), other verdict, larger k or larger AIG
+def compare_to_baseline(results, baseline, time_threshold, memory_threshold, min_time):
+    regressions = []
+    for key in sorted(results.keys()):
+        if key not in baseline:
+            continue
+        (new, old) = (results[key], baseline[key])
+        if new["verdict"] != old["verdict"]:
+            regressions.append("%s: verdict %s (baseline: %s)" % (key, new["verdict"], old["verdict"]))
+            continue
+        if new["wall_time"] > old["wall_time"]*(1+time_threshold) and new["wall_time"]-old["wall_time"] > min_time:
+            regressions.append("%s: time %.2fs (baseline: %.2fs)" % (key, new["wall_time"], old["wall_time"]))
+        if new["peak_rss_kb"] > old["peak_rss_kb"]*(1+memory_threshold):
+            regressions.append("%s: peak memory %d kB (baseline: %d kB)" % (key, new["peak_rss_kb"], old["peak_rss_kb"]))
+        if new.get("k_values") and old.get("k_values") and max(new["k_values"]) > max(old["k_values"]):
+            regressions.append("%s: k values %s (baseline: %s)" % (key, new["k_values"], old["k_values"]))
+        if "aig_size" in new and "aig_size" in old and new["aig_size"]["ands"] > old["aig_size"]["ands"]:
+            regressions.append("%s: %d AND gates (baseline: %d)" % (key, new["aig_size"]["ands"], old["aig_size"]["ands"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the benchmarks of examples/ with Acacia+ and ltl2aig and compares the results to a baseline")
+    parser.add_argument("-f", "--families", dest="families", default=",".join(sorted(BENCHMARK_FAMILIES.keys())),
+                        help="benchmark families to run, separated by commas (default: all)")
+    parser.add_argument("-i", "--instances", dest="instance_filter", default="",
+                        help="regular expression selecting the instances (family/name) to run")
+    parser.add_argument("-t", "--tools", dest="tools", default=ACACIA + "," + LTL2AIG,
+                        help="tools to run, separated by commas (acacia, ltl2aig), default: both")
+    parser.add_argument("-a", "--acacia-options", dest="acacia_options", default="",
+                        help="additional options given to Acacia+ (e.g. \"--algo BACKWARD\")")
+    parser.add_argument("-k", dest="k", default=LTL2AIG_K, type=int,
+                        help="value of k given to ltl2aig, default: " + str(LTL2AIG_K))
+    parser.add_argument("--timeout", dest="timeout", default=600., type=float,
+                        help="time (in seconds) after which a run is killed, default: 600")
+    parser.add_argument("-o", "--output", dest="output", default="benchmark_results.json",
+                        help="file in which the results are written, default: benchmark_results.json")
+    parser.add_argument("--csv", dest="csv", default="",
+                        help="file in which the results are also written in CSV format, with the size of each instance (its last number) for scaling plots")
+    parser.add_argument("-b", "--baseline", dest="baseline", default="",
+                        help="results file of a previous run to compare to")
+    parser.add_argument("--time-threshold", dest="time_threshold", default=0.2, type=float,
+                        help="relative increase of time considered as a regression, default: 0.2")
+    parser.add_argument("--memory-threshold", dest="memory_threshold", default=0.2, type=float,
+                        help="relative increase of peak memory considered as a regression, default: 0.2")
+    parser.add_argument("--min-time", dest="min_time", default=0.5, type=float,
+                        help="absolute increase of time (in seconds) under which no time regression is reported, default: 0.5")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # Acacia+ looks for its library and tools from its directory
+    families = [family.strip() for family in args.families.split(",")]
+    for family in families:
+        if family not in BENCHMARK_FAMILIES:
+            print "Unknown benchmark family: " + family + " (" + ", ".join(sorted(BENCHMARK_FAMILIES.keys())) + ")"
+            exit(1)
+    tools = [tool.strip().lower() for tool in args.tools.split(",")]
+    for tool in tools:
+        if tool not in [ACACIA, LTL2AIG]:
+            print "Unknown tool: " + tool + " (acacia or ltl2aig)"
+            exit(1)
+
+    results = {}
+    for instance in find_instances(families, args.instance_filter):
+        for tool in tools:
+            key = tool + ":" + instance[0]
+            if tool == ACACIA:
+                record = run_acacia(instance, args.acacia_options.split(), args.timeout)
+            else:
+                record = run_ltl2aig(instance, args.k, args.timeout)
+            results[key] = record
+            print "%-60s %-8s %8.2fs %10d kB" % (key, record["verdict"], record["wall_time"], record["peak_rss_kb"])
+            sys.stdout.flush()
+
+    f = open(args.output, "w")
+    json.dump({"options": vars(args), "results": results}, f, indent=2, sort_keys=True)
+    f.write("\n")
+    f.close()
+    if args.csv != "":
+        write_csv(args.csv, results)
+
+    if args.baseline != "":
+        f = open(args.baseline, "r")
+        baseline = json.load(f)["results"]
+        f.close()
+        regressions = compare_to_baseline(results, baseline, args.time_threshold, args.memory_threshold, args.min_time)
+        if len(regressions) > 0:
+            print "\n" + str(len(regressions)) + " regression(s) with respect to " + args.baseline + ":"
+            for regression in regressions:
+                print "  " + regression
+            exit(1)
+        print "\nNo regression with respect to " + args.baseline
+
+if __name__ == "__main__":
+    main()
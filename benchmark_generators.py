@@ -0,0 +1,162 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import argparse
+
+from constants import *
+
+# Generators of .ltl/.part pairs of the parametric families of examples/ at arbitrary size:
+#   - buffer: generalized buffer with s senders and r receivers (examples/buffer/gb_s2_r*)
+#   - load: load balancing with n clients (examples/LoadBalancing/load-balancing/load_full_*)
+# A generator returns the list of spec units (name, assumptions, guarantees), the input signals and the output signals
+BUFFER = "buffer"
+LOAD = "load"
+GENERATED_DIR = "examples/generated/" # default output directory (benchmark family "generated" of benchmark.py)
+SEPARATOR = "################################################"
+
+#### Returns the formula which holds iff at most one of the formulas is true (disjunction, over each formula, of the conjunction of the negations of the other ones)
+def at_most_one(negated_formulas):
+    if len(negated_formulas) < 2:
+        return "1"
+    terms = []
+    for i in range(len(negated_formulas)):
+        others = [negated_formulas[(i+j) % len(negated_formulas)] for j in range(len(negated_formulas)-1)]
+        terms.append("(" + " * ".join(others) + ")")
+    return "\n  + ".join(terms)
+
+#### Generalized buffer with nb_senders senders and nb_receivers receivers
+def generate_buffer(nb_senders, nb_receivers):
+    units = []
+    acks_exclusion = "G(" + at_most_one(["b2s_ack%d=0" % i for i in range(nb_senders)]) + ")"
+    for i in range(nb_senders):
+        assumptions = ["s2b_req%d=0" % i,
+                       "G((s2b_req%d=1 * b2s_ack%d=0) -> X(s2b_req%d=1))" % (i, i, i),
+                       "G(b2s_ack%d=1 -> X(s2b_req%d=0))" % (i, i)]
+        guarantees = ["b2s_ack%d=0" % i,
+                      "G( (s2b_req%d=0 * X(s2b_req%d=1)) -> X(b2s_ack%d=0 * X(F(b2s_ack%d=1))) )" % (i, i, i, i),
+                      "G( (b2s_ack%d=0 * X(s2b_req%d=0)) -> X(b2s_ack%d=0) )" % (i, i, i),
+                      acks_exclusion]
+        units.append(("s2b_%d" % i, assumptions, guarantees))
+
+    reqs_exclusion = "G(  " + at_most_one(["b2r_req%d=0" % i for i in range(nb_receivers)]) + "\n )"
+    some_sender_req = " + ".join(["s2b_req%d=1" % i for i in range(nb_senders)])
+    some_receiver_req = " + ".join(["b2r_req%d=1" % i for i in range(nb_receivers)])
+    for i in range(nb_receivers):
+        previous = (i-1) % nb_receivers # token passing to the previous receiver, as in gb_s2_r*
+        assumptions = ["r2b_ack%d=0" % i,
+                       "G(b2r_req%d=0 -> X(r2b_ack%d=0))" % (i, i),
+                       "G(b2r_req%d=1 -> X(F(r2b_ack%d=1)))" % (i, i)]
+        guarantees = ["b2r_req%d=0" % i,
+                      "G(r2b_ack%d=1 -> X(b2r_req%d=0))" % (i, i),
+                      "G((b2r_req%d=1 * r2b_ack%d=0) -> X(b2r_req%d=1))" % (i, i, i)]
+        if nb_receivers > 1:
+            guarantees.append("G((b2r_req%d=1 * X(b2r_req%d=0)) -> X( b2r_req%d=0 U (b2r_req%d=0 * b2r_req%d=1)))" % (i, i, i, i, previous))
+            guarantees.append(reqs_exclusion)
+        guarantees.append("G((" + some_sender_req + ") -> X(F(" + some_receiver_req + ")))")
+        units.append(("b2r_%d" % i, assumptions, guarantees))
+
+    inputs = ["s2b_req%d" % i for i in range(nb_senders)] + ["r2b_ack%d" % i for i in range(nb_receivers)]
+    outputs = ["b2s_ack%d" % i for i in range(nb_senders)] + ["b2r_req%d" % i for i in range(nb_receivers)]
+    return (units, inputs, outputs)
+
+#### Load balancing with nb_clients clients (client 0 has priority over the other ones)
+def generate_load(nb_clients):
+    no_grant = " * ".join(["(!(X(grant%d=1)))" % i for i in range(nb_clients)])
+    assumptions = ["(G ((!((idle=1) * " + no_grant + ")) + (X (idle=1))))",
+                   "(G (F (idle=1)))",
+                   "(G ((!(X(grant0=1))) + (X (((!(request0=1)) * (!(idle=1))) U ((!(request0=1)) * (idle=1))))))"]
+    exclusion = " * ".join(["((!(X(grant%d=1))) + (!(X(grant%d=1))))" % (i, j) for i in range(nb_clients) for j in range(nb_clients) if i != j])
+    units = [("u0", assumptions, ["(G (" + exclusion + "))"])]
+    for i in range(nb_clients):
+        guarantees = ["(G ((!(X(grant%d=1))) + (request%d=1)))" % (i, i),
+                      "(!(F (G ((request%d=1) * (!(X(grant%d=1)))))))" % (i, i)]
+        if i == 0:
+            guarantees.append("(G ((" + no_grant + ") + (idle=1)))")
+        else:
+            guarantees.append("(G ((!(request0=1)) + (!(X(grant%d=1)))))" % i)
+        units.append(("u%d" % (i+1), assumptions, guarantees))
+
+    inputs = ["idle"] + ["request%d" % i for i in range(nb_clients)]
+    outputs = ["grant%d" % i for i in range(nb_clients)]
+    return (units, inputs, outputs)
+
+#### Returns the content of the .ltl file of units, in compositional layout ([spec_unit] blocks and group_order) or monolithic layout (one formula)
+def units_to_ltl(units, compositional, group_order):
+    text = ""
+    if compositional:
+        for (name, assumptions, guarantees) in units:
+            text += SEPARATOR + "\n[spec_unit " + name + "]\n" + SEPARATOR + "\n"
+            for assumption in assumptions:
+                text += "assume " + assumption + ";\n"
+            text += "\n"
+            for guarantee in guarantees:
+                text += guarantee + ";\n"
+            text += "\n"
+        text += "group_order = " + group_order + ";\n"
+    else: # each assumption and guarantee once
+        formulas = []
+        for (name, assumptions, guarantees) in units:
+            formulas += ["assume " + assumption for assumption in assumptions if "assume " + assumption not in formulas]
+        for (name, assumptions, guarantees) in units:
+            formulas += [guarantee for guarantee in guarantees if guarantee not in formulas]
+        text += "".join([formula + ";\n" for formula in formulas])
+    return text
+
+#### Writes the .ltl/.part pair of units in directory and returns the name of the .ltl file
+def write_instance(directory, name, units, inputs, outputs, compositional, group_order):
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    f = open(os.path.join(directory, name + ".ltl"), "w")
+    f.write(units_to_ltl(units, compositional, group_order))
+    f.close()
+    f = open(os.path.join(directory, name + ".part"), "w")
+    f.write(".inputs " + " ".join(inputs) + "\n.outputs " + " ".join(outputs) + "\n")
+    f.close()
+    return os.path.join(directory, name + ".ltl")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates the buffer and load balancing benchmark families at arbitrary size")
+    parser.add_argument("family", metavar="family", type=str, help="family of the instances (buffer or load)")
+    parser.add_argument("sizes", metavar="size", type=int, nargs="+", help="sizes of the instances (number of receivers for buffer, number of clients for load)")
+    parser.add_argument("-s", "--senders", dest="nb_senders", default=2, type=int, help="number of senders for buffer, default: 2")
+    parser.add_argument("-m", "--mono", dest="compositional", default=True, action="store_const", const=False,
+                        help="monolithic layout (one formula) instead of the compositional layout ([spec_unit] blocks)")
+    parser.add_argument("-g", "--group-order", dest="group_order", default=FLAT, type=str,
+                        help="group_order of the compositional layout (FLAT, BINARY or a parenthesizing of the spec units), default: FLAT")
+    parser.add_argument("-o", "--output", dest="directory", default=GENERATED_DIR, help="output directory, default: " + GENERATED_DIR)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        if size < 1:
+            print "Sizes must be positive"
+            exit(1)
+        if args.family == BUFFER:
+            (units, inputs, outputs) = generate_buffer(args.nb_senders, size)
+            name = "gb_s%d_r%d" % (args.nb_senders, size)
+        elif args.family == LOAD:
+            (units, inputs, outputs) = generate_load(size)
+            name = "load_full_%d" % size
+        else:
+            print "Unknown family: " + args.family + " (buffer or load)"
+            exit(1)
+        if not args.compositional:
+            name += "_mono"
+        print write_instance(args.directory, name, units, inputs, outputs, args.compositional, args.group_order)
+
+if __name__ == "__main__":
+    main()
@@ -55,11 +55,25 @@ BINARY = "BINARY"
 FORWARD = "forward"
 BACKWARD = "backward"
 
+# Search of k
+LINEAR = "linear"
+GALLOP = "gallop"
+ADAPTIVE = "adaptive"
+
+# Maximum number of nodes of the branch and bound computing a minimal cover of the label of each transition of a solution (see unate_cover in qm.py)
+QM_MAX_NODES = 1000
+
 # Check
 REAL = "REAL"
 UNREAL = "UNREAL"
 BOTH = "BOTH"
 
+# Number of bits of a label held by each integer of the array exported by export_transition_system (EXPORTED_LABEL_WORD_BITS in transition_system.h)
+EXPORTED_LABEL_WORD_BITS = 31
+
+# Portfolio mode: default configurations (algorithm:critical signals optimization:optimizations) raced in parallel
+DEFAULT_PORTFOLIO = "forward:on:12,backward:on:12,backward:off:12,backward:on:1"
+
 # main dir 
 MAIN_DIR_PATH = "./"
 
@@ -70,3 +84,6 @@ TMP_PATH = MAIN_DIR_PATH+"tmp/"
 LTL2BA_PATH = MAIN_DIR_PATH+"tools/ltl2ba-1.1/"
 LTL3BA_PATH = MAIN_DIR_PATH+"tools/ltl3ba-1.0.2/"
 SPOT_PATH = MAIN_DIR_PATH+"tools/spot-1.0/"
+
+# Environment variable enabling the tracing of the calls to the C library (see library_linker): "1" to print the profile on stderr at exit, or the profile file name
+TRACE_CTYPES_ENV = "ACACIA_PLUS_TRACE_CTYPES"
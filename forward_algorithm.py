@@ -17,18 +17,19 @@
 
 from library_linker import *
 from utils import *
+from run_report import *
 
 #### Calls the a variant of the OTFUR algorithm implemented in C
 def otfur(start_antichain1, start_antichain2, cf_info, alphabet, starting_player, dimension, c_value, options):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_strategies, warm_start, path, filename) = options
     controled_print("Forward algorithm (OTFUR):\n", [ALLTEXT, MINTEXT], verbosity)
     if starting_player == P_O:
         result = otfur_c(start_antichain1, start_antichain2, cf_info, alphabet, starting_player, dimension, c_value)
     else:
         result = otfur_c(start_antichain2, start_antichain1, cf_info, alphabet, starting_player, dimension, c_value)
     
-    free_antichain_full_c(start_antichain1, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
-    free_antichain_full_c(start_antichain2, FREE_TUPLE_FULL_FUNC(free_tuple_full_c))
+    free_antichain_full_c(start_antichain1, FREE_TUPLE_FULL_C_FUNC)
+    free_antichain_full_c(start_antichain2, FREE_TUPLE_FULL_C_FUNC)
     
     controled_print("Nb of iterations: " + str(result.contents.nb_iter) + "\n", [ALLTEXT, MINTEXT], verbosity)
     controled_print("Nb of states explored: " + str(result.contents.nb_cf_passed) + "\n", [ALLTEXT, MINTEXT], verbosity)
@@ -36,6 +37,13 @@ def otfur(start_antichain1, start_antichain2, cf_info, alphabet, starting_player
     controled_print("Winning positions extraction time: " + str(round(result.contents.winning_positions_computation_time, 2)) + "\n", [ALLTEXT, MINTEXT], verbosity)
     controled_print("Size of antichain of winning positions (System, Environment): (" + str(result.contents.winning_positions.contents.positions_O.contents.size) + ", " + str(result.contents.winning_positions.contents.positions_I.contents.size) + ")\n", [ALLTEXT, MINTEXT], verbosity)
     controled_print("Elapsed time: " + str(round(result.contents.otfur_time + result.contents.winning_positions_computation_time, 2)) + "\n\n", [ALLTEXT, MINTEXT], verbosity)
+    sizes = (result.contents.winning_positions.contents.positions_O.contents.size, result.contents.winning_positions.contents.positions_I.contents.size)
+    if starting_player == P_I:
+        sizes = (sizes[1], sizes[0])
+    update_check(algorithm=FORWARD, nb_iter=result.contents.nb_iter, nb_explored_states=result.contents.nb_cf_passed, otfur_time=result.contents.otfur_time, starting_player=starting_player,
+                 winning_positions_computation_time=result.contents.winning_positions_computation_time, fix_point_sizes=sizes)
     
-    return result.contents.winning_positions
+    winning_positions = OwnedSafetyGame(cast(result.contents.winning_positions, POINTER(SafetyGame))) # copy of the pointer, as result is freed
+    free_c(result)
+    return winning_positions
             
\ No newline at end of file
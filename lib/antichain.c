@@ -59,6 +59,7 @@ add_element_to_antichain_and_free(antichain* a, void *element, char (*compare_el
 		}
 		a->incomparable_elements = g_list_append(a->incomparable_elements, element);
 		a->size++;
+		record_antichain_size(a->size);
 	}
 	else {
 		free_element(element);
@@ -94,6 +95,7 @@ add_element_to_antichain(antichain* a, void *element, char (*compare_elements)(v
 		}
 		a->incomparable_elements = g_list_append(a->incomparable_elements, element);
 		a->size++;
+		record_antichain_size(a->size);
 	}
 }
 
@@ -367,6 +369,7 @@ compose_antichains(antichain** antichains, int nb_antichains, void* (*compose_el
 	}
 	antichain *composition = (antichain*)malloc(sizeof(antichain));
 	composition->size = g_list_length(list);
+	record_antichain_size(composition->size);
 	composition->incomparable_elements = list;
 
 	return composition;
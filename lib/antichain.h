@@ -24,6 +24,7 @@
 #include <stdlib.h>
 #include <glib.h>
 #include "linked_list.h"
+#include "stats.h"
 
 /** Structures **/
 /** Antichain : a size and a list of incomparable elements **/
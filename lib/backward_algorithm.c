@@ -31,6 +31,67 @@ build_start_antichain(char player, GNode* info, int dimension, int *max_credit)
 	return a_init;
 }
 
+/** Warm start: lifts the antichain a (a fix point computed for smaller values of K) in the counting functions space described by cfinfo
+    Each counter c of each automaton becomes min(c+delta, max) where delta is the increase of K for that automaton and max is the counter of the maximal
+    counting function. The lifted antichain contains the fix point for the new values of K and can thus replace the start antichain of the fix point computation
+    Returns NULL if the counting functions of a are not defined on the same automata than cfinfo (e.g. if they have been optimized differently: the states removed as k-surely losing for the previous value of K may be safe for the new one, so the fix point computed without them does not contain the new fix point) **/
+antichain*
+lift_start_antichain(antichain* a, GNode* cfinfo) {
+	cf_info *info = (cf_info*)cfinfo->data;
+	antichain *lifted = new_antichain();
+	counting_function *max_cf[3] = {NULL, NULL, NULL}; //maximal counting functions of P_I and P_O (built on demand)
+
+	GList *curlink = a->incomparable_elements;
+	tuple *t;
+	counting_function *cf;
+	cf_info *prev_info;
+	int i, k, delta, global_index;
+	while(curlink != NULL) {
+		t = (tuple*)curlink->data;
+		prev_info = (cf_info*)t->cf->info->data;
+		if(prev_info->composition_size != info->composition_size) {
+			free_antichain_full(lifted, (void*)free_tuple_full);
+			lifted = NULL;
+			break;
+		}
+		for(k=0; k<info->composition_size; k++) {
+			if(prev_info->automaton[k] != info->automaton[k] || prev_info->k_value[k] > info->k_value[k]) {
+				break;
+			}
+		}
+		if(k < info->composition_size) {
+			free_antichain_full(lifted, (void*)free_tuple_full);
+			lifted = NULL;
+			break;
+		}
+
+		if(max_cf[(int)t->cf->player] == NULL) {
+			max_cf[(int)t->cf->player] = build_maximal_counting_function(t->cf->player, cfinfo);
+		}
+		cf = new_counting_function(t->cf->player, cfinfo);
+		global_index = 0;
+		for(k=0; k<info->composition_size; k++) {
+			delta = info->k_value[k] - prev_info->k_value[k];
+			for(i=0; i<info->cf_size[k]; i++) {
+				cf->mapping[global_index+i] = MIN(t->cf->mapping[global_index+i]+delta, max_cf[(int)t->cf->player]->mapping[global_index+i]);
+			}
+			global_index += info->cf_size[k];
+		}
+		set_max_counter_and_sum_of_counters_of_counting_function(cf);
+		add_element_to_antichain_and_free(lifted, new_tuple(cf, clone_vector(t->credits)), (void*)compare_tuples, (void*)free_tuple_full);
+
+		curlink = curlink->next;
+	}
+
+	for(i=0; i<3; i++) {
+		if(max_cf[i] != NULL) {
+			free_counting_function(max_cf[i]);
+		}
+	}
+
+	return lifted;
+}
+
 /** Calls pre_O or pre_I function according to the player value **/
 antichain*
 pre(antichain* a, antichain* prev_a, char player, alphabet_info *alphabet) {
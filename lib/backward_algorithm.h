@@ -37,6 +37,7 @@ extern GHashTable *cache_tuples; //the cache memory used to store computed tuple
 /** Function prototypes **/
 void set_k_value(tbucw*, int);
 antichain* build_start_antichain(char, GNode*, int, int*);
+antichain* lift_start_antichain(antichain*, GNode*);
 antichain* pre(antichain*, antichain*, char, alphabet_info*);
 static antichain* pre_O(antichain*, antichain*, alphabet_info*);
 static antichain* pre_I(antichain*, antichain*, alphabet_info*);
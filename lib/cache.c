@@ -79,6 +79,12 @@ get_from_cache(GHashTable* cache, tuple* t, int sigma_index) {
 
 	void* value = g_hash_table_lookup(cache, key);
 	free(key);
+	if(value == NULL) {
+		SOLVER_STATS.cache_misses++;
+	}
+	else {
+		SOLVER_STATS.cache_hits++;
+	}
 
 	return value;
 }
@@ -263,9 +263,11 @@ is_passed(tuple* t, GHashTable *passed) {
 	char result;
 	if(g_hash_table_lookup(passed, key) == NULL) {
 		result = FALSE;
+		SOLVER_STATS.passed_misses++;
 	}
 	else {
 		result = TRUE;
+		SOLVER_STATS.passed_hits++;
 	}
 	free(key);
 	return result;
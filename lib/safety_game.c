@@ -98,8 +98,9 @@ compare_safety_game_edges_counters_sum_reverse(safety_game_edge *e1, safety_game
 /** Frees a safety game, and all data it contains **/
 void
 free_safety_game(safety_game *sg) {
-	free_antichain_full(sg->positions_I, (void*)free_tuple);
-	free_antichain_full(sg->positions_O, (void*)free_tuple);
+	free_antichain_full(sg->positions_I, (void*)free_tuple_full);
+	free_antichain_full(sg->positions_O, (void*)free_tuple_full);
+	free(sg);
 }
 
 /** Frees a safety game edge
@@ -0,0 +1,49 @@
+/*
+ * This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+ * Copyright (C) 2011-2013 UMONS-ULB
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along
+ * with this program; if not, write to the Free Software Foundation, Inc.,
+ * 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+ */
+
+#include "stats.h"
+
+solver_stats SOLVER_STATS = {0, 0, 0, 0, 0, 0, 0, 0};
+
+/** Returns the counters of the solver **/
+solver_stats*
+get_solver_stats() {
+	return &SOLVER_STATS;
+}
+
+/** Resets the counters of the solver **/
+void
+reset_solver_stats() {
+	SOLVER_STATS.cache_hits = 0;
+	SOLVER_STATS.cache_misses = 0;
+	SOLVER_STATS.passed_hits = 0;
+	SOLVER_STATS.passed_misses = 0;
+	SOLVER_STATS.tuple_comparisons = 0;
+	SOLVER_STATS.tuples_allocated = 0;
+	SOLVER_STATS.tuples_freed = 0;
+	SOLVER_STATS.peak_antichain_size = 0;
+}
+
+/** Updates the peak antichain size with the size of an antichain which has just grown **/
+void
+record_antichain_size(int size) {
+	if(size > SOLVER_STATS.peak_antichain_size) {
+		SOLVER_STATS.peak_antichain_size = size;
+	}
+}
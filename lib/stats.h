@@ -0,0 +1,47 @@
+/*
+ * This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+ * Copyright (C) 2011-2013 UMONS-ULB
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along
+ * with this program; if not, write to the Free Software Foundation, Inc.,
+ * 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+ */
+
+#ifndef STATS_H_
+#define STATS_H_
+
+#include <stdlib.h>
+#include <stdio.h>
+
+/** Structures **/
+// Counters of the solver, readable and resettable from Python (see library_linker)
+typedef struct {
+	long cache_hits; // lookups in the caches of the backward algorithm (cache.c) which found a value
+	long cache_misses; // lookups in the caches of the backward algorithm which did not find a value
+	long passed_hits; // lookups in the passed hash table of OTFUR which found a value
+	long passed_misses; // lookups in the passed hash table of OTFUR which did not find a value
+	long tuple_comparisons; // calls to compare_tuples and are_tuples_equal
+	long tuples_allocated;
+	long tuples_freed;
+	int peak_antichain_size; // maximal size reached by an antichain
+} solver_stats;
+
+/** Global variables **/
+extern solver_stats SOLVER_STATS;
+
+/** Function prototypes **/
+solver_stats* get_solver_stats();
+void reset_solver_stats();
+void record_antichain_size(int);
+
+#endif /* STATS_H_ */
@@ -24,6 +24,8 @@ tbucw*
 init_tbucw(int nb_states)  {
 	tbucw *aut = (tbucw*)malloc(sizeof(tbucw)+nb_states*sizeof(struct tbucw_state*));
 	aut->nb_states = 0; //will be incremented each time a state is added to the automaton
+	aut->v_I = NULL;
+	aut->v_O = NULL; // set by set_weight_function
 	struct tbucw_state *cur_s;
 	int i;
 	for(i=0; i<nb_states; i++) {
@@ -89,6 +91,34 @@ set_alphabet(tbucw* aut, alphabet_info* alphabet) {
 	return aut;
 }
 
+/** Builds the tbucw of nb_states states and nb_tran transitions described by flat arrays, in one call (equivalent to init_tbucw, set_alphabet,
+	add_state for each state, add_tran for each transition, set_initial_state, duplicate_all_tran and set_is_complete)
+	- states: 6 integers for the state of index i, from states[6*i]: nb_in_tran, nb_out_tran, is_accepting, player, unbounded and is_trash (see add_state)
+	- transitions: 4 integers for each transition, in the order in which they are added: from, to, disjunction size of the label and offset of the label in labels
+	- labels: the labels of the transitions (strings of 0s, 1s and 2s, see compute_label) **/
+tbucw*
+build_tbucw_from_arrays(int nb_states, int *states, int nb_tran, int *transitions, char *labels, alphabet_info *alphabet, int initial_state_index) {
+	tbucw *aut = init_tbucw(nb_states);
+	set_alphabet(aut, alphabet);
+
+	int i;
+	int *s, *t;
+	for(i=0; i<nb_states; i++) {
+		s = states+6*i;
+		add_state(aut, i, s[0], s[1], s[2], s[3], s[4], s[5]);
+	}
+	for(i=0; i<nb_tran; i++) {
+		t = transitions+4*i;
+		add_tran(aut, labels+t[3], t[2], t[0], t[1]);
+	}
+	set_initial_state(aut, initial_state_index);
+
+	duplicate_all_tran(aut);
+	set_is_complete(aut);
+
+	return aut;
+}
+
 /** Reports the accepting states to turn based states when it is possible (if a state s is accepting, we can put it non accepting
     and set all its successors s' (turn based states) accepting, only if those states s' do not have other predecessors than s)   **/
 void
@@ -456,6 +486,24 @@ compute_alphabets(alphabet_info *alphabet) {
 	}
 }
 
+/** Frees the alphabet information structure
+ 	Warning: it does not free the propositions, which are not copied by add_input_prop and add_output_prop **/
+void
+free_alphabet(alphabet_info *alphabet) {
+	int i;
+	for(i=0; i<alphabet->sigma_input_size; i++) {
+		free(alphabet->sigma_input[i]);
+	}
+	for(i=0; i<alphabet->sigma_output_size; i++) {
+		free(alphabet->sigma_output[i]);
+	}
+	free(alphabet->sigma_input);
+	free(alphabet->sigma_output);
+	free(alphabet->input);
+	free(alphabet->output);
+	free(alphabet);
+}
+
 /** Returns true if state_index has at least one successor for sigma in aut **/
 char
 has_succ(tbucw *aut, struct tbucw_state *state, LABEL_BIT_REPRES *sigma, char player) {
@@ -735,8 +783,8 @@ print_formula(LABEL_BIT_REPRES *formula, int nb_prop, char **prop) {
 	}
 }
 
-/** Frees the turn based automaton
- 	Warning: it does not free the alphabet **/
+/** Frees the turn based automaton (and its weight functions)
+ 	Warning: it does not free the alphabet, which must be freed after the automaton **/
 void
 free_tbucw(tbucw* aut) {
 	int nb_states = aut->nb_states;
@@ -744,10 +792,12 @@ free_tbucw(tbucw* aut) {
 	for(i=0; i<nb_states; i++) {
 		free_tbucw_state(aut->states[i]);
 	}
+	free_weight_function(aut->v_I, aut->alphabet->sigma_input_size);
+	free_weight_function(aut->v_O, aut->alphabet->sigma_output_size);
 	free(aut);
 }
 
-/** Frees the turn based automaton state s **/
+/** Frees the turn based automaton state s (each transition is freed with the state it leads to) **/
 static void
 free_tbucw_state(struct tbucw_state *s) {
 	int nb_in_tran = s->nb_in_tran;
@@ -756,6 +806,49 @@ free_tbucw_state(struct tbucw_state *s) {
 		free_label(s->in_tran[i]->label);
 		free(s->in_tran[i]);
 	}
+	free(s->in_tran);
+	free(s->out_tran);
+	free(s);
+}
+
+/** Frees the weight function v defined over an alphabet of size sigma_size **/
+static void
+free_weight_function(int **v, int sigma_size) {
+	if(v != NULL) {
+		int i;
+		for(i=0; i<sigma_size; i++) {
+			free(v[i]);
+		}
+		free(v);
+	}
+}
+
+/** Frees the automaton aut built by optimize_tbucw
+ 	Warning: the labels of the transitions (except those of the trash states), the alphabet and the weight functions are shared with
+ 	the original automaton, so they are not freed **/
+void
+free_optimized_tbucw(tbucw* aut) {
+	int i, j;
+	struct tbucw_state *s;
+	for(i=0; i<aut->nb_states; i++) {
+		s = aut->states[i];
+		if(s->is_trash == TRUE) { //the first incoming transition comes from the other trash state, the other ones are outgoing transitions of copied states
+			free_label(s->in_tran[0]->label);
+			free(s->in_tran[0]);
+		}
+		else { //copied state: owns its incoming and outgoing transitions
+			for(j=0; j<s->nb_in_tran; j++) {
+				free(s->in_tran[j]);
+			}
+			for(j=0; j<s->nb_out_tran; j++) {
+				free(s->out_tran[j]);
+			}
+		}
+		free(s->in_tran);
+		free(s->out_tran);
+		free(s);
+	}
+	free(aut);
 }
 
 /** Frees the label **/
@@ -888,6 +981,7 @@ optimize_tbucw(tbucw *aut, char* states_to_remove_bool) {
 
 	//Others states
 	int k;
+	struct tbucw_tran *tr;
 	j=1;
 	for(i=0; i<aut->nb_states; i++) {
 		if(states_to_remove_bool[i] == FALSE) {
@@ -911,11 +1005,17 @@ optimize_tbucw(tbucw *aut, char* states_to_remove_bool) {
 				}
 			}
 			if(to_remove[i] == TRUE) { //remove incoming transitions coming from a state in to_remove_states
+				for(k=0; k<opt_aut->states[j]->nb_in_tran; k++) { //free the copies made by get_copy_of_state
+					free(opt_aut->states[j]->in_tran[k]);
+				}
+				free(opt_aut->states[j]->in_tran);
 				opt_aut->states[j]->in_tran = (struct tbucw_tran**)malloc((aut->states[i]->nb_in_tran)*sizeof(struct tbucw_tran*)); //it can't have more incoming transition than it had before
 				opt_aut->states[j]->nb_in_tran = 0; //will be incremented each time a transition is added
 				for(k=0; k<aut->states[i]->nb_in_tran; k++) {
-					if(states_to_remove_bool[aut->states[i]->in_tran[k]->state_from->state_label] == FALSE) { //add all transitions which do not come from a state in states_to_remove
-						opt_aut->states[j]->in_tran[opt_aut->states[j]->nb_in_tran] = aut->states[i]->in_tran[k];
+					if(states_to_remove_bool[aut->states[i]->in_tran[k]->state_from->state_label] == FALSE) { //add a copy of all transitions which do not come from a state in states_to_remove
+						tr = (struct tbucw_tran*)malloc(sizeof(struct tbucw_tran));
+						*tr = *(aut->states[i]->in_tran[k]);
+						opt_aut->states[j]->in_tran[opt_aut->states[j]->nb_in_tran] = tr;
 						opt_aut->states[j]->nb_in_tran++;
 					}
 				}
@@ -89,6 +89,7 @@ void add_tran(tbucw*, char*, int, int, int);
 void set_initial_state(tbucw*, int);
 void set_is_accepting(tbucw*, int, char);
 tbucw* set_alphabet(tbucw*, alphabet_info*);
+tbucw* build_tbucw_from_arrays(int, int*, int, int*, char*, alphabet_info*, int);
 void report_accepting_states_c(tbucw*);
 void set_is_complete(tbucw*);
 void duplicate_all_tran(tbucw*);  // Adds the incoming transitions to all states, based on the outgoing transitions
@@ -104,6 +105,7 @@ alphabet_info* init_alphabet(int, int);
 void add_input_prop(alphabet_info*, char*);
 void add_output_prop(alphabet_info*, char*);
 void compute_alphabets(alphabet_info*);
+void free_alphabet(alphabet_info*);
 
 char has_succ(tbucw*, struct tbucw_state*, LABEL_BIT_REPRES*, char);
 int* get_pred(tbucw*, int, LABEL_BIT_REPRES*);
@@ -119,6 +121,7 @@ void print_formula(LABEL_BIT_REPRES*, int, char**);
 
 void free_tbucw(tbucw*);
 static void free_tbucw_state(struct tbucw_state*);
+static void free_weight_function(int**, int);
 static void free_label(label*);
 
 /** Optimization 1 **/
@@ -126,6 +129,7 @@ char is_tbucw_state_unbounded(tbucw*, int);
 
 /** Optimization 2 **/
 tbucw* optimize_tbucw(tbucw*, char*);
+void free_optimized_tbucw(tbucw*);
 struct tbucw_state* get_copy_of_state(struct tbucw_state*);
 char* detect_reachable_states(tbucw*, struct tbucw_state*, char*, char*);
 void reset_tbucw_states_labels(tbucw*);
@@ -82,6 +82,74 @@ char is_ts_state_null(ts_state* s) {
 }
 
 
+/** Exports the transition system ts in one array of integers allocated in a single block (to be freed with free), made of:
+	- size: the number of states of ts (size_states_PO+size_states_PI)
+	- nb_words: the number of integers of each label, each of them holding EXPORTED_LABEL_WORD_BITS bits of the label (the propositions of a
+	  player may not fit in one integer)
+	- for each state i: its number of transitions, or -1 if ts->states[i] is NULL
+	- for each transition of each state (in the order of the list of transitions of the state): from, to and the nb_words integers of the label
+	  (most significant first) of which bit nb_prop-1-j is set iff the j-th proposition of the player owning from is true, or -1 (each integer)
+	  if the label is True **/
+int*
+export_transition_system(transition_system *ts, alphabet_info *alphabet) {
+	int size = ts->size_states_PO+ts->size_states_PI;
+	int nb_words = MAX(1, (MAX(alphabet->input_size, alphabet->output_size)+EXPORTED_LABEL_WORD_BITS-1)/EXPORTED_LABEL_WORD_BITS);
+	int nb_tr = 0;
+	int i, j;
+	for(i=0; i<size; i++) {
+		if(ts->states[i] != NULL) {
+			nb_tr += ts->states[i]->nb_tr;
+		}
+	}
+
+	int *exported = (int*)malloc((2+size+(2+nb_words)*nb_tr)*sizeof(int));
+	exported[0] = size;
+	exported[1] = nb_words;
+	int *cur = exported+2+size;
+	int nb_prop, bit;
+	GList *curlink;
+	ts_transition *tr;
+	for(i=0; i<size; i++) {
+		if(ts->states[i] == NULL) {
+			exported[2+i] = -1;
+			continue;
+		}
+		exported[2+i] = ts->states[i]->nb_tr;
+		if(ts->states[i]->player == P_I) {
+			nb_prop = alphabet->input_size;
+		}
+		else {
+			nb_prop = alphabet->output_size;
+		}
+		curlink = ts->states[i]->transitions;
+		while(curlink != NULL) {
+			tr = (ts_transition*)curlink->data;
+			cur[0] = tr->from;
+			cur[1] = tr->to;
+			if(nb_prop == 0 || tr->label[0] == 'T') {
+				for(j=0; j<nb_words; j++) {
+					cur[2+j] = -1;
+				}
+			}
+			else {
+				for(j=0; j<nb_words; j++) {
+					cur[2+j] = 0;
+				}
+				for(j=0; j<nb_prop; j++) {
+					if(tr->label[j] == '1') {
+						bit = nb_prop-1-j;
+						cur[2+nb_words-1-bit/EXPORTED_LABEL_WORD_BITS] |= 1 << (bit%EXPORTED_LABEL_WORD_BITS);
+					}
+				}
+			}
+			cur += 2+nb_words;
+			curlink = curlink->next;
+		}
+	}
+
+	return exported;
+}
+
 /** Frees a transition system **/
 void
 free_transition_system(transition_system* ts) {
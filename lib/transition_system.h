@@ -25,6 +25,8 @@
 #include <glib.h>
 #include "tbucw.h"
 
+#define EXPORTED_LABEL_WORD_BITS 31 /** Number of bits of a label held by each integer of export_transition_system (the sign bit is not used) **/
+
 /** Structures **/
 typedef struct {
 	int from;
@@ -58,6 +60,7 @@ ts_state* get_ts_state(transition_system*, int);
 ts_transition* get_ts_transition_from_link(GList*);
 
 char is_ts_state_null(ts_state*);
+int* export_transition_system(transition_system*, alphabet_info*);
 
 void free_transition_system(transition_system*);
 static void free_ts_state(ts_state*);
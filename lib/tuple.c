@@ -31,6 +31,7 @@ new_tuple(counting_function *cf, vector *credits) {
 	tuple *t = (tuple*)malloc(sizeof(tuple));
 	t->cf = cf;
 	t->credits = credits;
+	SOLVER_STATS.tuples_allocated++;
 
 	return t;
 }
@@ -64,6 +65,7 @@ tuple*
 add_maximal_vector_to_tuple(tuple* t, int d, int *c) {
 	tuple *new_t = (tuple*)malloc(sizeof(tuple));
 	new_t->cf = t->cf;
+	SOLVER_STATS.tuples_allocated++;
 
 	int *values = (int*)malloc(d*sizeof(int));
 	int i;
@@ -74,6 +76,7 @@ add_maximal_vector_to_tuple(tuple* t, int d, int *c) {
 
 	free_vector(t->credits);
 	free(t);
+	SOLVER_STATS.tuples_freed++;
 	free(values);
 
 	return new_t;
@@ -85,6 +88,7 @@ clone_tuple(tuple *t) {
 	tuple *copy = (tuple*)malloc(sizeof(tuple));
 	copy->cf = clone_counting_function(t->cf);
 	copy->credits = clone_vector(t->credits);
+	SOLVER_STATS.tuples_allocated++;
 	return copy;
 }
 
@@ -97,6 +101,7 @@ is_tuple_empty(tuple *t) {
 /** Returns TRUE if t1->cf <= t2->cf and t1->c_i >= t2->c_i, forall 0<=i<dimension, FALSE otherwise **/
 char
 compare_tuples(tuple *t1, tuple *t2) {
+	SOLVER_STATS.tuple_comparisons++;
 	if(compare_counting_functions(t1->cf, t2->cf) == TRUE) {
 		if(compare_vectors(t2->credits, t1->credits) == TRUE) {
 			return TRUE;
@@ -114,6 +119,7 @@ compare_tuples_reverse(tuple *t1, tuple *t2) {
 /** Returns TRUE if t1 and t2 are equal, FALSE otherwise **/
 char
 are_tuples_equal(tuple *t1, tuple *t2) {
+	SOLVER_STATS.tuple_comparisons++;
 	if(are_counting_functions_equal(t1->cf, t2->cf) == TRUE) {
 		if(are_vectors_equal(t1->credits, t2->credits) == TRUE) {
 			return TRUE;
@@ -129,6 +135,7 @@ compute_tuples_intersection(tuple *t1, tuple *t2) {
 	tuple *inters = (tuple*)malloc(sizeof(tuple));
 	inters->cf = compute_counting_functions_intersection(t1->cf, t2->cf);
 	inters->credits = compute_vectors_intersection(t1->credits, t2->credits);
+	SOLVER_STATS.tuples_allocated++;
 
 	return inters;
 }
@@ -225,6 +232,7 @@ void
 free_tuple(tuple *t) {
 	free_vector(t->credits);
 	free(t);
+	SOLVER_STATS.tuples_freed++;
 }
 
 /** Frees the tuple and the counting_function **/
@@ -246,6 +254,7 @@ free_tuple_full_protected(tuple *t) {
 void
 free_not_defined_tuple() {
 	free(NOT_DEFINED);
+	SOLVER_STATS.tuples_freed++;
 }
 
 /** Prints the tuple **/
@@ -272,9 +281,76 @@ compose_tuples(tuple **ts, int nb_ts, GNode *composition_info) {
 	tuple *comp = (tuple*)malloc(sizeof(tuple));
 	comp->cf = compose_counting_functions(cfs, nb_ts, composition_info);
 	comp->credits = compose_vectors(vs, nb_ts);
+	SOLVER_STATS.tuples_allocated++;
 
 	free(cfs);
 	free(vs);
 
 	return comp;
 }
+
+/** Serializes the antichain of tuples a into an array of integers, which can be sent to another process
+    Format: [length of the array, number of tuples, and for each tuple: player, dimension, mapping of the cf, credits, max credits] **/
+int*
+serialize_tuples_antichain(antichain *a) {
+	int length = 2;
+	GList *curlink = a->incomparable_elements;
+	tuple *t;
+	while(curlink != NULL) {
+		t = (tuple*)curlink->data;
+		length += 2 + ((cf_info*)(t->cf->info->data))->cf_size_sum + 2*t->credits->dimension;
+		curlink = curlink->next;
+	}
+
+	int *data = (int*)malloc(length*sizeof(int));
+	data[0] = length;
+	data[1] = 0;
+	int i, cf_size_sum, index = 2;
+	curlink = a->incomparable_elements;
+	while(curlink != NULL) {
+		t = (tuple*)curlink->data;
+		cf_size_sum = ((cf_info*)(t->cf->info->data))->cf_size_sum;
+		data[index++] = t->cf->player;
+		data[index++] = t->credits->dimension;
+		for(i=0; i<cf_size_sum; i++) {
+			data[index++] = t->cf->mapping[i];
+		}
+		for(i=0; i<t->credits->dimension; i++) {
+			data[index++] = t->credits->values[i];
+		}
+		for(i=0; i<t->credits->dimension; i++) {
+			data[index++] = t->credits->max_values[i];
+		}
+		data[1]++;
+		curlink = curlink->next;
+	}
+
+	return data;
+}
+
+/** Builds an antichain of tuples from an array produced by serialize_tuples_antichain
+    The counting functions of the tuples are built on cfinfo, which must describe the same automata than the ones of the serialized tuples **/
+antichain*
+deserialize_tuples_antichain(int *data, GNode *cfinfo) {
+	antichain *a = new_antichain();
+	int cf_size_sum = ((cf_info*)cfinfo->data)->cf_size_sum;
+	int i, j, dimension, index = 2;
+	counting_function *cf;
+	vector *credits;
+	for(i=0; i<data[1]; i++) {
+		cf = new_counting_function((char)data[index++], cfinfo);
+		dimension = data[index++];
+		for(j=0; j<cf_size_sum; j++) {
+			cf->mapping[j] = data[index++];
+		}
+		set_max_counter_and_sum_of_counters_of_counting_function(cf);
+		credits = new_vector(dimension, data+index, data+index+dimension);
+		index += 2*dimension;
+		// the serialized tuples are pairwise incomparable -> no need to check the antichain property
+		a->incomparable_elements = g_list_prepend(a->incomparable_elements, new_tuple(cf, credits));
+		a->size++;
+	}
+	a->incomparable_elements = g_list_reverse(a->incomparable_elements);
+
+	return a;
+}
@@ -65,4 +65,7 @@ void print_tuple(tuple*);
 
 tuple* compose_tuples(tuple **ts, int nb_ts, GNode *composition_info);
 
+int* serialize_tuples_antichain(antichain*);
+antichain* deserialize_tuples_antichain(int*, GNode*);
+
 #endif /* TUPLE_H_ */
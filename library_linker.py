@@ -17,6 +17,9 @@
 
 from ctypes import *
 import os
+import sys
+import time
+import atexit
 
 from constants import *
 
@@ -160,6 +163,17 @@ class TransitionSystem(Structure):
                 ("initial_states", POINTER(c_int)),
                 ("states", POINTER(POINTER(TSState)))]
 
+#### SolverStats C structure
+class SolverStats(Structure):
+    _fields_ = [("cache_hits", c_long),
+                ("cache_misses", c_long),
+                ("passed_hits", c_long),
+                ("passed_misses", c_long),
+                ("tuple_comparisons", c_long),
+                ("tuples_allocated", c_long),
+                ("tuples_freed", c_long),
+                ("peak_antichain_size", c_int)]
+
 
 #### FUNCTIONS LOADING ####
 if os.uname()[0] == "Darwin":
@@ -183,6 +197,10 @@ add_tran_c = lib.add_tran
 add_tran_c.argtypes = [POINTER(TBUCW), c_char_p, c_int, c_int, c_int]
 add_tran_c.restype = None
 
+build_tbucw_from_arrays_c = lib.build_tbucw_from_arrays
+build_tbucw_from_arrays_c.argtypes = [c_int, POINTER(c_int), c_int, POINTER(c_int), c_char_p, POINTER(AlphabetInfo), c_int]
+build_tbucw_from_arrays_c.restype = POINTER(TBUCW)
+
 set_initial_state_c = lib.set_initial_state
 set_initial_state_c.argtypes = [POINTER(TBUCW), c_int]
 set_initial_state_c.restype = None
@@ -243,6 +261,10 @@ compute_alphabets_c = lib.compute_alphabets
 compute_alphabets_c.argtypes = [POINTER(AlphabetInfo)]
 compute_alphabets_c.restype = None
 
+free_alphabet_c = lib.free_alphabet
+free_alphabet_c.argtypes = [POINTER(AlphabetInfo)]
+free_alphabet_c.restype = None
+
 get_succ_from_sigma_index_c = lib.get_succ_from_sigma_index
 get_succ_from_sigma_index_c.argtypes = [POINTER(TBUCW), c_int, c_int]
 get_succ_from_sigma_index_c.restype = POINTER(c_int)
@@ -271,6 +293,10 @@ optimize_tbucw_c = lib.optimize_tbucw
 optimize_tbucw_c.argtypes = [POINTER(TBUCW), POINTER(c_byte)]
 optimize_tbucw_c.restype = POINTER(TBUCW)
 
+free_optimized_tbucw_c = lib.free_optimized_tbucw
+free_optimized_tbucw_c.argtypes = [POINTER(TBUCW)]
+free_optimized_tbucw_c.restype = None
+
 reset_tbucw_states_labels_c = lib.reset_tbucw_states_labels
 reset_tbucw_states_labels_c.argtypes = [POINTER(TBUCW)]
 reset_tbucw_states_labels_c.restype = None
@@ -326,6 +352,14 @@ compose_tuples_c = lib.compose_tuples
 compose_tuples_c.argtypes = [POINTER(POINTER(Tuple)), c_int, POINTER(GNode)]
 compose_tuples_c.restype = c_void_p
 
+serialize_tuples_antichain_c = lib.serialize_tuples_antichain
+serialize_tuples_antichain_c.argtypes = [POINTER(Antichain)]
+serialize_tuples_antichain_c.restype = POINTER(c_int)
+
+deserialize_tuples_antichain_c = lib.deserialize_tuples_antichain
+deserialize_tuples_antichain_c.argtypes = [POINTER(c_int), POINTER(GNode)]
+deserialize_tuples_antichain_c.restype = POINTER(Antichain)
+
 print_tuple_c = lib.print_tuple
 print_tuple_c.argtypes = [POINTER(Tuple)]
 print_tuple_c.restype = None
@@ -346,6 +380,14 @@ FREE_TUPLE_FULL_FUNC = CFUNCTYPE(None, POINTER(Tuple))
 CLONE_TUPLE_FUNC = CFUNCTYPE(c_void_p, POINTER(Tuple))
 COMPOSE_TUPLES_FUNC = CFUNCTYPE(c_void_p, POINTER(POINTER(Tuple)), c_int, POINTER(GNode))
 
+# Pointers to the C functions on tuples resolved from the library, to give to the antichain functions below: unlike a CFUNCTYPE wrapper of a Python
+# function (e.g. FREE_TUPLE_FULL_FUNC(free_tuple_full_c)), the C loops on the elements of the antichains call them without re-entering the interpreter
+PRINT_TUPLE_C_FUNC = PRINT_TUPLE_FUNC(("print_tuple", lib))
+COMPARE_TUPLES_C_FUNC = COMPARE_TUPLES_FUNC(("compare_tuples", lib))
+FREE_TUPLE_FULL_C_FUNC = FREE_TUPLE_FULL_FUNC(("free_tuple_full", lib))
+CLONE_TUPLE_C_FUNC = CLONE_TUPLE_FUNC(("clone_tuple", lib))
+COMPOSE_TUPLES_C_FUNC = COMPOSE_TUPLES_FUNC(("compose_tuples", lib))
+
 compare_antichains_c = lib.compare_antichains
 compare_antichains_c.argtypes = [POINTER(Antichain), POINTER(Antichain), COMPARE_TUPLES_FUNC]
 compare_antichains_c.restype = c_byte
@@ -375,6 +417,10 @@ build_start_antichain_c = lib.build_start_antichain
 build_start_antichain_c.argtypes = [c_byte, POINTER(GNode)]
 build_start_antichain_c.restype = POINTER(Antichain)
 
+lift_start_antichain_c = lib.lift_start_antichain
+lift_start_antichain_c.argtypes = [POINTER(Antichain), POINTER(GNode)]
+lift_start_antichain_c.restype = POINTER(Antichain)
+
 pre_c = lib.pre
 pre_c.argtypes = [POINTER(Antichain), POINTER(Antichain), c_byte, POINTER(AlphabetInfo)]
 pre_c.restype = POINTER(Antichain)
@@ -444,6 +490,10 @@ is_ts_state_null_c = lib.is_ts_state_null
 is_ts_state_null_c.argtypes = [POINTER(TSState)]
 is_ts_state_null_c.restype = c_byte
 
+export_transition_system_c = lib.export_transition_system
+export_transition_system_c.argtypes = [POINTER(TransitionSystem), POINTER(AlphabetInfo)]
+export_transition_system_c.restype = POINTER(c_int)
+
 free_transition_system_c = lib.free_transition_system
 free_transition_system_c.argtypes = [POINTER(TransitionSystem)]
 free_transition_system_c.restype = None
@@ -452,3 +502,173 @@ free_transition_system_c.restype = None
 free_c = lib.free_memory
 free_c.argtypes = [c_void_p]
 free_c.restype = None
+
+##Stats
+get_solver_stats_c = lib.get_solver_stats
+get_solver_stats_c.argtypes = None
+get_solver_stats_c.restype = POINTER(SolverStats)
+
+reset_solver_stats_c = lib.reset_solver_stats
+reset_solver_stats_c.argtypes = None
+reset_solver_stats_c.restype = None
+
+#### Returns the counters of the solver (since the last call to reset_solver_stats_c) as a dictionary
+def get_solver_stats():
+    stats = get_solver_stats_c().contents
+    return dict([(field, getattr(stats, field)) for (field, field_type) in SolverStats._fields_])
+
+
+#### CALLS TRACING ####
+# If the environment variable TRACE_CTYPES_ENV is set, each function of the C library bound above (name ending with _c) is replaced by a wrapper
+# which records the number of calls, the cumulative time of the calls and the time spent converting the arguments to C types (measured by converting
+# them once more with the from_param methods of argtypes before the call, so it is an estimation which is also included in the cumulative time)
+# The profile is printed at exit (of the main process only, child processes do not run exit handlers)
+ctypes_profile = {} # name of the function -> [number of calls, cumulative time, arguments conversion time]
+
+#### Returns a wrapper of the C function c_function named name which records its calls in ctypes_profile
+def trace_c_function(name, c_function):
+    argtypes = c_function.argtypes
+    stats = ctypes_profile.setdefault(name, [0, 0., 0.])
+    def traced_c_function(*args):
+        start_time = time.time()
+        if argtypes:
+            for i in range(min(len(args), len(argtypes))):
+                argtypes[i].from_param(args[i])
+        conversion_time = time.time()
+        result = c_function(*args)
+        end_time = time.time()
+        stats[0] += 1
+        stats[1] += end_time-start_time
+        stats[2] += conversion_time-start_time
+        return result
+    traced_c_function.__name__ = name
+    return traced_c_function
+
+#### Writes the profile of the calls to the C library in f, sorted by decreasing cumulative time
+def print_ctypes_profile(f):
+    total_time = sum([stats[1] for stats in ctypes_profile.values()])
+    f.write("################ C library calls profile ############\n")
+    f.write("%-45s %12s %14s %14s %12s\n" % ("Function", "Nb calls", "Cumul. time", "Conv. time", "Per call"))
+    for name in sorted(ctypes_profile.keys(), key=lambda name: ctypes_profile[name][1], reverse=True):
+        (nb_calls, cumulative_time, conversion_time) = ctypes_profile[name]
+        if nb_calls == 0:
+            continue
+        f.write("%-45s %12d %13.4fs %13.4fs %11.2fus\n" % (name, nb_calls, cumulative_time, conversion_time, 1e6*cumulative_time/nb_calls))
+    f.write("Total time in C library calls: %.4fs\n" % total_time)
+
+#### Prints the profile of the calls to the C library on stderr or in the file given by the environment variable TRACE_CTYPES_ENV
+def dump_ctypes_profile():
+    destination = os.environ.get(TRACE_CTYPES_ENV)
+    if destination == "1":
+        print_ctypes_profile(sys.stderr)
+    else:
+        f = open(destination, "w")
+        print_ctypes_profile(f)
+        f.close()
+
+if os.environ.get(TRACE_CTYPES_ENV, "") not in ["", "0"]:
+    for name in [name for name in globals().keys() if name.endswith("_c")]:
+        if isinstance(globals()[name], lib._FuncPtr):
+            globals()[name] = trace_c_function(name, globals()[name])
+    atexit.register(dump_ctypes_profile)
+
+
+#### OWNERSHIP OF C STRUCTURES ####
+# The C structures returned by the library are not freed by Python: an Owned* wrapper takes the ownership of such a structure and frees it
+# with close(), at the end of a with block or, at the latest, when the wrapper is garbage collected
+# A wrapper can be given to the C functions in place of the pointer (_as_parameter_) and gives access to its attributes (e.g. wrapper.contents)
+# This section follows the calls tracing one, so that the C functions freeing the structures are the traced ones
+#### Base class of the wrappers, dependencies are objects which must live as long as the structure (e.g. the Python strings referenced by an alphabet)
+#### Each subclass gives the C function freeing its structure in the class attribute free_function
+class OwnedCStructure(object):
+    def __init__(self, pointer, *dependencies):
+        self.pointer = pointer
+        self.dependencies = dependencies
+
+    #### Frees the C structure (unless it has already been freed or released) and closes the wrappers attached to it
+    def close(self):
+        pointer = self.pointer
+        self.pointer = None
+        if pointer:
+            self.free_function(pointer)
+        self.dependencies = ()
+        close_attached(self)
+
+    #### Gives up the ownership of the C structure and returns its pointer (which will not be freed by the wrapper)
+    def release(self):
+        pointer = self.pointer
+        self.pointer = None
+        return pointer
+
+    @property
+    def _as_parameter_(self):
+        if self.pointer is None:
+            raise ValueError("C structure already freed")
+        return self.pointer
+
+    def __getattr__(self, name):
+        pointer = self.__dict__.get("pointer")
+        if pointer is None:
+            raise AttributeError(name)
+        return getattr(pointer, name)
+
+    def __nonzero__(self):
+        return bool(self.pointer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception: # the module may already be torn down at interpreter exit
+            pass
+
+#### tbUCW built by build_tbucw (must be closed before its alphabet)
+class OwnedTBUCW(OwnedCStructure):
+    free_function = staticmethod(free_tbucw_c)
+
+#### tbUCW built by optimize_tbucw (shares its labels with the original tbUCW, which must be given as dependency)
+class OwnedOptimizedTBUCW(OwnedCStructure):
+    free_function = staticmethod(free_optimized_tbucw_c)
+
+#### Alphabet information (the lists of input and output propositions must be given as dependencies, their strings are not copied in C)
+class OwnedAlphabetInfo(OwnedCStructure):
+    free_function = staticmethod(free_alphabet_c)
+
+#### Safety game built by compute_fix_point or otfur (with its antichains of tuples), the tbUCWs optimized by opt2 over which it is defined are attached to it
+#### When its antichains are given as start antichains to another fix point computation (which frees them), the wrapper must be released instead of closed
+class OwnedSafetyGame(OwnedCStructure):
+    free_function = staticmethod(free_safety_game_c)
+
+#### Transition system
+class OwnedTransitionSystem(OwnedCStructure):
+    free_function = staticmethod(free_transition_system_c)
+
+#### Array of length integers allocated by the C library
+class OwnedIntArray(OwnedCStructure):
+    def __init__(self, pointer, length):
+        OwnedCStructure.__init__(self, pointer)
+        self.length = length
+
+    free_function = staticmethod(free_c)
+
+    #### Returns a ctypes array sharing the memory of the C array (no copy), which can be read with memoryview or numpy.frombuffer
+    #### It must not be used after the wrapper is closed
+    def as_array(self):
+        return (c_int*self.length).from_address(addressof(self._as_parameter_.contents))
+
+#### Attaches the wrapper owned to the wrapper wrapper (e.g. the optimized tbUCW over which a safety game is defined): owned lives at least as long
+#### as wrapper, and is closed with it (or by close_attached if wrapper is released)
+def attach_owned(wrapper, owned):
+    wrapper.attached_owned = wrapper.__dict__.get("attached_owned", []) + [owned]
+
+#### Closes the wrappers attached to wrapper
+def close_attached(wrapper):
+    for owned in wrapper.__dict__.get("attached_owned", []):
+        owned.close()
+    wrapper.attached_owned = []
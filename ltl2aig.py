@@ -18,9 +18,10 @@ import re
 import subprocess
 import argparse
 import math
-from pygraph.classes.digraph import digraph
 
 import acacia_plus
+import automaton
+import constants
 import utils
 import boolnet
 
@@ -197,92 +198,26 @@ def extract_assumptions_and_guarantees(formula):
     return (assumptions, guarantees)
 
 
-# Constructs an automaton from ltl2ba for the formula
+# Constructs an automaton from ltl2ba for the formula (in process if the
+# ltl2ba library is built)
 def construct_automata(formula):
-    tool_cmd = ["./tools/ltl2ba-1.1/ltl2ba", "-f"]
-    try:
-        out = subprocess.Popen(tool_cmd + [formula], stdout=subprocess.PIPE)
-        (automata, err) = out.communicate()
-    except:
-        print "ltl2ba not found! Don't forget to install it"
-        exit(0)
-
-    accepting_states = []
-
-    # automaton parsing
-    s = automata.split("*/\n")
-    if s.__len__() < 2:
+    if automaton.load_ltl2ba_library():
+        automata = automaton.translate_ltl2ba(formula)
+    else:
+        tool_cmd = ["./tools/ltl2ba-1.1/ltl2ba", "-f"]
+        try:
+            out = subprocess.Popen(tool_cmd + [formula], stdout=subprocess.PIPE)
+            (automata, err) = out.communicate()
+        except:
+            print "ltl2ba not found! Don't forget to install it"
+            exit(0)
+
+        automata = automaton.parse_never_claim(automata, constants.LTL2BA)
+    if automata is None:
         print("empty automaton, LTL syntax error?")
         exit(0)
 
-    automata = s[1]
-
-    r = re.compile(";\n\}?\n?")
-    transitions = re.split(r, automata)
-    nb_trans = 0
-
-    # create a new graph
-    g = digraph()
-    g.__init__()
-
-    # local function which determines if a state is initial
-    def isinitial(s):
-        return re.match(re.compile(".*init"), s)
-
-    # iterate over transitions (except the last which is the empty string)
-    l = transitions.__len__() - 1
-    if transitions[l] == "":
-        tobound = l
-    else:
-        tobound = l + 1
-
-    for t in transitions[0:tobound]:
-        # split transition into head (state) and body (rules)
-        rstate = re.compile(":\n")
-        trans = re.split(rstate, t)
-        # state extraction
-        s = re.split(re.compile("\Aaccept_"), trans[0])
-        if len(s) == 1:
-            state = s[0]
-            accept = False
-        elif len(s) == 2:
-            state = s[1]
-            accept = True
-        if isinitial(state):
-            state = "initial"
-        if accept:
-            accepting_states.append(state)
-        if not g.has_node(state):
-            g.add_node(state)
-
-        # rules extraction
-        if re.match(re.compile("(.|\n)*skip(.|\n)*"), trans[1]):
-            tuple = (state, state)
-            g.add_edge(tuple, wt=1, label="(1)")
-            nb_trans += 1
-        elif not re.match(re.compile("(.|\n)*false(.|\n)*"), trans[1]):
-            l = re.split(re.compile("::"), trans[1])
-            for y in l:
-                if not re.match(re.compile("\s*if\s"), y):
-                    fr = re.split(re.compile(" -> goto "), y)
-                    edgelab = fr[0].strip()
-                    if re.match(re.compile(".*accept.*"), fr[1]):
-                        accept = True  # the state is accepting
-                    else:
-                        accept = False
-                    gre = re.split(re.compile("accept_"), fr[1])
-                    gre = re.split(re.compile("\s+f?i?"), gre[len(gre) - 1])
-                    goto_state = gre[0]
-                    if isinitial(goto_state):
-                        goto_state = "initial"
-                    if not g.has_node(goto_state):  # new goto, add it
-                        g.add_node(goto_state)
-                    tuple = (state, goto_state)
-                    disj_size = edgelab.count("||") + 1
-                    g.add_edge(tuple, wt=disj_size, label=edgelab)
-                    nb_trans = nb_trans + 1
-
-    return (g, accepting_states)
+    return automata
 
 
 def int2binlatch(varlist, n):
@@ -337,9 +272,16 @@ def label2inputs(inputs, outputs, label, input_map):
 
 
 def write_aig(inputs, outputs, latches, error, file_name):
+    write_aag(inputs + ["controllable_" + str(o) for o in outputs], latches,
+              [error], ["error"], file_name)
+
+
+# writes an aag file whose inputs are the variables 2, 4, ..., whose latches
+# are the given variables (with their next-state nets) and whose outputs are
+# the given nets
+def write_aag(input_names, latches, output_nets, output_names, file_name):
     f = open(file_name, "w")
-    all_signals = inputs + outputs
-    n_signals = len(all_signals)
+    n_signals = len(input_names)
     n_latches = len(latches)
     # STEP 0: Compute the number of gates to be used
     m_vars = boolnet.BoolNet.count_nonterminals()
@@ -347,7 +289,7 @@ def write_aig(inputs, outputs, latches, error, file_name):
     f.write("aag " + str(m_vars + n_signals + n_latches) + " " +
             str(n_signals) + " " +
             str(n_latches) + " " +
-            "1 " +
+            str(len(output_nets)) + " " +
             str(m_vars) + "\n")
     # STEP 2: Print inputs (and name them)
     var_map = dict()
@@ -378,11 +320,12 @@ def write_aig(inputs, outputs, latches, error, file_name):
             f.write(str(l) + " " + str(var_map[net.index] ^ 1) + "\n")
         else:
             f.write(str(l) + " " + str(var_map[net.index]) + "\n")
-    # STEP 4: Print error
-    err = var_map[error.index]
-    if error.is_or() != error.neg:
-        err ^= 1
-    f.write(str(err) + "\n")
+    # STEP 4: Print outputs
+    for net in output_nets:
+        out = var_map[net.index]
+        if net.is_or() != net.neg:
+            out ^= 1
+        f.write(str(out) + "\n")
     # STEP 5: Print gates
     # we are using deMorgan's Law to have all gates be AND-gates
     for v in boolnet.BoolNet.iterate_nonterminals():
@@ -406,17 +349,17 @@ def write_aig(inputs, outputs, latches, error, file_name):
             f.write(str(var_map[right.index]) + "\n")
     # STEP 6: Print symbol table
     cnt = 0
-    for i in inputs:
+    for i in input_names:
         f.write("i" + str(cnt) + " " + str(i) + "\n")
         cnt += 1
-    for i in outputs:
-        f.write("i" + str(cnt) + " controllable_" + str(i) + "\n")
-        cnt += 1
     cnt = 0
     for l in latches:
         f.write("l" + str(cnt) + " latch" + str(cnt) + "\n")
         cnt += 1
-    f.write("o0 error\n")
+    cnt = 0
+    for o in output_names:
+        f.write("o" + str(cnt) + " " + str(o) + "\n")
+        cnt += 1
     # STEP 7: Close the file
     f.close()
 
@@ -516,13 +459,15 @@ def main(formula_file, part_file, k, args):
         ltl2ba_formula = wring_to_ltl2ba(wring_formula, inputs, outputs)
         formula = negate_ltl2ba(ltl2ba_formula)
         DBG_MSG("negated formula: " + str(formula))
-        (automata, buchi_states) = construct_automata(formula)
+        automata = construct_automata(formula)
         # STEP 1: translate aig
         (ln, en,
-         var_offset) = translate2aig(inputs, outputs, k, automata.nodes(),
-                                     buchi_states, var_offset,
-                                     [(e, automata.edge_label(e)) for e in
-                                      automata.edges()])
+         var_offset) = translate2aig(inputs, outputs, k, automata.states,
+                                     [automata.states[s] for s in
+                                      automata.accepting], var_offset,
+                                     [((automata.states[u], automata.states[v]),
+                                       automata.labels[l]) for (u, v, l) in
+                                      automata.edges])
         latch_net.update(ln)
         error_net |= en
     # STEP 2: call Acacia+ to see if this is realizable or not
@@ -547,7 +492,7 @@ def main(formula_file, part_file, k, args):
     elif solved and not is_real:
         file_name = formula_file[:-4] + "_" + suffix + "_UNREAL.aag"
         ret = EXIT_STATUS_UNREALIZABLE
-    else:
+    else:  # inconclusive (solved is False) or resource out (solved is None)
         file_name = formula_file[:-4] + "_" + suffix + "_UNREAL.aag"
         ret = EXIT_STATUS_UNKNOWN
     # FINALLY: dump the AIG
@@ -42,56 +42,154 @@ def qm(ones=[], zeros=[], dc=[]):
 	in more than one argument, or if all three arguments are given
 	and not all terms are specified.'''
 
+	elts = max(max(ones or zeros or dc),
+		max(zeros or dc or ones),
+		max(dc or ones or zeros)) + 1
+	numvars = int(math.ceil(math.log(elts, 2)))
+	return [cube2s(cube, numvars) for cube in qm_cubes(ones, zeros, dc)[0]]
+
+
+def qm_cubes(ones=[], zeros=[], dc=[], max_nodes=1000):
+	'''Compute minimal two-level sum-of-products form, as qm, but return
+	the cubes as pairs (value, mask) of integers (see compute_primes).
+
+	Return (cubes, minimal): minimal is False if the budget of max_nodes
+	nodes of unate_cover ran out, the cover may then not be minimal.'''
+
 	elts = max(max(ones or zeros or dc),
 		max(zeros or dc or ones),
 		max(dc or ones or zeros)) + 1
 	numvars = int(math.ceil(math.log(elts, 2)))
 	elts = 1 << numvars
-	all = set(b2s(i, numvars) for i in range(elts))
-	ones = set(b2s(i, numvars) for i in ones)
-	zeros = set(b2s(i, numvars) for i in zeros)
-	dc = set(b2s(i, numvars) for i in dc)
+	all = set(range(elts))
+	ones = set(ones)
+	zeros = set(zeros)
+	dc = set(dc)
 	ones = ones or (all - zeros - dc)
 	zeros = zeros or (all - ones - dc)
 	dc = dc or (all - ones - zeros)
 	assert len(dc) + len(zeros) + len(ones) == len(dc | zeros | ones) == elts
-	primes = compute_primes(ones | dc, numvars)
-	return unate_cover(primes, ones)
-
-
-def unate_cover(primes, ones):
-	'''Return the minimal cardinality subset of primes covering all ones.
-	
-	Exhaustive for now.  Feel free to replace this with an efficient unate
-	covering problem solver.'''
-
-	primes = list(primes)
-	cs = min((bitcount(b2s(cubesel, len(primes))), cubesel)
-		for cubesel in range(1 << len(primes))
-		if is_full_cover(active_primes(cubesel, primes), ones))[1]
-	return active_primes(cs, primes)
-
-
-def active_primes(cubesel, primes):
-	'''Return the primes selected by the cube selection integer.'''
-	return [prime for used, prime in
-		zip(map(int, b2s(cubesel, len(primes))), primes) if used]
+	primes = compute_primes([(i, 0) for i in ones | dc], numvars)
+	return unate_cover(primes, ones, max_nodes)
+
+
+def unate_cover(primes, ones, max_nodes=1000):
+	'''Return (cover, minimal), cover being the minimal cardinality subset
+	of primes covering all ones.
+
+	Branch and bound on the covering table: at each node, the essential
+	primes are taken and the dominated primes are removed before branching
+	on the minterm covered by the fewest primes.  The first bound is a
+	greedy cover.  After max_nodes nodes, the best cover found so far is
+	returned with minimal set to False (it may then not be minimal).
+
+	The table is stored as bitmasks: covers[p] is the set of minterms
+	covered by prime p, rows[k] the set of primes covering minterm k.'''
+
+	primes = sorted(primes)
+	ones = sorted(ones)
+	index = dict((one, k) for k, one in enumerate(ones))
+	covers = []
+	for (value, mask) in primes:
+		cover = 0
+		sub = mask
+		while True: # all the minterms of the prime (submasks of mask)
+			if value | sub in index:
+				cover |= 1 << index[value | sub]
+			if sub == 0:
+				break
+			sub = (sub - 1) & mask
+		covers.append(cover)
+	rows = [0] * len(ones)
+	for p in range(len(primes)):
+		for k in bits(covers[p]):
+			rows[k] |= 1 << p
+	best = [greedy_cover(covers, (1 << len(ones)) - 1)]
+	nodes = [0]
+	exhausted = [False]
+
+	def search(uncovered, candidates, chosen):
+		if nodes[0] >= max_nodes:
+			exhausted[0] = True
+			return
+		nodes[0] += 1
+		# Essential primes and dominated primes, until nothing changes
+		while uncovered:
+			essentials = 0
+			for k in bits(uncovered):
+				covering = rows[k] & candidates
+				if not covering:
+					return
+				if not covering & (covering - 1):
+					essentials |= covering
+			if essentials:
+				for p in bits(essentials):
+					chosen = chosen + [p]
+					uncovered &= ~covers[p]
+				candidates = sum(1 << p for p in bits(candidates & ~essentials)
+					if covers[p] & uncovered)
+				continue
+			if bitcount(candidates) > 64: # too many primes to compare them pairwise
+				break
+			kept = []
+			for p in sorted(bits(candidates),
+					key=lambda p: -bitcount(covers[p] & uncovered)):
+				if not [q for q in kept if covers[p] & uncovered & ~covers[q] == 0]:
+					kept.append(p)
+			if len(kept) == bitcount(candidates):
+				break
+			candidates = sum(1 << p for p in kept)
+		if not uncovered:
+			if len(chosen) < len(best[0]):
+				best[0] = chosen
+			return
+		# Bound: each other prime covers at most max_cover minterms
+		max_cover = max(bitcount(covers[p] & uncovered) for p in bits(candidates))
+		lower_bound = -(-bitcount(uncovered) // max_cover)
+		if len(chosen) + lower_bound >= len(best[0]):
+			return
+		# Branch on the minterm covered by the fewest primes
+		k = min((bitcount(rows[k] & candidates), k) for k in bits(uncovered))[1]
+		for p in bits(rows[k] & candidates):
+			search(uncovered & ~covers[p], candidates & ~(1 << p), chosen + [p])
+
+	search((1 << len(ones)) - 1, (1 << len(primes)) - 1, [])
+	return ([primes[p] for p in sorted(best[0])], not exhausted[0])
+
+
+def greedy_cover(covers, all_ones):
+	'''Return the indices of covers of a cover of all_ones, taking at each
+	step the cube covering the most uncovered minterms.'''
+	chosen = []
+	uncovered = all_ones
+	while uncovered:
+		p = max(range(len(covers)),
+			key=lambda p: bitcount(covers[p] & uncovered))
+		chosen.append(p)
+		uncovered &= ~covers[p]
+	return chosen
 
 
 def is_full_cover(all_primes, ones):
 	'''Return a bool: Does the set of primes cover all minterms?'''
-	return min([max([is_cover(p, o) for p in all_primes] + [False])
-		for o in ones] + [True])
+	return all([any([is_cover(p, o) for p in all_primes]) for o in ones])
 
 
 def is_cover(prime, one):
 	'''Return a bool: Does the prime cover the minterm?'''
-	return min([p == 'X' or p == o for p, o in zip(prime, one)] + [True])
+	(value, mask) = prime
+	return one & ~mask == value
 
 
 def compute_primes(cubes, vars):
-	'''Compute primes for the given set of cubes and variable count.'''
-	sigma = [set(i for i in cubes if bitcount(i) == v)
+	'''Compute primes for the given set of cubes and variable count.
+
+	Cubes are pairs (value, mask) of integers: the bits of mask are the
+	don't-care variables, which are 0 in value.  Two cubes merge if they
+	have the same mask and their values differ by one bit: the merge of a
+	cube with v bits set in value is then looked up among the cubes with
+	v+1 bits set and the same mask.'''
+	sigma = [set(c for c in cubes if bitcount(c[0]) == v)
 		for v in range(vars + 1)]
 	primes = set()
 	while sigma:
@@ -99,47 +197,56 @@ def compute_primes(cubes, vars):
 		redundant = set()
 		for c1, c2 in zip(sigma[:-1], sigma[1:]):
 			nc = set()
-			for a in c1:
-				for b in c2:
-					m = merge(a, b)
-					if m:
-						nc.add(m)
-						redundant |= set([a, b])
+			for (value, mask) in c1:
+				free = ~(value | mask) & ((1 << vars) - 1)
+				while free:
+					bit = free & -free
+					free ^= bit
+					if (value | bit, mask) in c2:
+						nc.add((value, mask | bit))
+						redundant.add((value, mask))
+						redundant.add((value | bit, mask))
 			nsigma.append(nc)
 		primes |= set(c for cubes in sigma for c in cubes) - redundant
 		sigma = nsigma
 	return primes
 
 
-def bitcount(s):
-	'''Return the sum of on bits in s.'''
-	return sum(b == '1' for b in s)
+def bits(i):
+	'''Return the positions of the on bits in the integer i.'''
+	positions = []
+	while i:
+		bit = i & -i
+		positions.append(bit.bit_length() - 1)
+		i ^= bit
+	return positions
+
+
+def bitcount(i):
+	'''Return the number of on bits in the integer i.'''
+	return bin(i).count('1')
 
 
 def b2s(i, vars):
 	'''Convert from an integer to a binary string.'''
-	s = ''
-	for k in range(vars):
-		s = ['0', '1'][i & 1] + s
-		i >>= 1
-	return s
+	return cube2s((i, 0), vars)
+
+
+def cube2s(cube, vars):
+	'''Convert from a cube (value, mask) to a string.  'X' is don't-care.'''
+	(value, mask) = cube
+	return ''.join(['X' if mask >> k & 1 else '01'[value >> k & 1]
+		for k in range(vars - 1, -1, -1)])
 
 
 def merge(i, j):
-	'''Return cube merge.  'X' is don't-care.  'None' if merge impossible.'''
-	s = ''
-	dif_cnt = 0
-	for a, b in zip(i, j):
-		if (a == 'X' or b == 'X') and a != b:
-			return None
-		elif a != b:
-			dif_cnt += 1
-			s += 'X'
-		else:
-			s += a
-		if dif_cnt > 1:
-			return None
-	return s
+	'''Return cube merge.  'None' if merge impossible.'''
+	(value_i, mask_i) = i
+	(value_j, mask_j) = j
+	diff = value_i ^ value_j
+	if mask_i != mask_j or diff & (diff - 1) or not diff:
+		return None
+	return (value_i & value_j, mask_i | diff)
 
 
 if __name__ == '__main__':
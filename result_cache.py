@@ -0,0 +1,138 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import hashlib
+import json
+import shutil
+
+from automaton import *
+from constants import *
+
+# A cache entry is made of two files of the cache directory named after the key of the entry:
+#   - key.json: the verdict and the values of k and c for which a solution has been found
+#   - key.txt: the solution (transition system), if any
+# The other files written with the solution (DOT, PNG, AIGER) are not cached: they are computed from the solution restored from the cache
+CACHE_VERSION = 1 # to increment when the content of the entries changes
+
+#### Returns the key of the cache entry of the synthesis problem for formula and partition when player makes the first move, under a set of options
+#### (configurations are those of --portfolio, or None, minimize tells if the solution is minimized and qm_max_nodes is the budget of --qmnodes)
+#### The key is a hash of the formulas (without comments and blanks), of the partition and of the options which may change the verdict or the solution
+def compute_cache_key(ltl_file, partition_file, player, options, configurations, minimize, qm_max_nodes):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_strategies, warm_start, path, filename) = options
+    (spec_names, formulas, group_order) = read_formula(ltl_file, nbw_constr)
+
+    key = hashlib.sha1()
+    key.update(str(CACHE_VERSION) + "\n")
+    for i in range(len(formulas)):
+        key.update(spec_names[i] + ":" + " ".join(formulas[i].split()) + "\n")
+    key.update(" ".join(group_order.split()) + "\n")
+
+    f = open(partition_file, "r") # the values of the mean-payoff objective and the bounds on c are part of the partition file
+    for l in f:
+        l = " ".join(l.split())
+        if l != "":
+            key.update(l + "\n")
+    f.close()
+
+    key.update(str((player, tool, opt, critical, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_strategies,
+                    warm_start, configurations, minimize, qm_max_nodes)))
+    return key.hexdigest()
+
+#### Returns the cache entry of key stored in cache_dir (a dictionary), or None if there is no such entry
+#### The entry is marked as recently used
+def get_from_result_cache(cache_dir, key):
+    entry_file = os.path.join(cache_dir, key + ".json")
+    try:
+        f = open(entry_file, "r")
+        entry = json.load(f)
+        f.close()
+    except (IOError, ValueError):
+        return None
+
+    if entry.get("version") != CACHE_VERSION:
+        return None
+    try:
+        os.utime(entry_file, None)
+    except OSError:
+        pass
+    return entry
+
+#### Copies the solution of the cache entry of key stored in cache_dir to solution_file
+#### Returns False if the entry has no solution
+def restore_solution_from_result_cache(cache_dir, key, solution_file):
+    cached_solution_file = os.path.join(cache_dir, key + ".txt")
+    if not os.path.exists(cached_solution_file):
+        return False
+    try:
+        shutil.copyfile(cached_solution_file, solution_file)
+    except IOError:
+        return False
+    return True
+
+#### Stores entry (a dictionary) as the cache entry of key in cache_dir, together with solution_file if it is not None
+#### The least recently used entries are then removed until the cache takes at most max_size bytes
+def add_to_result_cache(cache_dir, key, entry, solution_file, max_size):
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            print "Warning: unable to create the cache directory " + cache_dir
+            return
+
+    entry["version"] = CACHE_VERSION
+    try:
+        if solution_file is not None and os.path.exists(solution_file):
+            shutil.copyfile(solution_file, os.path.join(cache_dir, key + ".txt"))
+        # Write in a temporary file first: an entry is never read half-written
+        tmp_entry_file = os.path.join(cache_dir, key + ".json.tmp" + str(os.getpid()))
+        f = open(tmp_entry_file, "w")
+        json.dump(entry, f)
+        f.close()
+        os.rename(tmp_entry_file, os.path.join(cache_dir, key + ".json"))
+    except IOError:
+        print "Warning: unable to write in the cache directory " + cache_dir
+        return
+
+    evict_from_result_cache(cache_dir, max_size)
+
+#### Removes the least recently used entries of the cache stored in cache_dir until it takes at most max_size bytes
+def evict_from_result_cache(cache_dir, max_size):
+    entries = {} # key -> (last use, size)
+    for name in os.listdir(cache_dir):
+        (key, extension) = os.path.splitext(name)
+        if extension not in [".json", ".txt"]:
+            continue
+        try:
+            stat = os.stat(os.path.join(cache_dir, name))
+        except OSError:
+            continue
+        (last_use, size) = entries.get(key, (0, 0))
+        if extension == ".json":
+            last_use = stat.st_mtime
+        entries[key] = (last_use, size + stat.st_size)
+
+    total_size = sum([size for (last_use, size) in entries.values()])
+    for key in sorted(entries.keys(), key=lambda key: entries[key][0]):
+        if total_size <= max_size:
+            break
+        for extension in [".json", ".txt"]:
+            try:
+                os.remove(os.path.join(cache_dir, key + extension))
+            except OSError:
+                pass
+        total_size -= entries[key][1]
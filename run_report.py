@@ -0,0 +1,107 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import time
+import json
+import resource
+
+# Structured report of a run (written with the --report option), made of:
+#   - phases: wall time, CPU time (user+system, child processes included) and peak RSS of each phase of the synthesis
+#   - checks: one entry per fix point computation (per tree node and per value of k) with the statistics of the algorithm used
+#     (antichain sizes (starting player, other player), number of iterations, size of the critical sets, number of states explored by OTFUR,...)
+#   - result: verdict and values of k and c for which a solution has been found
+# All the functions below do nothing when no report has been started (see start_run_report)
+run_report = None
+
+#### Starts a new run report (reporting is disabled until then)
+def start_run_report():
+    global run_report
+    run_report = {"phases": [], "checks": [], "result": {}}
+
+#### Returns the current run report (None if reporting is disabled)
+def get_run_report():
+    return run_report
+
+#### Replaces the current run report by report (e.g. a report built by a child process)
+def set_run_report(report):
+    global run_report
+    run_report = report
+
+#### Returns the current wall time and CPU time (user+system time of the process and its terminated children)
+def report_clock():
+    t = os.times()
+    return (time.time(), t[0]+t[1]+t[2]+t[3])
+
+#### Returns the peak resident set size (in kB) of the process and of its largest terminated child
+def peak_rss():
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+#### Starts the phase name of the run, returns the phase to give to end_phase
+def start_phase(name):
+    return (name, report_clock())
+
+#### Ends phase (returned by start_phase) and adds it to the run report with the optional details
+def end_phase(phase, **details):
+    if run_report is None:
+        return
+    (name, (start_wall, start_cpu)) = phase
+    (wall, cpu) = report_clock()
+    entry = {"name": name, "wall_time": wall-start_wall, "cpu_time": cpu-start_cpu, "peak_rss_kb": peak_rss()}
+    entry.update(details)
+    run_report["phases"].append(entry)
+
+#### Adds a new fix point computation to the run report, the statistics of the algorithm are then added with update_check
+def add_check(**details):
+    if run_report is None:
+        return
+    run_report["checks"].append(details)
+
+#### Adds details to the last fix point computation added to the run report
+def update_check(**details):
+    if run_report is None or len(run_report["checks"]) == 0:
+        return
+    run_report["checks"][-1].update(details)
+
+#### Removes and returns the fix point computations of the run report (used by child processes to send them to their parent)
+def take_checks():
+    if run_report is None:
+        return []
+    checks = run_report["checks"]
+    run_report["checks"] = []
+    return checks
+
+#### Adds the fix point computations checks (computed by a child process) to the run report
+def extend_checks(checks):
+    if run_report is None:
+        return
+    run_report["checks"].extend(checks)
+
+#### Sets the result of the run in the run report
+def set_report_result(**details):
+    if run_report is None:
+        return
+    run_report["result"].update(details)
+
+#### Writes the run report in JSON format in filename
+def write_run_report(filename):
+    if run_report is None:
+        return
+    f = open(filename, "w")
+    json.dump(run_report, f, indent=2, sort_keys=True)
+    f.write("\n")
+    f.close()
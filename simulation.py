@@ -0,0 +1,185 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import argparse
+
+from constants import *
+from synthesis import *
+from acacia_plus import parse_partition
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Simulation of a strategy (Strategy of synthesis.py) against traces of the other player
+# The strategy is compiled into two integer tables indexed by (state, input valuation):
+#   - next_states: successor of the state for the input valuation
+#   - outputs: output valuation produced by the strategy in the state for the input valuation (the same for all inputs if the player of the
+#     strategy starts (Moore machine))
+# A valuation of signals is an integer in which the first signal is the most significant bit
+# The states of the strategy are followed by an undefined state, reached when the strategy has no transition for an input valuation, in which
+# all outputs are UNDEFINED
+# All the traces are advanced in lockstep: each step is a lookup in the tables for the whole set of traces
+UNDEFINED = -1
+MAX_SIMULATED_INPUTS = 20 # the tables have 2^(number of inputs) columns
+
+#### Compiles the strategy solution into the tables (next_states, outputs) (see above)
+#### inputs are the signals of the other player and outputs the signals of the player of the strategy, which makes the first move if player == P_O
+#### If solution is non deterministic, it is resolved by priority (first edge, then first term of its label) as in print_solution_aig
+def compile_strategy(solution, inputs, outputs, player):
+    if len(inputs) > MAX_SIMULATED_INPUTS:
+        print "Too many input signals to simulate the strategy (at most %d)" % MAX_SIMULATED_INPUTS
+        exit(0)
+    undefined_state = solution.nb_states
+    next_states = numpy.full((solution.nb_states+1, 1 << len(inputs)), undefined_state, dtype=numpy.int32)
+    outputs_table = numpy.full((solution.nb_states+1, 1 << len(inputs)), UNDEFINED, dtype=numpy.int32)
+
+    # Valuations of the inputs and of the outputs of each term of the labels (the valuation of the outputs of a term is the first one of its
+    # cover, with the signals of any value set to 0)
+    terms_info = dict()
+    def get_term_info(term):
+        try:
+            return terms_info[term]
+        except KeyError:
+            (outputs_cover, inputs_cover) = solution.terms[term]
+            info = (outputs_cover, outputs_cover[0][0], numpy.array(get_cover_valuations(inputs_cover), dtype=numpy.int64))
+            terms_info[term] = info
+            return info
+
+    for state in range(solution.nb_states):
+        chosen_valuation = None
+        for edge in solution.edges(state):
+            successor = solution.successors[edge]
+            for term in solution.edge_terms[solution.terms_offsets[edge]:solution.terms_offsets[edge+1]]:
+                (outputs_cover, outputs_valuation, inputs_valuations) = get_term_info(term)
+                if player == P_O:
+                    # The outputs only depend on state: keep the terms compatible with the valuation of the first one
+                    if chosen_valuation == None:
+                        chosen_valuation = outputs_valuation
+                    elif not satisfies_cover(chosen_valuation, outputs_cover):
+                        continue
+                    outputs_valuation = chosen_valuation
+                # Only the input valuations without transition yet (priority to the first terms)
+                inputs_valuations = inputs_valuations[next_states[state, inputs_valuations] == undefined_state]
+                next_states[state, inputs_valuations] = successor
+                outputs_table[state, inputs_valuations] = outputs_valuation
+
+    return (next_states, outputs_table)
+
+#### Returns nb_traces random traces of length valuations of nb_inputs signals (array of shape (nb_traces, length))
+def random_traces(nb_traces, length, nb_inputs, seed=None):
+    return numpy.random.RandomState(seed).randint(0, 1 << nb_inputs, size=(nb_traces, length)).astype(numpy.int32)
+
+#### Simulates the strategy compiled in tables on traces (array of shape (nb_traces, length) of input valuations) from initial_state
+#### Returns the outputs (array of the same shape as traces, UNDEFINED after the strategy has no transition for an input) and for each trace the
+#### first step at which the output is UNDEFINED or differs from expected_outputs (if not None, the steps without expected output being
+#### UNDEFINED), -1 if there is no mismatch
+def simulate(tables, traces, initial_state, expected_outputs=None):
+    (next_states, outputs_table) = tables
+    (nb_traces, length) = traces.shape
+    states = numpy.full(nb_traces, initial_state, dtype=numpy.int32)
+    outputs = numpy.empty((nb_traces, length), dtype=numpy.int32)
+    for step in range(length):
+        valuations = traces[:, step]
+        outputs[:, step] = outputs_table[states, valuations]
+        states = next_states[states, valuations]
+
+    mismatches = outputs == UNDEFINED
+    if expected_outputs is not None:
+        mismatches |= (expected_outputs != UNDEFINED) & (outputs != expected_outputs)
+    first_mismatches = numpy.where(mismatches.any(axis=1), mismatches.argmax(axis=1), -1)
+    return (outputs, first_mismatches)
+
+#### Reads recorded traces in traces_file: one trace per line, made of steps separated by blanks, each step being the input valuation or
+#### input_valuation/expected_output_valuation (all the traces must have the same length)
+#### Returns (traces, expected_outputs), expected_outputs being None if no step has an expected output
+def read_traces(traces_file):
+    traces = []
+    expected_outputs = []
+    f = open(traces_file, "r")
+    for l in f:
+        steps = l.split()
+        if len(steps) == 0:
+            continue
+        traces.append([int(step.split("/")[0]) for step in steps])
+        expected_outputs.append([int(step.split("/")[1]) if "/" in step else UNDEFINED for step in steps])
+    f.close()
+
+    if len(set([len(trace) for trace in traces])) > 1:
+        print "All the traces of " + traces_file + " must have the same length"
+        exit(0)
+    if all([all([output == UNDEFINED for output in outputs]) for outputs in expected_outputs]):
+        return (numpy.array(traces, dtype=numpy.int32), None)
+    return (numpy.array(traces, dtype=numpy.int32), numpy.array(expected_outputs, dtype=numpy.int32))
+
+#### Writes the outputs of the simulation in outputs_file (one trace per line, as read_traces)
+def write_outputs(outputs, traces, outputs_file):
+    f = open(outputs_file, "w")
+    for (trace, trace_outputs) in zip(traces, outputs):
+        f.write(" ".join(["%d/%d" % (step, output) for (step, output) in zip(trace, trace_outputs)]) + "\n")
+    f.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulates strategies (solution files of Acacia+) against random or recorded traces")
+    parser.add_argument("solutions", metavar="solution", type=str, nargs="+", help="solution files (.txt) to simulate")
+    parser.add_argument("-P", "--part", dest="part", required=True, type=str, help="partition of atomic signals file (.part file)")
+    parser.add_argument("-p", "--player", dest="player", default=P_O, type=int, help="starting player (1, environment or 2, system), default: 2")
+    parser.add_argument("-u", "--unreal", dest="unreal", default=False, action="store_const", const=True,
+                        help="the solutions are strategies of the environment (unrealizable specifications)")
+    parser.add_argument("-n", "--traces", dest="nb_traces", default=1000, type=int, help="number of random traces, default: 1000")
+    parser.add_argument("-l", "--length", dest="length", default=1000, type=int, help="length of the random traces, default: 1000")
+    parser.add_argument("-s", "--seed", dest="seed", default=None, type=int, help="seed of the random traces")
+    parser.add_argument("-r", "--recorded", dest="recorded", default="", type=str, help="file of recorded traces, used instead of random traces")
+    parser.add_argument("-o", "--outputs", dest="outputs", default=False, action="store_const", const=True,
+                        help="write the outputs of the simulation of each solution in a .sim file next to it")
+    args = parser.parse_args()
+
+    if numpy is None:
+        print "NumPy not found! Don't forget to install it"
+        exit(0)
+
+    (inputs, outputs) = parse_partition(args.part)[0:2]
+    player = args.player
+    if args.unreal: # the strategy of the environment is printed with the signals and the starting player switched (see synthetize)
+        (inputs, outputs) = (outputs, inputs)
+        player = switch_player(player)
+    if args.recorded != "":
+        (traces, expected_outputs) = read_traces(args.recorded)
+    else:
+        traces = random_traces(args.nb_traces, args.length, len(inputs), args.seed)
+        expected_outputs = None
+
+    nb_failed = 0
+    for solution_file in args.solutions:
+        solution = read_solution(solution_file, inputs, outputs, player)
+        tables = compile_strategy(solution, inputs, outputs, player)
+        (sim_outputs, first_mismatches) = simulate(tables, traces, min(solution.initial_states), expected_outputs)
+        failed = numpy.flatnonzero(first_mismatches >= 0)
+        if len(failed) > 0:
+            nb_failed += 1
+            print "%s: %d/%d traces with a mismatch (first one: trace %d at step %d)" % (solution_file, len(failed), len(traces), failed[0], first_mismatches[failed[0]])
+        else:
+            print "%s: %d traces OK" % (solution_file, len(traces))
+        if args.outputs:
+            write_outputs(sim_outputs, traces, os.path.splitext(solution_file)[0] + ".sim")
+
+    print "%d/%d solutions with a mismatch" % (nb_failed, len(args.solutions))
+
+if __name__ == "__main__":
+    main()
@@ -15,26 +15,281 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
-from pygraph.classes.digraph import *
-from pygraphviz import *
 from math import *
+from array import array
+from itertools import izip
 import os
+import sys
+import re
+import subprocess
+import atexit
 
 from constants import *
 from utils import *
 from library_linker import *
 from qm import *
+
+aig_output = False # if True, the solutions are also written as AIGER circuits (see print_solution_aig)
+png_rendering = False # if True, the solutions are also rendered in PNG (see display_solution)
+strategy_minimization = False # if True, the extracted strategies are minimized (see minimize_strategy)
+qm_max_nodes = QM_MAX_NODES # budget of the computation of a minimal cover of each label (see compute_transition_cover)
+rendering_processes = [] # Graphviz processes rendering solutions in PNG
+    
+#### Compact representation of a transition system representing one or several winning strategies
+####   - the states are the integers 0, ..., nb_states-1, numbered in the order in which they are reached from the transition system C
+####   - the successors of state s are successors[offsets[s]:offsets[s+1]] (CSR adjacency), the i-th element of successors being the edge i
+####   - the label of edge i is the disjunction of the terms terms[t] for t in edge_terms[terms_offsets[i]:terms_offsets[i+1]], where each
+####     distinct term is stored once in terms
+####   - a term is a pair (outputs cover, inputs cover), written ((outputs) U (inputs)) if player == P_O and ((inputs) U (outputs)) otherwise
+####     (outputs are the signals of the player of the strategy and inputs those of the other player)
+####   - a cover is a tuple of cubes (value, mask) over the signals: signal i is the bit len(signals)-1-i (the first signal is the most
+####     significant bit), the bits of mask are the signals of any value (they are 0 in value), so the cube (0, 2^len(signals)-1) is True
+#### The labels are only converted to formulas when the strategy is written (see term_label)
+class Strategy(object):
+    def __init__(self, inputs, outputs, player):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.player = player
+        self.nb_states = 0
+        self.initial_states = set()
+        self.offsets = array("l", [0])
+        self.successors = array("l")
+        self.terms_offsets = array("l", [0])
+        self.edge_terms = array("l")
+        self.terms = []
+        self.terms_index = {} # term -> index in terms
+        self.nb_states_before_minimization = None # set by minimize_strategy (None if the strategy has not been minimized)
+
+    #### Returns the index of term in terms (term is added if needed)
+    def intern_term(self, term):
+        try:
+            return self.terms_index[term]
+        except KeyError:
+            self.terms_index[term] = len(self.terms)
+            self.terms.append(term)
+            return len(self.terms)-1
+
+    #### Adds the edges outgoing from the next state (states must be completed in the order 0, ..., nb_states-1)
+    #### edges is a list of (successor, list of indexes of terms)
+    def add_state_edges(self, edges):
+        for (successor, terms) in edges:
+            self.successors.append(successor)
+            self.edge_terms.extend(terms)
+            self.terms_offsets.append(len(self.edge_terms))
+        self.offsets.append(len(self.successors))
+
+    #### Returns the indexes of the edges outgoing from state
+    def edges(self, state):
+        return xrange(self.offsets[state], self.offsets[state+1])
+
+    #### Returns the formula of the term of index term
+    def term_label(self, term):
+        (outputs_cover, inputs_cover) = self.terms[term]
+        label_O = get_cover_formula(outputs_cover, self.outputs, "1")
+        label_I = get_cover_formula(inputs_cover, self.inputs, "T")
+        if self.player == P_O:
+            return "((" + label_O + ") U (" + label_I + "))"
+        else:
+            return "((" + label_I + ") U (" + label_O + "))"
+
+    #### Returns the label of edge (terms_labels is the list of the formulas of the terms, computed if None)
+    def edge_label(self, edge, terms_labels=None):
+        terms = self.edge_terms[self.terms_offsets[edge]:self.terms_offsets[edge+1]]
+        if terms_labels == None:
+            return " || ".join([self.term_label(t) for t in terms])
+        return " || ".join([terms_labels[t] for t in terms])
+
+    #### Writes the strategy in f, in the text format of the solution files (state by state: the whole text is never built in memory)
+    def write(self, f):
+        terms_labels = [self.term_label(t) for t in range(len(self.terms))]
+        f.write("Transition system {\n")
+        for state in xrange(self.nb_states):
+            if state in self.initial_states:
+                f.write("    State %d, initial:\n" % state)
+            else:
+                f.write("    State %d:\n" % state)
+            f.write("        Outgoing transitions:\n")
+            for edge in self.edges(state):
+                f.write("            to state %d labeled %s\n" % (self.successors[edge], self.edge_label(edge, terms_labels)))
+        f.write("}\n")
+
+#### Returns the cover True over props_size signals
+def get_true_cover(props_size):
+    return ((0, (1 << props_size)-1),)
+
+#### Returns the formula of cover over the signals props (true_label if cover is True): conjunctions of literals separated by " || ", in
+#### parenthesis if there are several of them
+def get_cover_formula(cover, props, true_label):
+    full_mask = (1 << len(props))-1
+    conjunctions = []
+    for (value, mask) in cover:
+        if mask == full_mask:
+            return true_label
+        literals = []
+        for i in range(len(props)):
+            bit = 1 << (len(props)-1-i)
+            if not mask & bit:
+                if value & bit:
+                    literals.append(props[i])
+                else:
+                    literals.append("!" + props[i])
+        conjunctions.append(" && ".join(literals))
+    if len(conjunctions) == 1:
+        return conjunctions[0]
+    return " || ".join(["(" + conj + ")" for conj in conjunctions])
+
+#### Returns True if the valuation (integer, see Strategy) of the signals satisfies cover
+def satisfies_cover(valuation, cover):
+    for (value, mask) in cover:
+        if valuation & ~mask == value:
+            return True
+    return False
+
+#### Returns the valuations (integers) of the signals satisfying cover (each one once)
+def get_cover_valuations(cover):
+    valuations = set()
+    for (value, mask) in cover:
+        sub = mask
+        while True: # all the submasks of mask
+            valuations.add(value | sub)
+            if sub == 0:
+                break
+            sub = (sub-1) & mask
+    return sorted(valuations)
+
+#### Reads a Strategy from a solution file (written by Strategy.write)
+#### inputs are the signals of the other player and outputs the signals of the player of the strategy, which makes the first move if player == P_O
+def read_solution(filename, inputs, outputs, player):
+    strategy = Strategy(inputs, outputs, player)
+    edges = {} # state -> list of (successor, list of indexes of terms)
+    f = open(filename, "r")
+    for l in f:
+        state_match = re.match(r"\s*State (\d+)(, initial)?:", l)
+        edge_match = re.match(r"\s*to state (\d+) labeled (.*)$", l)
+        if state_match:
+            state = int(state_match.group(1))
+            strategy.nb_states = max(strategy.nb_states, state+1)
+            edges[state] = []
+            if state_match.group(2):
+                strategy.initial_states.add(state)
+        elif edge_match:
+            successor = int(edge_match.group(1))
+            strategy.nb_states = max(strategy.nb_states, successor+1)
+            terms = parse_edge_label(edge_match.group(2), inputs, outputs, player)
+            if terms == None:
+                print "Wrong label in " + filename + ": " + edge_match.group(2).strip()
+                exit(0)
+            edges[state].append((successor, [strategy.intern_term(term) for term in terms]))
+    f.close()
     
-#### Converts a TransitionSystem C representing one or several winning strategies to a digraph
-def convert_transition_system_into_digraph(ts, starting_player, alphabet, mp_parameters, options):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_winning_strategies, path, filename) = options
+    for state in range(strategy.nb_states):
+        strategy.add_state_edges(edges.get(state, []))
+    strategy.terms_index = {}
+    return strategy
+
+#### Parses the label of an edge of a solution file (see Strategy.write): returns the list of its terms (outputs cover, inputs cover), or None if
+#### label is not well-formed
+#### Recursive descent on the tokens of label, with the grammar:
+####   label := term ("||" term)*
+####   term := "(" "(" cover ")" "U" "(" cover ")" ")"
+####   cover := cube ("||" cube)*
+####   cube := "(" conjunction ")" | conjunction
+####   conjunction := literal ("&&" literal)*
+####   literal := "!" signal | signal | "T" | "1"
+def parse_edge_label(label, inputs, outputs, player):
+    tokens = re.findall(r"\|\||&&|[()!]|[^\s()!&|]+", label)
+    if "".join(tokens) != re.sub(r"\s", "", label):
+        return None
+    position = [0]
+
+    def peek():
+        if position[0] < len(tokens):
+            return tokens[position[0]]
+        return None
+
+    def expect(token):
+        if peek() != token:
+            raise ValueError(label)
+        position[0] += 1
+
+    def parse_literal(signals):
+        negated = peek() == "!"
+        if negated:
+            position[0] += 1
+        name = peek()
+        if name in [None, "(", ")", "||", "&&", "!"]:
+            raise ValueError(label)
+        position[0] += 1
+        if not negated and name in ["T", "1"] and name not in signals:
+            return None # True
+        if name not in signals:
+            raise ValueError(label)
+        return (name, not negated)
+
+    def parse_cube(signals):
+        parenthesized = peek() == "("
+        if parenthesized:
+            position[0] += 1
+        full_mask = (1 << len(signals))-1
+        (value, mask) = (0, full_mask)
+        while True:
+            literal = parse_literal(signals)
+            if literal != None:
+                (name, positive) = literal
+                bit = 1 << (len(signals)-1-signals.index(name))
+                if not mask & bit and bool(value & bit) != positive:
+                    raise ValueError(label) # contradiction
+                mask &= ~bit
+                if positive:
+                    value |= bit
+            if peek() != "&&":
+                break
+            position[0] += 1
+        if parenthesized:
+            expect(")")
+        return (value, mask)
+
+    def parse_cover(signals):
+        cover = [parse_cube(signals)]
+        while peek() == "||":
+            position[0] += 1
+            cover.append(parse_cube(signals))
+        return tuple(cover)
+
+    def parse_term():
+        expect("(")
+        expect("(")
+        if player == P_O:
+            outputs_cover = parse_cover(outputs)
+        else:
+            inputs_cover = parse_cover(inputs)
+        expect(")")
+        expect("U")
+        expect("(")
+        if player == P_O:
+            inputs_cover = parse_cover(inputs)
+        else:
+            outputs_cover = parse_cover(outputs)
+        expect(")")
+        expect(")")
+        return (outputs_cover, inputs_cover)
+
+    try:
+        terms = [parse_term()]
+        while peek() == "||":
+            position[0] += 1
+            terms.append(parse_term())
+        if peek() != None:
+            return None
+    except ValueError:
+        return None
+    return terms
+
+#### Converts a TransitionSystem C representing one or several winning strategies to a Strategy
+def convert_transition_system_into_strategy(ts, starting_player, alphabet, mp_parameters, options):
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_winning_strategies, warm_start, path, filename) = options
     (inputs, outputs, dimension, values_I, values_O, values_not_I, values_not_O, nu, c_start, c_bound, c_step) = mp_parameters
 
-    # If the transition system is small enough, simplify labels of transitions
-    label_simplification = False
-    if ts.contents.size_states_PO <= 20:
-        label_simplification = True
-       
     if starting_player == P_O:
         alphabet_starting_p = alphabet.contents.output
         alphabet_starting_p_size = alphabet.contents.output_size
@@ -50,246 +305,412 @@ def convert_transition_system_into_digraph(ts, starting_player, alphabet, mp_par
         first_state_index = ts.contents.size_states_PO
         last_state_index = ts.contents.size_states_PO + ts.contents.size_states_PI
         
+    alphabet_c = alphabet
     alphabet = (alphabet_starting_p, alphabet_starting_p_size, alphabet_other_p, alphabet_other_p_size)
 
-    # Initialize the digraph
-    g = digraph()
-    g.__init__()
-    
-    if label_simplification == True:
-        for state_index in range(first_state_index, last_state_index):
-            add_state_to_digraph_with_formula_simplification(g, ts, state_index, alphabet, starting_player)
-    else:
-        for state_index in range(first_state_index, last_state_index):
-            add_state_to_digraph(g, ts, state_index, alphabet)
+    # Export the transitions of ts (in a single call to the C library)
+    with export_transition_system(ts, alphabet_c) as exported:
+        transitions = get_transitions_from_exported_array(exported.as_array())
+    simplified_labels_cache = {} # set of valuations -> (simplified cover, True if it is minimal) (the same sets of valuations are found on many transitions)
+
+    # Compute the edges of each state of the strategy
+    strategy = Strategy(convert_c_array_to_python_list(alphabet_c.contents.input, alphabet_c.contents.input_size),
+                        convert_c_array_to_python_list(alphabet_c.contents.output, alphabet_c.contents.output_size), starting_player)
+    states = {} # index of the state in ts -> state of the strategy
+    edges = {} # state of the strategy -> list of (successor, list of indexes of terms)
+    for state_index in range(first_state_index, last_state_index):
+        add_state_edges(strategy, states, edges, transitions, state_index, alphabet, starting_player, simplified_labels_cache)
+
+    # Build the CSR adjacency
+    strategy.nb_states = len(states)
+    for state in range(strategy.nb_states):
+        strategy.add_state_edges(edges.get(state, []))
+    strategy.terms_index = {}
     
     initial_states = convert_c_array_to_python_list(ts.contents.initial_states, ts.contents.nb_initial_states)
 
     for initial_state in initial_states:
-        g.add_node_attribute(initial_state, ('initial', True))
+        strategy.initial_states.add(states[initial_state])
+    
+    nb_not_minimal = len([minimal for (cover, minimal) in simplified_labels_cache.values() if not minimal])
+    if nb_not_minimal > 0:
+        print "Warning: " + str(nb_not_minimal) + " label(s) of the solution may not be minimal (budget of " + str(qm_max_nodes) + " nodes of --qmnodes exhausted)"
     
-    return g
+    return strategy
 
-#### Part of the convert_transition_system_into_digraph function: adds a new state to the digraph and deals its successors
-def add_state_to_digraph(g, ts, state_index, alphabet):
-    state_sp = get_ts_state_c(ts, state_index)
+#### Exports the TransitionSystem C ts in an array of integers allocated by the C library (see export_transition_system in transition_system.c)
+#### Returns the OwnedIntArray wrapping it (to close when done), of which as_array() gives access to the array without copy
+def export_transition_system(ts, alphabet):
+    exported = export_transition_system_c(ts, alphabet)
+    (size, nb_words) = (exported[0], exported[1])
+    nb_tr = sum([nb for nb in exported[2:2+size] if nb > 0])
+    return OwnedIntArray(exported, 2+size+(2+nb_words)*nb_tr)
 
-    if is_ts_state_null_c(state_sp) == FALSE:
-        (alphabet_starting_p, alphabet_starting_p_size, alphabet_other_p, alphabet_other_p_size) = alphabet
-    
-        try:
-            g.add_node(state_index)
-            g.add_node_attribute(state_index, ("label", str(len(g)-1)))
-        except AdditionError:
-            pass
-
-        curtran_sp = state_sp.contents.transitions
-        for i in range(0, state_sp.contents.nb_tr):
-            tr_sp = get_ts_transition_from_link_data_c(curtran_sp)
-            label_sp = convert_proptab_to_formula(tr_sp.contents.label, alphabet_starting_p, alphabet_starting_p_size)
-            state_op = get_ts_state_c(ts, tr_sp.contents.to)
-            curtran_op = state_op.contents.transitions
-            for j in range(0, state_op.contents.nb_tr):
-                tr_op = get_ts_transition_from_link_data_c(curtran_op)
-                state_to_sp = tr_op.contents.to
-                
-                try:
-                    g.add_node(state_to_sp)
-                    g.add_node_attribute(state_to_sp, ("label", str(len(g)-1)))
-                except AdditionError:
-                    pass
-                
-                label_op = convert_proptab_to_formula(tr_op.contents.label, alphabet_other_p, alphabet_other_p_size)
-                label = "((" + label_sp + ") U (" + label_op + "))"
-                if not g.has_edge((state_index, state_to_sp)): # new edge from predecessor to new state
-                    g.add_edge((state_index, state_to_sp), 1, label)
-                else: # existing edge
-                    new_label = g.edge_label((state_index, state_to_sp)) + " || " + label
-                    g.set_edge_label((state_index, state_to_sp), new_label)
-                    
-                curtran_op = curtran_op.contents.next
-            curtran_sp = curtran_sp.contents.next
-
-#### Part of the convert_transition_system_into_digraph function: adds a new state to the digraph and deals its successors
-#### Labels of transition are simplified formulas with Quine-McCluskey function
-def add_state_to_digraph_with_formula_simplification(g, ts, state_index, alphabet, player):
-    state_sp = get_ts_state_c(ts, state_index)
-
-    if is_ts_state_null_c(state_sp) == FALSE:
+#### Returns the transitions of an array built by export_transition_system as a dictionary: state -> (array of the successors, list of the labels)
+#### (the states which are NULL in the transition system are not keys of the dictionary)
+#### The C array is copied at once in an array of integers, of which the slices are arrays as well (no list of Python integers is built but the labels)
+def get_transitions_from_exported_array(exported):
+    c_exported = exported
+    exported = array("i")
+    exported.fromstring(buffer(c_exported))
+    (size, nb_words) = (exported[0], exported[1])
+    nb_tr = exported[2:2+size]
+    stride = 2+nb_words
+    to = exported[3+size::stride]
+    if nb_words == 1:
+        labels = exported[4+size::stride]
+    else: # label made of several integers (most significant first) of EXPORTED_LABEL_WORD_BITS bits, or of -1 if the label is True
+        labels = exported[4+size::stride].tolist()
+        for i in range(1, nb_words):
+            labels = [-1 if label == -1 else (label << EXPORTED_LABEL_WORD_BITS)|word for (label, word) in izip(labels, exported[4+size+i::stride])]
+    transitions = {}
+    k = 0
+    for state_index in range(size):
+        if nb_tr[state_index] >= 0:
+            transitions[state_index] = (to[k:k+nb_tr[state_index]], labels[k:k+nb_tr[state_index]])
+            k += nb_tr[state_index]
+    return transitions
+
+#### Returns the cover of label (exported by export_transition_system) over props_size signals: the valuation label, or True if label is -1
+def get_label_cover(label, props_size):
+    if props_size == 0 or label == -1:
+        return get_true_cover(props_size)
+    return ((label, 0),)
+
+#### Returns the state of the strategy of the state state_index of the transition system (a new state is added to states if needed)
+def get_strategy_state(states, state_index):
+    try:
+        return states[state_index]
+    except KeyError:
+        states[state_index] = len(states)
+        return len(states)-1
+
+#### Adds term to the label of the edge from state to successor in edges (the edge is added if needed)
+def add_term_to_edge(edges, state, successor, term):
+    state_edges = edges.setdefault(state, [])
+    for (cur_successor, terms) in state_edges:
+        if cur_successor == successor:
+            if term != None:
+                terms.append(term)
+            return
+    if term != None:
+        state_edges.append((successor, [term]))
+    else:
+        state_edges.append((successor, []))
+
+#### Part of the convert_transition_system_into_strategy function: adds a new state to the strategy and deals its successors
+#### The valuations of the inputs of each transition are simplified in a cover with Quine-McCluskey function (cached in simplified_labels_cache)
+def add_state_edges(strategy, states, edges, transitions, state_index, alphabet, player, simplified_labels_cache):
+    if state_index in transitions:
         (alphabet_starting_p, alphabet_starting_p_size, alphabet_other_p, alphabet_other_p_size) = alphabet
-    
-        try:
-            g.add_node(state_index)
-            g.add_node_attribute(state_index, ("label", str(len(g)-1)))
-        except AdditionError:
-            pass
+        if player == P_O:
+            (outputs_size, inputs_size) = (alphabet_starting_p_size, alphabet_other_p_size)
+        else:
+            (outputs_size, inputs_size) = (alphabet_other_p_size, alphabet_starting_p_size)
+        state = get_strategy_state(states, state_index)
         
         label_dict = dict()
-        curtran_sp = state_sp.contents.transitions
-        for i in range(0, state_sp.contents.nb_tr):
-            tr_sp = get_ts_transition_from_link_data_c(curtran_sp)
-            state_op = get_ts_state_c(ts, tr_sp.contents.to)
-            curtran_op = state_op.contents.transitions
-            for j in range(0, state_op.contents.nb_tr):
-                tr_op = get_ts_transition_from_link_data_c(curtran_op)
-                state_to_sp = tr_op.contents.to
-
-                try:
-                    g.add_node(state_to_sp)
-                    g.add_node_attribute(state_to_sp, ("label", str(len(g)-1)))
-                except AdditionError:
-                    pass
+        for (state_op, tr_sp_label) in izip(*transitions[state_index]):
+            if player == P_O:
+                cover_O = get_label_cover(tr_sp_label, outputs_size)
+            for (state_to_sp, tr_op_label) in izip(*transitions[state_op]):
+                successor = get_strategy_state(states, state_to_sp)
+                add_term_to_edge(edges, state, successor, None)
                 
                 if player == P_O:
-                    if j == 0:
-                        label_O = convert_proptab_to_formula(tr_sp.contents.label, alphabet_starting_p, alphabet_starting_p_size)
-                    cur_label_I_int = convert_proptab_to_int_value(tr_op.contents.label, alphabet_other_p_size)
-                    if not g.has_edge((state_index, state_to_sp)):
-                        g.add_edge((state_index, state_to_sp))
                     try:
-                        label_dict[(label_O, state_to_sp)].append(cur_label_I_int)
+                        label_dict[(cover_O, successor)].append(tr_op_label)
                     except KeyError: 
-                        label_dict[(label_O, state_to_sp)] = [cur_label_I_int]
+                        label_dict[(cover_O, successor)] = [tr_op_label]
                 else:
-                    label_O = convert_proptab_to_formula(tr_op.contents.label, alphabet_other_p, alphabet_other_p_size)
-                    if not g.has_edge((state_index, state_to_sp)):
-                        g.add_edge((state_index, state_to_sp))
-                    if j == 0:
-                        label_I_int = convert_proptab_to_int_value(tr_sp.contents.label, alphabet_starting_p_size)
+                    cover_O = get_label_cover(tr_op_label, outputs_size)
                     try:
-                        label_dict[(label_O, state_to_sp)].append(label_I_int)
+                        label_dict[(cover_O, successor)].append(tr_sp_label)
                     except KeyError:                                            
-                        label_dict[(label_O, state_to_sp)] = [label_I_int]
-                
-                curtran_op = curtran_op.contents.next
-            curtran_sp = curtran_sp.contents.next
+                        label_dict[(cover_O, successor)] = [tr_sp_label]
             
         for key in label_dict:
-            (label_O, state_to) = key
-            label_I = compute_transition_label(label_dict[key], player, alphabet)
-            if label_I ==  "":
-                label_I = "T"
-            if player == P_O:
-                label = "((" + label_O + ") U (" + label_I + "))"
-            else:
-                label = "((" + label_I + ") U (" + label_O + "))"
-            if g.edge_label((state_index, state_to)) == "":
-                g.set_edge_label((state_index, state_to), label)
-            else:
-                new_label = g.edge_label((state_index, state_to)) + " || " + label
-                g.set_edge_label((state_index, state_to), new_label)
+            (cover_O, successor) = key
+            valuations = frozenset(label_dict[key])
+            try:
+                (cover_I, minimal) = simplified_labels_cache[valuations]
+            except KeyError:
+                (cover_I, minimal) = compute_transition_cover(valuations, inputs_size)
+                simplified_labels_cache[valuations] = (cover_I, minimal)
+            add_term_to_edge(edges, state, successor, strategy.intern_term((cover_O, cover_I)))
    
-#### Compute the transition label from tab
-def compute_transition_label(tab, player, alphabet):
-    if len(tab) == 1 and tab[0] == "T":
-        return ""
-    
-    (alphabet_starting_p, alphabet_starting_p_size, alphabet_other_p, alphabet_other_p_size) = alphabet
-    if player == P_O:
-        props = alphabet_other_p
-        props_size = alphabet_other_p_size
-    else:
-        props = alphabet_starting_p
-        props_size = alphabet_starting_p_size
+#### Computes the cover of the set of valuations (integers, -1 for True) of props_size signals, simplified with Quine-McCluskey function
+#### Returns (cover, minimal), minimal being False if the budget qm_max_nodes has been exhausted before the cover has been proved minimal
+def compute_transition_cover(valuations, props_size):
+    if props_size == 0 or -1 in valuations:
+        return (get_true_cover(props_size), True)
+    (cover, minimal) = qm_cubes(sorted(valuations), max_nodes=qm_max_nodes)
+    return (tuple(cover), minimal)
+
+#### Minimizes strategy by partition refinement and returns the minimized Strategy
+#### The coarsest partition such that two states of a block have the same set of (edge label, block of the successor) is computed (it is a
+#### bisimulation, so the minimized strategy has the same behaviors as strategy). The labels are compared as sets of terms, so two edges with
+#### equivalent labels written with different terms are not merged
+#### Refinement with a worklist of splitters (Hopcroft): for each splitter block B and each label a, the blocks are split according to whether
+#### their states have an a-edge to B. When a block is split, all its parts become splitters, except the largest one if the strategy is
+#### deterministic (at most one edge per label from each state), in which case the splitting by the other parts implies the splitting by it
+#### If separate_initial_states, the initial states are never merged with the other states (fake initial state when P_I starts)
+def minimize_strategy(strategy, separate_initial_states):
+    # Label of each edge (index of its set of terms)
+    labels_index = {}
+    edge_labels = [labels_index.setdefault(tuple(sorted(set(strategy.edge_terms[strategy.terms_offsets[edge]:strategy.terms_offsets[edge+1]]))), len(labels_index))
+                   for edge in range(len(strategy.successors))]
+    predecessors = [[] for state in range(strategy.nb_states)] # state -> list of (label, predecessor)
+    deterministic = True
+    for state in range(strategy.nb_states):
+        state_labels = [edge_labels[edge] for edge in strategy.edges(state)]
+        deterministic = deterministic and len(set(state_labels)) == len(state_labels)
+        for edge in strategy.edges(state):
+            predecessors[strategy.successors[edge]].append((edge_labels[edge], state))
     
-    qm_result = qm(tab)
+    # Initial partition: by set of labels of the outgoing edges (it is stable for the whole set of states as splitter)
+    blocks = [] # block -> set of states
+    block = strategy.nb_states*[0] # state -> block
+    initial_blocks = {}
+    for state in range(strategy.nb_states):
+        key = (separate_initial_states and state in strategy.initial_states, frozenset([edge_labels[edge] for edge in strategy.edges(state)]))
+        if key not in initial_blocks:
+            initial_blocks[key] = len(blocks)
+            blocks.append(set())
+        block[state] = initial_blocks[key]
+        blocks[block[state]].add(state)
+    worklist = range(len(blocks))
+    in_worklist = len(blocks)*[True]
     
-    label = ""
-    j=0
-    for conj in qm_result:
-        l_diff = props_size - len(conj)
-        i=0
-        first = True
-        if len(qm_result) > 1:
-            label += "("
-        while i<l_diff:
-            if not first:
-                label += " && "
-            label += "!"+props[i]
-            first = False
-            i+=1
-        i=0
-        while i<len(conj):
-            if not first and conj[i] != "X":
-                label += " && "
-            if conj[i] == "1":
-                label += props[i+l_diff]
-            elif conj[i] == "0":
-                label += "!"+props[i+l_diff]
-            #else: conj[i] = X and this prop is skiped
-            if conj[i] != "X":
-                first = False
-            i+=1
-        if len(qm_result) > 1:
-            label += ")"
-        if j != len(qm_result)-1:
-            label += " || "
-        j+=1
+    # Refine the partition until there is no splitter left
+    while len(worklist) > 0:
+        splitter = worklist.pop()
+        in_worklist[splitter] = False
+        splitting_sets = {} # label -> states with an edge labeled by it to the splitter
+        for state in blocks[splitter]:
+            for (label, predecessor) in predecessors[state]:
+                splitting_sets.setdefault(label, set()).add(predecessor)
+        for splitting_set in splitting_sets.values():
+            touched_blocks = {}
+            for state in splitting_set:
+                touched_blocks.setdefault(block[state], []).append(state)
+            for (split_block, part) in touched_blocks.items():
+                if len(part) == len(blocks[split_block]):
+                    continue
+                new_block = len(blocks)
+                blocks.append(set(part))
+                blocks[split_block].difference_update(part)
+                for state in part:
+                    block[state] = new_block
+                if in_worklist[split_block] or not deterministic:
+                    new_splitters = [split_block, new_block]
+                elif len(part) <= len(blocks[split_block]):
+                    new_splitters = [new_block]
+                else:
+                    new_splitters = [split_block]
+                in_worklist.append(False)
+                for new_splitter in new_splitters:
+                    if not in_worklist[new_splitter]:
+                        in_worklist[new_splitter] = True
+                        worklist.append(new_splitter)
+    nb_blocks = len(blocks)
+
+    # Build the minimized strategy: one state per block (numbered in the order of the states of strategy), with the edges of the first state of the block
+    minimized = Strategy(strategy.inputs, strategy.outputs, strategy.player)
+    minimized.terms = strategy.terms
+    minimized.nb_states = nb_blocks
+    minimized.nb_states_before_minimization = strategy.nb_states
+    blocks_rank = {}
+    representatives = []
+    for state in range(strategy.nb_states):
+        if block[state] not in blocks_rank:
+            blocks_rank[block[state]] = len(representatives)
+            representatives.append(state)
+    for state in representatives:
+        edges = []
+        successors_index = {}
+        for edge in strategy.edges(state):
+            successor = blocks_rank[block[strategy.successors[edge]]]
+            if successor not in successors_index:
+                successors_index[successor] = len(edges)
+                edges.append((successor, []))
+            terms = edges[successors_index[successor]][1]
+            for term in strategy.edge_terms[strategy.terms_offsets[edge]:strategy.terms_offsets[edge+1]]:
+                if term not in terms:
+                    terms.append(term)
+        minimized.add_state_edges(edges)
+    for initial_state in strategy.initial_states:
+        minimized.initial_states.add(blocks_rank[block[initial_state]])
     
-    return label
+    return minimized
 
-#### Writes the transition system representing a solution in a file
-def print_solution(g, inputs, outputs, player, filename, path, verbosity):
-    # Find initial states
-    init = []
-    for node in g.nodes():
-        try:
-            dict(g.node_attributes(node))['initial']
-            init.append(node)
-        except KeyError:
-            pass
+#### Sets the maximum number of nodes of the computation of a minimal cover of each label of the solutions (see unate_cover in qm.py)
+def set_qm_max_nodes(max_nodes):
+    global qm_max_nodes
+    qm_max_nodes = max_nodes
 
-    solution = "Transition system {\n"
-    
-    for node in g.nodes():
-        solution += "    State " + str(dict(g.node_attributes(node))["label"])
-        if node in init:
-            solution += ", initial:\n"
-        else:
-            solution += ":\n" 
+def get_qm_max_nodes():
+    return qm_max_nodes
 
-        solution += "        Outgoing transitions:\n"
-        for successor in g.neighbors(node):            
-            solution += "            to state " + str(dict(g.node_attributes(successor))["label"]) + " labeled " + str(g.edge_label((node, successor))) + "\n"
-    
-    solution += "}\n"
-    
-    controled_print("Solution: \n", [ALLTEXT], verbosity)
-    controled_print(solution+"\n", [ALLTEXT], verbosity)
+#### Enables the minimization of the extracted strategies (see minimize_strategy)
+def enable_strategy_minimization():
+    global strategy_minimization
+    strategy_minimization = True
+
+def is_strategy_minimization_enabled():
+    return strategy_minimization
+
+#### Writes the transition system representing a solution (a Strategy) in a file
+def print_solution(solution, inputs, outputs, player, filename, path, verbosity):
+    if verbosity == ALLTEXT:
+        controled_print("Solution: \n", [ALLTEXT], verbosity)
+        solution.write(sys.stdout)
+        controled_print("\n", [ALLTEXT], verbosity)
     
     solutionfile = open(path+filename+".txt", "w")                       
-    solutionfile.write(solution)
+    solution.write(solutionfile)
     solutionfile.close() 
             
 
-# Converts the digraph (pygraph) into a AGraph (pygraphviz) to visualize the solution
-def display_solution(g, inputs, outputs, player, filename, path):
-    viz_g = AGraph(name="G", directed=True, strict=False)
-    for node in g.nodes():
-        node_attributes = dict(g.node_attributes(node))
-        lab = ""
-        try:
-            lab = node_attributes['label']
-        except KeyError:
-            pass
-        try:
-            node_attributes['initial']
-            initial = True
-        except KeyError:
-            initial = False
+#### Enables the output of the solutions as AIGER circuits
+def enable_aig_output():
+    global aig_output
+    aig_output = True
+
+#### Returns True if the solutions must also be written as AIGER circuits
+def is_aig_output_enabled():
+    return aig_output
+
+#### Writes the strategy solution in an AIGER file (.aag) as a circuit with:
+####   - one input per signal of inputs (signals of the other player)
+####   - the states of the strategy binary-encoded in latches (the first initial state is encoded by 0, the reset value of the latches)
+####   - one output per signal of outputs (signals of the player of the strategy)
+#### If solution is non deterministic, the circuit resolves it by priority: first edge, then first term of its label
+def print_solution_aig(solution, inputs, outputs, player, filename, path):
+    # Imported here: boolnet needs pydot, and ltl2aig imports acacia_plus
+    import boolnet
+    import ltl2aig
+    
+    # The nodes of the BoolNet are global: keep those of the caller (e.g. the game built by ltl2aig) aside and restore them after
+    saved_nodes = (boolnet.BoolNet.T[2:], boolnet.BoolNet.H)
+    boolnet.BoolNet.reset()
+    try:
+        input_map = dict()
+        for i in range(len(inputs)):
+            input_map[inputs[i]] = 2*(i+1)
+        nb_latches = 0
+        if solution.nb_states > 1:
+            nb_latches = len(bin(solution.nb_states-1))-2
+        latches = [2*(len(inputs)+1+b) for b in range(nb_latches)]
+        latch_net = dict([(l, boolnet.BoolNet(False)) for l in latches])
+        output_net = [boolnet.BoolNet(False) for o in outputs]
         
-        if initial:
-            viz_g.add_node(node, label=lab, color='red', shape="ellipse")
-        else:
-            viz_g.add_node(node, label=lab, shape="ellipse")
+        # Binary encoding of the states (the first initial state is swapped with state 0)
+        codes = range(solution.nb_states)
+        initial_state = min(solution.initial_states)
+        (codes[0], codes[initial_state]) = (codes[initial_state], codes[0])
         
-    for (a, b) in g.edges():
-        viz_g.add_edge(a, b, label=g.edge_label((a, b)).replace("&&", "&") + "  ")
+        # Conditions on the inputs and valuations of the outputs of each term of the labels (the valuation of the outputs of a term is the
+        # first one of its cover, with the signals of any value set to 0)
+        terms_info = dict()
+        def get_term_info(term):
+            try:
+                return terms_info[term]
+            except KeyError:
+                (outputs_cover, inputs_cover) = solution.terms[term]
+                outputs_valuation = outputs_cover[0][0]
+                inputs_net = boolnet.BoolNet(False)
+                for (value, mask) in inputs_cover:
+                    cube_net = boolnet.BoolNet(True)
+                    for i in range(len(inputs)):
+                        bit = 1 << (len(inputs)-1-i)
+                        if not mask & bit:
+                            if value & bit:
+                                cube_net &= boolnet.BoolNet(input_map[inputs[i]])
+                            else:
+                                cube_net &= ~boolnet.BoolNet(input_map[inputs[i]])
+                    inputs_net |= cube_net
+                info = (outputs_cover, outputs_valuation, [(outputs_valuation >> (len(outputs)-1-o)) & 1 for o in range(len(outputs))], inputs_net)
+                terms_info[term] = info
+                return info
+        
+        for state in range(solution.nb_states):
+            state_net = ltl2aig.int2binlatch(latches, codes[state])
+            covered = boolnet.BoolNet(False) # inputs for which a transition from state has already been chosen
+            chosen_valuation = None
+            for edge in solution.edges(state):
+                successor_bits = ltl2aig.int2latchlist(latches, codes[solution.successors[edge]])
+                for term in solution.edge_terms[solution.terms_offsets[edge]:solution.terms_offsets[edge+1]]:
+                    (outputs_cover, outputs_valuation, outputs_values, inputs_net) = get_term_info(term)
+                    if player == P_O:
+                        # The outputs only depend on state: keep the terms compatible with the valuation of the first one
+                        if chosen_valuation == None:
+                            chosen_valuation = outputs_valuation
+                            for o in range(len(outputs)):
+                                if outputs_values[o]:
+                                    output_net[o] |= state_net
+                        elif not satisfies_cover(chosen_valuation, outputs_cover):
+                            continue
+                    fire = state_net & inputs_net & ~covered
+                    covered |= inputs_net
+                    if player == P_I:
+                        for o in range(len(outputs)):
+                            if outputs_values[o]:
+                                output_net[o] |= fire
+                    for l in successor_bits:
+                        latch_net[l] |= fire
             
+        ltl2aig.write_aag(inputs, latch_net, output_net, outputs, path+filename+".aag")
+    finally:
+        boolnet.BoolNet.T[2:] = saved_nodes[0]
+        boolnet.BoolNet.H = saved_nodes[1]
+
+#### Enables the rendering of the solutions in PNG (see display_solution)
+def enable_png_rendering():
+    global png_rendering
+    png_rendering = True
+
+def is_png_rendering_enabled():
+    return png_rendering
+
+#### Writes the Strategy solution in a DOT file to visualize it, and renders it in PNG with Graphviz in a background process if PNG rendering
+#### is enabled (the synthesis does not wait for Graphviz, see wait_for_renderings)
+def display_solution(solution, inputs, outputs, player, filename, path):
     try:
-        # Write in .png
-        viz_g.draw(path+filename+".png", "png", prog="dot")
-        # Write in .dot
-        viz_g.draw(path+filename+".dot", "dot", prog="dot")
+        dotfile = open(path+filename+".dot", "w")
+        dotfile.write("digraph G {\n")
+        for state in range(solution.nb_states):
+            if state in solution.initial_states:
+                dotfile.write("    %d [label=\"%d\", color=red, shape=ellipse];\n" % (state, state))
+            else:
+                dotfile.write("    %d [label=\"%d\", shape=ellipse];\n" % (state, state))
+        terms_labels = [solution.term_label(t) for t in range(len(solution.terms))]
+        for state in range(solution.nb_states):
+            for edge in solution.edges(state):
+                label = solution.edge_label(edge, terms_labels).replace("&&", "&").replace("\\", "\\\\").replace("\"", "\\\"")
+                dotfile.write("    %d -> %d [label=\"%s  \"];\n" % (state, solution.successors[edge], label))
+        dotfile.write("}\n")
+        dotfile.close()
     except IOError:
-        pass
+        return
+    
+    if png_rendering:
+        render_png(path+filename+".dot", path+filename+".png")
+
+#### Renders the DOT file dot_filename in the PNG file png_filename with Graphviz in a background process
+def render_png(dot_filename, png_filename):
+    # Reap the renderings already done
+    rendering_processes[:] = [process for process in rendering_processes if process.poll() == None]
+    try:
+        rendering_processes.append(subprocess.Popen(["dot", "-Tpng", dot_filename, "-o", png_filename]))
+    except OSError:
+        print "Warning: Graphviz (dot) not found, " + png_filename + " not rendered"
+
+#### Waits for the end of the renderings in PNG started by render_png (called at exit, and by the processes which run a synthesis for another one
+#### before they exit, as the exit handlers are not run in the processes launched by multiprocessing)
+def wait_for_renderings():
+    for process in rendering_processes:
+        process.wait()
+    rendering_processes[:] = []
+
+atexit.register(wait_for_renderings)
@@ -15,8 +15,6 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
-from pygraph.classes.digraph import digraph
-
 from constants import *
 from utils import *
 from library_linker import *
@@ -37,9 +35,9 @@ def build_tbucw(aut_list, accepting_states_list, alphabet, inputs, outputs, star
     nb_states = 0
     nb_trans = 0
     for aut in aut_list:
-        nb_states += len(aut.nodes())
-        for edge in aut.edges():
-            nb_trans += aut.edge_weight(edge) # the weight of the edge represents the disjunction size of its label (on the turn based automaton, these disjunctions will be split into several distinct transitions)
+        nb_states += len(aut.states)
+        for edge in range(len(aut.edges)):
+            nb_trans += aut.disj_size(edge) # on the turn based automaton, the disjunctions of the label will be split into several distinct transitions
             
     nb_automata = len(aut_list)
     if nb_automata > 1:
@@ -47,18 +45,15 @@ def build_tbucw(aut_list, accepting_states_list, alphabet, inputs, outputs, star
         # Count the number of outgoing transitions of the initial state
         nb_out_tran_init = 0
         for aut in aut_list:
-            for neighbor in aut.neighbors("initial"):
-                nb_out_tran_init += aut.edge_weight(("initial", neighbor)) # sum of number of outgoing transitions of the initial state of each automaton
-           
-    a = init_tbucw_c(nb_states+nb_trans)
-    
-    # Set the alphabet
-    a = set_alphabet_c(a, alphabet)
-    
-    # Set the weight functions and dimension
-    a = set_dimension_c(a, dimension)
-    a = set_weight_function_c(a, P_I, weight_function_I)
-    a = set_weight_function_c(a, P_O, weight_function_O)
+            for edge in aut.out_edges()[aut.initial()]:
+                nb_out_tran_init += aut.disj_size(edge) # sum of number of outgoing transitions of the initial state of each automaton
+
+    # States and transitions are collected in flat arrays, and the automaton is built by a single call to the C library (see build_tbucw_from_arrays)
+    states_array = {} # index of the state -> (nb_in_tran, nb_out_tran, is_accepting, player, unbounded, is_trash)
+    transitions_array = [] # from, to, disjunction size and offset of the label in labels, for each transition
+    labels = [] # labels of the transitions (each one followed by a null character)
+    labels_size = 0
+    initial_state_index = 0
     
     # Add states and transitions      
     i=0 #non turn based states counter
@@ -66,44 +61,42 @@ def build_tbucw(aut_list, accepting_states_list, alphabet, inputs, outputs, star
     automaton_index = 0 # index of the current automaton
     nb_states_added = 0; # counter of non turn based states added for all previous automata
     if nb_automata > 1: # more than one automaton -> add a common non accepting initial state
-        add_state_c(a, i, 0, nb_out_tran_init, FALSE, starting_player, TRUE, FALSE)
-        set_initial_state_c(a, i) # set the initial_state_index variable of the automaton
+        states_array[i] = (0, nb_out_tran_init, FALSE, starting_player, TRUE, FALSE)
+        initial_state_index = i # set the initial_state_index variable of the automaton
         i += 1
         nb_states_added += 1
     for aut in aut_list:
-        cur_state_local_index = 0 # index of the current state in the current automaton
         cur_nb_states_added = 0 # counter of non turn based states added for this automaton
-        for cur_state in aut.nodes():
+        out_edges = aut.out_edges()
+        in_edges = aut.in_edges()
+        for cur_state in range(len(aut.states)):
             states_to_add = [] #states and transitions will be added to the automaton_c when all successors will have been visited (Optimization_fusion)
             tran_to_add = []
             array = [] #keeps in memory the outgoing transitions already added to this state (Optimization_fusion)
             
             # Optimization1: Get the unbounded value computed before if Optimization1 is enabled
-            try:
-                unbounded = dict(aut.node_attributes(aut.nodes()[cur_state_local_index]))['unbounded']
-            except KeyError:
-                unbounded = TRUE
+            unbounded = aut.unbounded[cur_state]
             
             # If there is only one automaton, its initial state has to be conserved
             if nb_automata == 1:    
-                if cur_state == "initial":
-                    set_initial_state_c(a, i) # set the initial_state_index variable of the automaton
+                if cur_state == aut.initial():
+                    initial_state_index = i # set the initial_state_index variable of the automaton
 
             # Add cur state
             # the number of outgoing transitions is set to 1, and will be incremented each time a transition is added (goal: do not use more memory than necessery because of the fusion of transitions with same label)
             nb_pred = 0
-            for pred in aut.incidents(cur_state):
-                nb_pred += aut.edge_weight((pred, cur_state))
+            for edge in in_edges[cur_state]:
+                nb_pred += aut.disj_size(edge)
             is_accepting = accepting_states_list[automaton_index].count(cur_state) # the turn based states reachable in one step from cur_state will be set accepting (and cur_state non accepting)
             states_to_add.append((i, nb_pred, 1, FALSE, starting_player, unbounded))
             cur_nb_states_added += 1
 
             # Add outgoing transitions from cur_state
-            for cur_succ in aut.neighbors(cur_state):
+            for edge in out_edges[cur_state]:
                 # Index of the current successor
-                cur_succ_index = (aut.nodes()).index(cur_succ) + nb_states_added # the index in the turn based automata
+                cur_succ_index = aut.edges[edge][1] + nb_states_added # the index in the turn based automata
                 
-                labels_array = aut.edge_label((cur_state, cur_succ)).split("||") # split the disjunction
+                labels_array = aut.label(edge).split("||") # split the disjunction
                 for lab in labels_array: # for each disjunction, add a turn based state if necessary and 2 transitions
                     is_partition_ok = check_partition_with_label(lab, inputs, outputs)
                     if not is_partition_ok:
@@ -125,7 +118,7 @@ def build_tbucw(aut_list, accepting_states_list, alphabet, inputs, outputs, star
                     if index == -1: #new transition
                         # if there are more than one automaton and if this is a transition starting from the initial state of aut, 
                         # this transition will be duplicated to also start from the unique initial state of the turn based automaton (-> 2 incoming transitions for this turn based state)
-                        if nb_automata > 1 and cur_state == "initial":
+                        if nb_automata > 1 and cur_state == aut.initial():
                             states_to_add.append((nb_states+j, 2, 1, is_accepting, switch_player(starting_player), unbounded))
                         else: # otherwise, initialize it with only one incoming transition
                             states_to_add.append((nb_states+j, 1, 1, is_accepting, switch_player(starting_player), unbounded))
@@ -134,13 +127,13 @@ def build_tbucw(aut_list, accepting_states_list, alphabet, inputs, outputs, star
                         if starting_player == P_I:
                             array.append((disj_I, disj_size_I)) # Optimization_fusion: add this label to the array of outgoing labels
                             tran_to_add.append((disj_I, disj_size_I, i, nb_states+j))
-                            if nb_automata > 1 and cur_state == "initial": # add the duplicate transition from the unique initial state to the current turn based state
+                            if nb_automata > 1 and cur_state == aut.initial(): # add the duplicate transition from the unique initial state to the current turn based state
                                 tran_to_add.append((disj_I, disj_size_I, 0, nb_states+j))
                             tran_to_add.append((disj_O, disj_size_O, nb_states+j, cur_succ_index))
                         else:
                             array.append((disj_O, disj_size_O)) # Optimization_fusion: add this label to the array of outgoing labels
                             tran_to_add.append((disj_O, disj_size_O, i, nb_states+j))
-                            if nb_automata > 1 and cur_state == "initial": # add the duplicate transition from the unique initial state to the current turn based state
+                            if nb_automata > 1 and cur_state == aut.initial(): # add the duplicate transition from the unique initial state to the current turn based state
                                 tran_to_add.append((disj_O, disj_size_O, 0, nb_states+j))
                             tran_to_add.append((disj_I, disj_size_I, nb_states+j, cur_succ_index))
                         j += 1
@@ -154,23 +147,31 @@ def build_tbucw(aut_list, accepting_states_list, alphabet, inputs, outputs, star
                         else:
                             tran_to_add.append((disj_I, disj_size_I, state_index, cur_succ_index))
             
-            # Construct states and transitions in states_to_add and tran_to_add
+            # Collect the states and transitions of states_to_add and tran_to_add
             for state in states_to_add:
-                add_state_c(a, state[0], state[1], state[2], state[3], state[4], state[5], FALSE)
+                states_array[state[0]] = (state[1], state[2], state[3], state[4], state[5], FALSE)
             for tran in tran_to_add:
-                add_tran_c(a, tran[0], tran[1], tran[2], tran[3])      
+                transitions_array.extend((tran[2], tran[3], tran[1], labels_size))
+                labels.append(tran[0])
+                labels_size += len(tran[0])+1
             
             i += 1
-            cur_state_local_index += 1
       
         nb_states_added += cur_nb_states_added
         automaton_index += 1
 
-    # Duplicate transitions (fill the in_tran list of each state from the out_tran lists of all states)
-    duplicate_all_tran_c(a)
+    # Build the automaton, duplicate transitions (fill the in_tran list of each state from the out_tran lists of all states) and set the is_complete
+    # variable of each state: to True if the state has a transition for each set of propositions, to False otherwise
+    states_c = (c_int*(6*len(states_array)))()
+    for index in states_array: # the indexes of the states are 0, ..., len(states_array)-1
+        states_c[6*index:6*index+6] = list(states_array[index])
+    transitions_c = (c_int*len(transitions_array))(*transitions_array)
+    a = build_tbucw_from_arrays_c(len(states_array), states_c, len(transitions_array)/4, transitions_c, "\0".join(labels)+"\0", alphabet, initial_state_index)
 
-    # Set the is_complete variable of each state: to True if the state has a transition for each set of propositions, to False otherwise
-    set_is_complete_c(a)
+    # Set the weight functions and dimension
+    a = set_dimension_c(a, dimension)
+    a = set_weight_function_c(a, P_I, weight_function_I)
+    a = set_weight_function_c(a, P_O, weight_function_O)
 
     return a
 
@@ -193,7 +194,7 @@ def build_alphabet(inputs, outputs):
     
 #### Builds the weight functions associated to the alphabet of each player
 def build_weight_functions(inputs, outputs, alphabet, mp_parameters, options):
-    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, unrea, set_of_strategies, path, filename) = options
+    (tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, unrea, set_of_strategies, warm_start, path, filename) = options
     (inputs, outputs, dimension, values_I, values_O, values_not_I, values_not_O, nu, c_start, c_bound, c_step) = mp_parameters
     
     nu_int = [0]*dimension
@@ -331,8 +332,14 @@ def check_transition(array, proptab, nb_prop):
     return -1
 
 
-#### Optimization 2: Compute a fix point on the states of the tbucw_automaton to find loosing states (states such that there exists a PI strategy to visit more than K accepting states) (calls a dylib C)
+#### Optimization 2: Removes the loosing states of the tbucw_automaton for k_value (see k_surely_losing_states) (calls a dylib C)
+#### Returns automaton_c if there is no loosing state
 def tbucw_size_optimization(automaton_c, k_value):
+    return remove_tbucw_states(automaton_c, k_surely_losing_states(automaton_c, k_value))
+
+#### Compute a fix point on the states of the tbucw_automaton to find loosing states (states such that there exists a PI strategy to visit more than K accepting states)
+#### Returns the list of the indexes of the loosing states
+def k_surely_losing_states(automaton_c, k_value):
     nb_states = automaton_c.contents.nb_states
     
     # Detect loosing states
@@ -382,15 +389,16 @@ def tbucw_size_optimization(automaton_c, k_value):
                 
         c = c_prime[:]
 
-    # Remove from automaton_c those loosing states (states which have counter k_value+1 in c)
-    states_to_remove = (c_byte*nb_states)(FALSE)
-    nb_states_to_remove = 0
-    for i in range(0, nb_states):
-        if c[i] == k_value+1:
-            states_to_remove[i] = TRUE
-            nb_states_to_remove += 1  
-    
-    if nb_states_to_remove > 0:    
-        return optimize_tbucw_c(automaton_c, states_to_remove)
+    # Loosing states: states which have counter k_value+1 in c
+    return [i for i in range(0, nb_states) if c[i] == k_value+1]
+
+#### Builds the automaton obtained by removing from automaton_c the states of which indexes are in states (see optimize_tbucw) (calls a dylib C)
+#### Returns automaton_c if states is empty
+def remove_tbucw_states(automaton_c, states):
+    if len(states) == 0:
+        return automaton_c
 
-    return automaton_c 
\ No newline at end of file
+    states_to_remove = (c_byte*automaton_c.contents.nb_states)(FALSE)
+    for i in states:
+        states_to_remove[i] = TRUE
+    return optimize_tbucw_c(automaton_c, states_to_remove) 
\ No newline at end of file
@@ -0,0 +1,76 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import subprocess
+import resource
+import unittest
+
+from constants import *
+from automaton import parse_never_claim, load_ltl2ba_library, translate_ltl2ba
+
+# Negations of specifications (as given to ltl2ba by Acacia+), with the special cases of the never claims (false, true, accepting state all)
+FORMULAS = ["false",
+            "true",
+            "!([] (r -> <> g))",
+            "!(([] <> r) -> ([] <> g))",
+            "<> r",
+            "!([] (r0 -> X (g0 U r1)) && [] (r1 -> <> (g1 || !g0)))",
+            "!(([] <> r0 && [] <> r1) -> ([] (r0 -> <> g0) && [] (r1 -> <> g1) && [] !(g0 && g1)))",
+            "!([] (r0 -> X X g0) && [] (g0 -> X !g0) && [] <> (g1 <-> X g1))"]
+
+#### Returns the Automaton parsed from the never claim printed by the ltl2ba executable for formula
+def run_ltl2ba(formula):
+    out = subprocess.Popen([LTL2BA_PATH+"ltl2ba", "-f", formula], stdout=subprocess.PIPE)
+    return parse_never_claim(out.communicate()[0], LTL2BA)
+
+@unittest.skipIf(not os.path.exists(LTL2BA_PATH+"ltl2ba") or not load_ltl2ba_library(), "ltl2ba or its library not built")
+class TranslateLTL2BATest(unittest.TestCase):
+    def assertSameAutomaton(self, aut, expected):
+        self.assertEqual(aut.states, expected.states)
+        self.assertEqual(aut.accepting, expected.accepting)
+        self.assertEqual(aut.edges, expected.edges)
+        self.assertEqual(aut.labels, expected.labels)
+        self.assertEqual(aut.initial(), expected.initial())
+
+    def test_same_as_executable(self):
+        for formula in FORMULAS:
+            self.assertSameAutomaton(translate_ltl2ba(formula), run_ltl2ba(formula))
+
+    def test_syntax_error(self):
+        self.assertEqual(translate_ltl2ba("[] (r -> <> )"), None)
+        self.assertEqual(translate_ltl2ba("r && && g"), None)
+        # The library can still be used after an error
+        self.assertSameAutomaton(translate_ltl2ba(FORMULAS[2]), run_ltl2ba(FORMULAS[2]))
+    def test_memory_released(self):
+        # The translations release all their memory: the peak memory of the process no longer grows once the first ones are done
+        for i in range(100):
+            translate_ltl2ba(FORMULAS[6])
+        peak = max_rss()
+        for i in range(2000):
+            translate_ltl2ba(FORMULAS[6])
+        self.assertTrue(max_rss()-peak < 2*1024*1024)
+
+#### Returns the peak resident set size of the process, in bytes
+def max_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if os.uname()[0] == "Darwin":
+        return rss
+    return rss*1024
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import shutil
+import tempfile
+import time
+import multiprocessing
+import unittest
+
+from constants import *
+
+try:
+    import acacia_plus
+except (ImportError, OSError): # library of Acacia+ not built or pygraph not installed
+    acacia_plus = None
+
+CONFIGURATIONS = [(FORWARD, ON, OPT12), (BACKWARD, OFF, OPT12), (BACKWARD, ON, OPT1)]
+
+@unittest.skipIf(acacia_plus is None, "library of Acacia+ not built or pygraph not installed")
+class PortfolioTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    #### Copies the example name of examples/demo-lily in the temporary directory and returns the files of the problem and the options to solve it
+    def problem(self, name, k_bound):
+        for extension in [".ltl", ".part"]:
+            shutil.copyfile(os.path.join("examples", "demo-lily", name + extension), os.path.join(self.directory, name + extension))
+        options = (LTL2BA, OPT12, ON, NONE, MONO, MONO, FORWARD, 0, k_bound, 1, LINEAR, 60., REAL, FALSE, OFF, self.directory + "/", name)
+        return (os.path.join(self.directory, name + ".ltl"), os.path.join(self.directory, name + ".part"), options)
+
+    def read_log(self):
+        f = open(os.path.join(self.directory, "portfolio.log"), "r")
+        lines = [l.rstrip("\n").split("\t") for l in f]
+        f.close()
+        return lines
+
+    def test_conclusive_configuration_kept(self):
+        (ltl_file, part_file, options) = self.problem("demo-v3", 5)
+        result = acacia_plus.run_portfolio(ltl_file, part_file, P_O, options, CONFIGURATIONS)
+        self.assertEqual(result, (True, True))
+        # The solution of the winner is renamed as in the normal mode, the solutions of the other configurations are removed
+        files = os.listdir(self.directory)
+        self.assertTrue("demo-v3.txt" in files)
+        self.assertEqual([f for f in files if "_portfolio" in f], [])
+        # The winner is logged
+        [(filename, winning_configuration, total_time)] = self.read_log()
+        self.assertEqual(filename, "demo-v3")
+        self.assertTrue(winning_configuration in [":".join(configuration) for configuration in CONFIGURATIONS])
+
+    def test_same_verdict_as_synthetize(self):
+        (ltl_file, part_file, options) = self.problem("demo-v16", 5)
+        expected = acacia_plus.synthetize(ltl_file, part_file, P_O, options)
+        self.assertEqual(acacia_plus.run_portfolio(ltl_file, part_file, P_O, options, CONFIGURATIONS), expected)
+
+    def test_no_conclusive_configuration(self):
+        # demo-v16 needs k = 2
+        (ltl_file, part_file, options) = self.problem("demo-v16", 1)
+        self.assertEqual(acacia_plus.run_portfolio(ltl_file, part_file, P_O, options, CONFIGURATIONS), (False, False))
+        self.assertEqual(sorted(os.listdir(self.directory)), ["demo-v16.ltl", "demo-v16.part", "portfolio.log"])
+        self.assertEqual(self.read_log()[0][0:2], ["demo-v16", "none"])
+    def test_process_group_set_by_parent(self):
+        # The process does not make itself a process group leader (as a worker that has not run yet): it is stopped at once anyway
+        p = multiprocessing.Process(target=time.sleep, args=(60,))
+        p.start()
+        acacia_plus.set_process_group(p)
+        self.assertEqual(os.getpgid(p.pid), p.pid)
+        start_time = time.time()
+        acacia_plus.stop_process_group(p)
+        self.assertFalse(p.is_alive())
+        self.assertTrue(time.time()-start_time < 10)
+
+if __name__ == "__main__":
+    unittest.main()
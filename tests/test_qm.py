@@ -0,0 +1,104 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import math
+import random
+import unittest
+from itertools import combinations
+
+from qm import *
+
+#### Returns the minterms of the cube (value, mask)
+def cube_minterms(cube):
+    (value, mask) = cube
+    return set([value | sub for sub in range(mask+1) if sub & mask == sub])
+
+#### Returns all the cubes (value, mask) over nb_vars variables of which minterms are all in allowed
+def implicants(allowed, nb_vars):
+    return [(value, mask) for mask in range(1 << nb_vars) for value in range(1 << nb_vars)
+            if value & mask == 0 and cube_minterms((value, mask)) <= allowed]
+
+#### Returns the implicants of allowed which are not contained in another implicant
+def maximal_implicants(allowed, nb_vars):
+    cubes = implicants(allowed, nb_vars)
+    return [cube for cube in cubes if not [other for other in cubes if cube_minterms(cube) < cube_minterms(other)]]
+
+#### Returns the size of a minimal cover of ones by cubes of which minterms are in ones or dc (brute force over the subsets of the maximal
+#### implicants, as any cube of a cover can be replaced by a maximal implicant containing it)
+def minimal_cover_size(ones, dc, nb_vars):
+    cubes = [cube for cube in maximal_implicants(ones | dc, nb_vars) if cube_minterms(cube) & ones]
+    for size in range(len(ones)+1):
+        for cover in combinations(cubes, size):
+            if set().union(*[cube_minterms(cube) for cube in cover]) >= ones:
+                return size
+
+class QMTest(unittest.TestCase):
+    #### Checks the cover of ones (and dc) computed by qm_cubes against brute force
+    def check_cover(self, ones, dc, nb_vars):
+        (cover, minimal) = qm_cubes(ones=sorted(ones), dc=sorted(dc))
+        self.assertTrue(minimal)
+        covered = set()
+        for cube in cover:
+            self.assertTrue(cube_minterms(cube) <= ones | dc)
+            covered |= cube_minterms(cube)
+        self.assertTrue(covered >= ones)
+        self.assertEqual(len(cover), minimal_cover_size(ones, dc, nb_vars))
+        # Same cover as strings with qm
+        numvars = int(math.ceil(math.log(max(ones | dc)+1, 2)))
+        self.assertEqual(qm(ones=sorted(ones), dc=sorted(dc)), [cube2s(cube, numvars) for cube in cover])
+
+    def test_primes(self):
+        rand = random.Random(1)
+        for i in range(200):
+            nb_vars = rand.randint(1, 4)
+            ones = set(rand.sample(range(1 << nb_vars), rand.randint(1, 1 << nb_vars)))
+            primes = compute_primes([(one, 0) for one in ones], nb_vars)
+            self.assertEqual(sorted(primes), sorted(maximal_implicants(ones, nb_vars)))
+
+    def test_minimal_covers(self):
+        rand = random.Random(2)
+        for i in range(300):
+            nb_vars = rand.randint(1, 4)
+            minterms = range(1 << nb_vars)
+            rand.shuffle(minterms)
+            nb_ones = rand.randint(1, len(minterms))
+            nb_dc = rand.randint(0, len(minterms)-nb_ones) if i % 2 else 0
+            self.check_cover(set(minterms[:nb_ones]), set(minterms[nb_ones:nb_ones+nb_dc]), nb_vars)
+
+    def test_cyclic_covers(self):
+        # Covering tables without essential prime
+        self.check_cover(set([0, 1, 3, 7, 6, 4]), set(), 3)
+        self.check_cover(set([0, 2, 5, 6, 7, 8, 10, 12, 13, 14, 15]), set(), 4)
+
+    def test_budget(self):
+        rand = random.Random(3)
+        nb_exhausted = 0
+        for i in range(200):
+            ones = rand.sample(range(64), rand.randint(10, 40))
+            (cover, minimal) = qm_cubes(ones, max_nodes=1)
+            (best_cover, best_minimal) = qm_cubes(ones, max_nodes=100000)
+            self.assertTrue(best_minimal)
+            self.assertTrue(set().union(*[cube_minterms(cube) for cube in cover]) >= set(ones))
+            if minimal:
+                self.assertEqual(len(cover), len(best_cover))
+            else:
+                self.assertTrue(len(cover) >= len(best_cover))
+                nb_exhausted += 1
+        self.assertTrue(nb_exhausted > 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from constants import *
+from result_cache import *
+
+OPTIONS = (LTL2BA, OPT12, ON, MINTEXT, MONO, MONO, FORWARD, 0, 5, 1, LINEAR, 60., REAL, FALSE, OFF, "examples/demo-lily/", "demo-v3")
+SOLUTION_SIZE = 1000
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, "cache")
+        self.solution_file = os.path.join(self.directory, "solution.txt")
+        f = open(self.solution_file, "w")
+        f.write(SOLUTION_SIZE*"x")
+        f.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    #### Adds the entry of key (with a solution) to the cache and sets its last use to last_use
+    def add(self, key, last_use, max_size=10*SOLUTION_SIZE):
+        add_to_result_cache(self.cache_dir, key, {"conclusive": True, "realizable": True}, self.solution_file, max_size)
+        os.utime(os.path.join(self.cache_dir, key + ".json"), (last_use, last_use))
+
+    def keys(self):
+        return sorted(set([os.path.splitext(name)[0] for name in os.listdir(self.cache_dir)]))
+
+    def test_entry_and_solution_restored(self):
+        self.add("a", 100)
+        entry = get_from_result_cache(self.cache_dir, "a")
+        self.assertEqual((entry["conclusive"], entry["realizable"]), (True, True))
+        restored_file = os.path.join(self.directory, "restored.txt")
+        self.assertTrue(restore_solution_from_result_cache(self.cache_dir, "a", restored_file))
+        self.assertEqual(open(restored_file).read(), SOLUTION_SIZE*"x")
+        self.assertEqual(get_from_result_cache(self.cache_dir, "b"), None)
+        self.assertFalse(restore_solution_from_result_cache(self.cache_dir, "b", restored_file))
+
+    def test_least_recently_used_evicted(self):
+        for (key, last_use) in [("a", 100), ("b", 200), ("c", 300)]:
+            self.add(key, last_use)
+        get_from_result_cache(self.cache_dir, "a") # a becomes the most recently used entry
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, "a.json")) + SOLUTION_SIZE
+        evict_from_result_cache(self.cache_dir, 2*entry_size)
+        self.assertEqual(self.keys(), ["a", "c"])
+        evict_from_result_cache(self.cache_dir, entry_size)
+        self.assertEqual(self.keys(), ["a"])
+
+    def test_eviction_when_adding(self):
+        self.add("a", 100)
+        self.add("b", 200)
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, "a.json")) + SOLUTION_SIZE
+        self.add("c", 300, 2*entry_size)
+        self.assertEqual(self.keys(), ["b", "c"])
+
+    def test_other_version_ignored(self):
+        self.add("a", 100)
+        f = open(os.path.join(self.cache_dir, "a.json"), "w")
+        f.write('{"conclusive": true, "realizable": true, "version": 0}')
+        f.close()
+        self.assertEqual(get_from_result_cache(self.cache_dir, "a"), None)
+
+    def test_key(self):
+        ltl_file = "examples/demo-lily/demo-v3.ltl"
+        part_file = "examples/demo-lily/demo-v3.part"
+        key = compute_cache_key(ltl_file, part_file, P_O, OPTIONS, None, False, QM_MAX_NODES)
+        # Options which do not change the verdict nor the solution
+        other_options = OPTIONS[:3] + (NONE,) + OPTIONS[4:15] + ("/tmp/", "other")
+        self.assertEqual(compute_cache_key(ltl_file, part_file, P_O, other_options, None, False, QM_MAX_NODES), key)
+        # Options which may change the solution
+        keys = set([key])
+        for (i, value) in [(1, OPT1), (2, OFF), (6, BACKWARD), (8, 4), (10, GALLOP), (14, ON)]:
+            keys.add(compute_cache_key(ltl_file, part_file, P_O, OPTIONS[:i] + (value,) + OPTIONS[i+1:], None, False, QM_MAX_NODES))
+        keys.add(compute_cache_key(ltl_file, part_file, P_I, OPTIONS, None, False, QM_MAX_NODES))
+        keys.add(compute_cache_key(ltl_file, part_file, P_O, OPTIONS, [(BACKWARD, ON, OPT12)], False, QM_MAX_NODES))
+        keys.add(compute_cache_key(ltl_file, part_file, P_O, OPTIONS, None, True, QM_MAX_NODES))
+        keys.add(compute_cache_key(ltl_file, part_file, P_O, OPTIONS, None, False, 10))
+        self.assertEqual(len(keys), 11)
+
+if __name__ == "__main__":
+    unittest.main()
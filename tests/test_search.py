@@ -0,0 +1,98 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import unittest
+
+from constants import *
+
+try:
+    import acacia_plus
+except (ImportError, OSError): # library of Acacia+ not built or pygraph not installed
+    acacia_plus = None
+
+#### Monotone oracle: a winning strategy is found for the indices >= threshold (the result of a test is (winning, index, test number))
+class MonotoneOracle(object):
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.tested = []
+        self.discarded = []
+
+    def test(self, i):
+        self.tested.append(i)
+        return (i >= self.threshold, i, len(self.tested))
+
+    def discard(self, result):
+        self.discarded.append(result)
+
+@unittest.skipIf(acacia_plus is None, "library of Acacia+ not built or pygraph not installed")
+class SearchMinimalIndexTest(unittest.TestCase):
+    def search(self, oracle, i_start, nb_indices, k_search):
+        return acacia_plus.search_minimal_index(oracle.test, oracle.discard, i_start, nb_indices, k_search, 60., NONE)
+
+    def test_same_index_as_linear(self):
+        for nb_indices in [1, 2, 7, 64]:
+            for i_start in range(nb_indices):
+                for threshold in range(nb_indices+2):
+                    linear = self.search(MonotoneOracle(threshold), i_start, nb_indices, LINEAR)
+                    if threshold < nb_indices:
+                        self.assertEqual(linear[0:2], (True, max(threshold, i_start)))
+                    else:
+                        self.assertEqual(linear, (False, -1, None))
+                    for k_search in [GALLOP, ADAPTIVE]:
+                        result = self.search(MonotoneOracle(threshold), i_start, nb_indices, k_search)
+                        self.assertEqual(result[0:2], linear[0:2], (nb_indices, i_start, threshold, k_search))
+
+    def test_result_of_minimal_index(self):
+        for k_search in [LINEAR, GALLOP, ADAPTIVE]:
+            oracle = MonotoneOracle(37)
+            (found, index, result) = self.search(oracle, 0, 64, k_search)
+            self.assertEqual(result[0:2], (True, 37))
+            # The other winning results have been discarded, and only them
+            winning_results = [(True, i, n+1) for (n, i) in enumerate(oracle.tested) if i >= 37]
+            self.assertEqual(sorted(oracle.discarded + [result]), sorted(winning_results))
+
+    def test_gallop_tests_fewer_indices(self):
+        linear = MonotoneOracle(60)
+        self.search(linear, 0, 64, LINEAR)
+        gallop = MonotoneOracle(60)
+        self.search(gallop, 0, 64, GALLOP)
+        self.assertEqual(len(linear.tested), 61)
+        self.assertTrue(len(gallop.tested) < 20)
+
+@unittest.skipIf(acacia_plus is None, "library of Acacia+ not built or pygraph not installed")
+class KCGridTest(unittest.TestCase):
+    def test_grid(self):
+        self.assertEqual(acacia_plus.k_c_grid(0, 3, 1, [0], [0], [0]), [(0, [0]), (1, [0]), (2, [0]), (3, [0])])
+        self.assertEqual(acacia_plus.k_c_grid(2, 7, 2, [1, 0], [4, 1], [1, 1]), [(2, [1, 0]), (4, [2, 1]), (6, [3, 1]), (7, [4, 1])])
+        self.assertEqual(acacia_plus.k_c_grid(3, 3, 0, [2], [2], [0]), [(3, [2])])
+
+    def test_grid_ordering(self):
+        for (k_start, k_bound, k_step) in [(0, 5, 1), (1, 10, 3), (4, 4, 1), (0, 6, 0)]:
+            for (c_start, c_bound, c_step) in [([0], [0], [0]), ([0, 2], [5, 3], [2, 1]), ([1], [9], [0])]:
+                grid = acacia_plus.k_c_grid(k_start, k_bound, k_step, c_start, c_bound, c_step)
+                self.assertEqual(grid[0], (k_start, c_start))
+                # The values of k and c increase (at least one of them strictly) up to their bounds
+                for ((k1, c1), (k2, c2)) in zip(grid[:-1], grid[1:]):
+                    self.assertTrue(k1 <= k2 and all([x1 <= x2 for (x1, x2) in zip(c1, c2)]))
+                    self.assertNotEqual((k1, c1), (k2, c2))
+                (k_last, c_last) = grid[-1]
+                self.assertTrue(k_last == k_bound or k_step == 0)
+                for j in range(len(c_bound)):
+                    self.assertTrue(c_last[j] == c_bound[j] or c_step[j] == 0)
+
+if __name__ == "__main__":
+    unittest.main()
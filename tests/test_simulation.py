@@ -0,0 +1,141 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import random
+import tempfile
+import unittest
+
+from constants import *
+
+try:
+    import numpy
+    import simulation
+    from synthesis import Strategy
+except (ImportError, OSError): # library of Acacia+ not built, pygraph or NumPy not installed
+    simulation = None
+
+INPUTS = ["r0", "r1", "r2"]
+OUTPUTS = ["g0", "g1"]
+
+#### Scalar simulation of strategy on trace (list of input valuations) from initial_state, reading the labels directly: at each step, the first
+#### edge of which a term is satisfied is taken (the outputs only depend on the state if the strategy starts (Moore machine): the terms of
+#### which outputs are not compatible with the first term of the state are then ignored)
+#### Returns the list of the outputs (simulation.UNDEFINED once the strategy has no transition for an input)
+def scalar_simulate(strategy, trace, initial_state):
+    state = initial_state
+    outputs = []
+    for valuation in trace:
+        if state == None:
+            outputs.append(simulation.UNDEFINED)
+            continue
+        chosen = None
+        first_outputs = None
+        for edge in strategy.edges(state):
+            for term in strategy.edge_terms[strategy.terms_offsets[edge]:strategy.terms_offsets[edge+1]]:
+                (outputs_cover, inputs_cover) = strategy.terms[term]
+                if first_outputs == None:
+                    first_outputs = outputs_cover[0][0]
+                if strategy.player == P_O and not [1 for (value, mask) in outputs_cover if first_outputs & ~mask == value]:
+                    continue
+                if chosen == None and [1 for (value, mask) in inputs_cover if valuation & ~mask == value]:
+                    chosen = (strategy.successors[edge], outputs_cover[0][0])
+        if chosen == None:
+            outputs.append(simulation.UNDEFINED)
+            state = None
+        else:
+            (state, output) = chosen
+            if strategy.player == P_O:
+                output = first_outputs
+            outputs.append(output)
+    return outputs
+
+#### Returns a random strategy with nb_states states, possibly non deterministic and not complete
+def random_strategy(rand, player, nb_states):
+    strategy = Strategy(INPUTS, OUTPUTS, player)
+    strategy.nb_states = nb_states
+    strategy.initial_states = set([0])
+    for state in range(nb_states):
+        edges = []
+        for i in range(rand.randint(0, 3)):
+            terms = []
+            for j in range(rand.randint(1, 2)):
+                outputs_cover = tuple([random_cube(rand, len(OUTPUTS)) for k in range(rand.randint(1, 2))])
+                inputs_cover = tuple([random_cube(rand, len(INPUTS)) for k in range(rand.randint(1, 3))])
+                terms.append(strategy.intern_term((outputs_cover, inputs_cover)))
+            edges.append((rand.randint(0, nb_states-1), terms))
+        strategy.add_state_edges(edges)
+    strategy.terms_index = {}
+    return strategy
+
+#### Returns a random cube (value, mask) over nb_signals signals
+def random_cube(rand, nb_signals):
+    mask = rand.randint(0, (1 << nb_signals)-1)
+    return (rand.randint(0, (1 << nb_signals)-1) & ~mask, mask)
+
+@unittest.skipIf(simulation is None, "library of Acacia+ not built, pygraph or NumPy not installed")
+class SimulationTest(unittest.TestCase):
+    def test_against_scalar_simulation(self):
+        rand = random.Random(1)
+        for i in range(100):
+            player = [P_O, P_I][i % 2]
+            strategy = random_strategy(rand, player, rand.randint(1, 6))
+            tables = simulation.compile_strategy(strategy, INPUTS, OUTPUTS, player)
+            traces = simulation.random_traces(20, 15, len(INPUTS), seed=i)
+            (outputs, first_mismatches) = simulation.simulate(tables, traces, 0)
+            for t in range(len(traces)):
+                expected = scalar_simulate(strategy, list(traces[t]), 0)
+                self.assertEqual(list(outputs[t]), expected)
+                undefined = [step for step in range(len(expected)) if expected[step] == simulation.UNDEFINED]
+                self.assertEqual(first_mismatches[t], undefined[0] if undefined else -1)
+
+    def test_expected_outputs(self):
+        rand = random.Random(2)
+        strategy = random_strategy(rand, P_I, 4)
+        tables = simulation.compile_strategy(strategy, INPUTS, OUTPUTS, P_I)
+        traces = simulation.random_traces(10, 8, len(INPUTS), seed=3)
+        (outputs, first_mismatches) = simulation.simulate(tables, traces, 0)
+        # The outputs of the simulation as expected outputs, but one changed
+        expected_outputs = outputs.copy()
+        expected_outputs[4, 5] = (outputs[4, 5]+1) % (1 << len(OUTPUTS))
+        (outputs, mismatches) = simulation.simulate(tables, traces, 0, expected_outputs)
+        for t in range(len(traces)):
+            if t == 4 and (first_mismatches[t] == -1 or first_mismatches[t] > 5):
+                self.assertEqual(mismatches[t], 5)
+            else:
+                self.assertEqual(mismatches[t], first_mismatches[t])
+    def test_partly_expected_outputs(self):
+        # One state: outputs 2 for the inputs 1 and 3, 1 for the input 0
+        strategy = Strategy(INPUTS, OUTPUTS, P_I)
+        strategy.nb_states = 1
+        strategy.initial_states = set([0])
+        strategy.add_state_edges([(0, [strategy.intern_term((((2, 0),), ((1, 0), (3, 0)))), strategy.intern_term((((1, 0),), ((0, 0),)))])])
+        tables = simulation.compile_strategy(strategy, INPUTS, OUTPUTS, P_I)
+        (fd, traces_file) = tempfile.mkstemp(suffix=".trc")
+        os.write(fd, "1/2 3 0/1\n1 3/2 0/2\n1 3 0\n")
+        os.close(fd)
+        try:
+            (traces, expected_outputs) = simulation.read_traces(traces_file)
+        finally:
+            os.remove(traces_file)
+        (outputs, mismatches) = simulation.simulate(tables, traces, 0, expected_outputs)
+        self.assertEqual(outputs.tolist(), [[2, 2, 1], [2, 2, 1], [2, 2, 1]])
+        # The steps without expected output are not mismatches
+        self.assertEqual(mismatches.tolist(), [-1, 2, -1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+# This file is part of Acacia+, a tool for synthesis of reactive systems using antichain-based techniques
+# Copyright (C) 2011-2013 UMONS-ULB
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import shutil
+import tempfile
+import unittest
+import StringIO
+
+from constants import *
+
+try:
+    import synthesis
+    import acacia_plus
+except (ImportError, OSError): # library of Acacia+ not built or pygraph not installed
+    synthesis = None
+
+INPUTS = ["r0", "r1", "r2"]
+OUTPUTS = ["g0", "g1"]
+TRUE_I = (0, 7) # cube True over INPUTS
+TRUE_O = (0, 3) # cube True over OUTPUTS
+
+#### Returns the text of strategy written by Strategy.write
+def strategy_text(strategy):
+    f = StringIO.StringIO()
+    strategy.write(f)
+    return f.getvalue()
+
+#### Returns a Strategy with nb_states states of which edges are edges[state] = list of (successor, list of terms)
+def make_strategy(player, nb_states, initial_states, edges):
+    strategy = synthesis.Strategy(INPUTS, OUTPUTS, player)
+    strategy.nb_states = nb_states
+    strategy.initial_states = set(initial_states)
+    for state in range(nb_states):
+        strategy.add_state_edges([(successor, [strategy.intern_term(term) for term in terms]) for (successor, terms) in edges.get(state, [])])
+    strategy.terms_index = {}
+    return strategy
+
+@unittest.skipIf(synthesis is None, "library of Acacia+ not built or pygraph not installed")
+class SolutionRoundtripTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    #### Writes strategy in a file, reads it back and checks that the strategy read is the same
+    def check_roundtrip(self, strategy):
+        solution_file = os.path.join(self.directory, "solution.txt")
+        f = open(solution_file, "w")
+        strategy.write(f)
+        f.close()
+        read = synthesis.read_solution(solution_file, strategy.inputs, strategy.outputs, strategy.player)
+        self.assertEqual(read.nb_states, strategy.nb_states)
+        self.assertEqual(read.initial_states, strategy.initial_states)
+        self.assertEqual(list(read.offsets), list(strategy.offsets))
+        self.assertEqual(list(read.successors), list(strategy.successors))
+        for edge in range(len(strategy.successors)):
+            read_terms = [read.terms[t] for t in read.edge_terms[read.terms_offsets[edge]:read.terms_offsets[edge+1]]]
+            terms = [strategy.terms[t] for t in strategy.edge_terms[strategy.terms_offsets[edge]:strategy.terms_offsets[edge+1]]]
+            self.assertEqual(read_terms, terms)
+        self.assertEqual(strategy_text(read), strategy_text(strategy))
+        return read
+
+    def test_roundtrip(self):
+        edges = {0: [(1, [(((2, 0),), ((5, 0), (0, 6))), (((1, 0),), (TRUE_I,))]), (0, [((TRUE_O,), ((4, 3),))])],
+                 1: [(2, [(((0, 1),), ((1, 2),))])],
+                 2: [(0, [(((3, 0),), ((0, 0),)), (((3, 0),), ((7, 0), (2, 5), (1, 0)))])]}
+        for player in [P_O, P_I]:
+            self.check_roundtrip(make_strategy(player, 3, [0], edges))
+        self.check_roundtrip(make_strategy(P_O, 4, [1, 3], edges)) # state 3 without edge
+
+    def test_labels(self):
+        edges = {0: [(0, [(((2, 0),), ((5, 0), (0, 6))), ((TRUE_O,), (TRUE_I,))])]}
+        self.assertEqual(make_strategy(P_O, 1, [0], edges).edge_label(0), "((g0 && !g1) U ((r0 && !r1 && r2) || (!r2))) || ((1) U (T))")
+        self.assertEqual(make_strategy(P_I, 1, [0], edges).edge_label(0), "(((r0 && !r1 && r2) || (!r2)) U (g0 && !g1)) || ((T) U (1))")
+
+    def test_roundtrip_of_synthesized_solutions(self):
+        for name in ["demo-v5", "demo-v16"]:
+            for extension in [".ltl", ".part"]:
+                shutil.copyfile(os.path.join("examples", "demo-lily", name + extension), os.path.join(self.directory, name + extension))
+            for (player, set_of_strategies) in [(P_O, FALSE), (P_I, TRUE)]:
+                options = (LTL2BA, OPT12, ON, NONE, MONO, MONO, BACKWARD, 0, 5, 1, LINEAR, 60., REAL, set_of_strategies, OFF, self.directory + "/", name)
+                self.assertEqual(acacia_plus.synthetize(os.path.join(self.directory, name + ".ltl"), os.path.join(self.directory, name + ".part"), player, options), (True, True))
+                (inputs, outputs) = acacia_plus.parse_partition(os.path.join(self.directory, name + ".part"))[0:2]
+                solution_file = os.path.join(self.directory, name + ".txt")
+                read = synthesis.read_solution(solution_file, inputs, outputs, player)
+                self.assertEqual(strategy_text(read), open(solution_file).read())
+                self.check_roundtrip(read)
+
+    def test_wrong_labels(self):
+        for label in ["", "((g0) U (r0)", "((g0) U (r0)) ||", "((g0) (r0))", "((g0 && !g0) U (r0))", "((g2) U (r0))", "((r0) U (g0))",
+                      "((g0 &&) U (r0))", "((g0) U (r0 || ))", "((g0) U (r0))) || ((g1) U (r1))", "((g0) U (r0 | r1))"]:
+            self.assertEqual(synthesis.parse_edge_label(label, INPUTS, OUTPUTS, P_O), None, label)
+        self.assertEqual(synthesis.parse_edge_label("((g0) U (r0)) || ((!g1 && g0) U ((r1) || (!r2 && r0)))", INPUTS, OUTPUTS, P_O),
+                         [(((2, 1),), ((4, 3),)), (((2, 0),), ((2, 5), (4, 2)))])
+
+#### Returns the greatest bisimulation between the states of strategy1 and strategy2 (of which terms are the same), as a set of pairs (state of
+#### strategy1, state of strategy2); the label of an edge being the disjunction of its terms, a state has a transition labeled t for each term
+#### t of the label of each of its edges
+def bisimulation(strategy1, strategy2):
+    def transitions(strategy, state):
+        return set([(term, strategy.successors[edge]) for edge in strategy.edges(state)
+                    for term in strategy.edge_terms[strategy.terms_offsets[edge]:strategy.terms_offsets[edge+1]]])
+    transitions1 = [transitions(strategy1, state) for state in range(strategy1.nb_states)]
+    transitions2 = [transitions(strategy2, state) for state in range(strategy2.nb_states)]
+    relation = set([(s1, s2) for s1 in range(strategy1.nb_states) for s2 in range(strategy2.nb_states)])
+    changed = True
+    while changed:
+        changed = False
+        for (s1, s2) in list(relation):
+            if not (all([[t2 for (b, t2) in transitions2[s2] if b == a and (t1, t2) in relation] for (a, t1) in transitions1[s1]]) and
+                    all([[t1 for (a, t1) in transitions1[s1] if a == b and (t1, t2) in relation] for (b, t2) in transitions2[s2]])):
+                relation.remove((s1, s2))
+                changed = True
+    return relation
+
+@unittest.skipIf(synthesis is None, "library of Acacia+ not built or pygraph not installed")
+class MinimizeStrategyTest(unittest.TestCase):
+    #### Returns a random strategy with at most max_states states, of which terms are picked among nb_terms terms (deterministic if
+    #### deterministic: one term per label and at most one edge per term from each state)
+    def random_strategy(self, random, max_states, nb_terms, deterministic):
+        terms = [(((t % 4, 0),), ((t / 4, 0),)) for t in range(nb_terms)]
+        nb_states = random.randint(1, max_states)
+        edges = {}
+        for state in range(nb_states):
+            if deterministic:
+                labels = [[t] for t in random.sample(range(nb_terms), random.randint(0, nb_terms))]
+            else:
+                labels = [random.sample(range(nb_terms), random.randint(1, 2)) for i in range(random.randint(0, 4))]
+            edges[state] = [(random.randint(0, nb_states-1), [terms[t] for t in label]) for label in labels]
+        return make_strategy(P_O, nb_states, random.sample(range(nb_states), random.randint(1, min(2, nb_states))), edges)
+
+    #### Minimizes strategy and checks that the minimized strategy is bisimilar to it (and minimal if strategy is deterministic)
+    def check_minimized(self, strategy, separate_initial_states, deterministic):
+        minimized = synthesis.minimize_strategy(strategy, separate_initial_states)
+        self.assertEqual(minimized.nb_states_before_minimization, strategy.nb_states)
+        self.assertEqual((minimized.inputs, minimized.outputs, minimized.player), (strategy.inputs, strategy.outputs, strategy.player))
+        # Each state is bisimilar to a state of the other strategy, the initial states to initial states
+        relation = bisimulation(strategy, minimized)
+        for state in range(strategy.nb_states):
+            self.assertTrue([m for m in range(minimized.nb_states) if (state, m) in relation])
+        for m in range(minimized.nb_states):
+            self.assertTrue([state for state in range(strategy.nb_states) if (state, m) in relation])
+        for state in strategy.initial_states:
+            self.assertTrue([m for m in minimized.initial_states if (state, m) in relation])
+        for m in minimized.initial_states:
+            self.assertTrue([state for state in strategy.initial_states if (state, m) in relation])
+        if deterministic:
+            # No two states of the minimized strategy are bisimilar (but an initial state and a non initial one if they are separated)
+            for (m1, m2) in bisimulation(minimized, minimized):
+                if m1 != m2:
+                    self.assertTrue(separate_initial_states and (m1 in minimized.initial_states) != (m2 in minimized.initial_states))
+        return minimized
+
+    def test_minimize_random_strategies(self):
+        import random
+        random = random.Random(1)
+        for i in range(300):
+            deterministic = i % 2 == 0
+            strategy = self.random_strategy(random, 10, 3, deterministic)
+            for separate_initial_states in [False, True]:
+                minimized = self.check_minimized(strategy, separate_initial_states, deterministic)
+                if deterministic: # otherwise, edges to the same block are merged and their labels may then be equal sets of terms
+                    self.assertEqual(synthesis.minimize_strategy(minimized, separate_initial_states).nb_states, minimized.nb_states)
+
+    def test_minimize(self):
+        # States 1 and 2 are bisimilar, state 3 is not (its successor has no edge)
+        a = (((1, 0),), (TRUE_I,))
+        b = (((2, 0),), (TRUE_I,))
+        edges = {0: [(1, [a]), (2, [b])], 1: [(0, [a, b])], 2: [(0, [b, a])], 3: [(4, [a, b])], 4: []}
+        minimized = self.check_minimized(make_strategy(P_O, 5, [0, 3], edges), False, False)
+        self.assertEqual(strategy_text(minimized), strategy_text(make_strategy(P_O, 4, [0, 2], {0: [(1, [a, b])], 1: [(0, [a, b])], 2: [(3, [a, b])]})))
+
+if __name__ == "__main__":
+    unittest.main()
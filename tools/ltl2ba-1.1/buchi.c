@@ -649,5 +649,7 @@ void mk_buchi()
     }
   }
 
+#ifndef LTL2BA_LIBRARY /* the library reads bstates (see ltl2ba_lib.c) */
   print_spin_buchi();
+#endif
 }
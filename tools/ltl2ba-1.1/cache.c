@@ -96,6 +96,15 @@ cached(Node *n)
 	return dupnode(d->after);
 }
 
+#ifdef LTL2BA_LIBRARY
+void
+cache_clear(void)
+{	/* the entries are released with all the blocks by tl_free_all */
+	stored = (Cache *) 0;
+	Caches = CacheHits = 0;
+}
+#endif
+
 void
 cache_stats(void)
 {
@@ -175,6 +175,14 @@ tl_lookup(char *s)
 	return sp;
 }
 
+#ifdef LTL2BA_LIBRARY
+void
+tl_clear_symbols(void)
+{	/* the symbols are released with all the blocks by tl_free_all */
+	memset(symtab, 0, sizeof(symtab));
+}
+#endif
+
 Symbol *
 getsym(Symbol *s)
 {	Symbol *n = (Symbol *) tl_emalloc(sizeof(Symbol));
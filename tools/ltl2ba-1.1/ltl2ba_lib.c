@@ -0,0 +1,227 @@
+/***** ltl2ba : ltl2ba_lib.c *****/
+
+/* Shared library entry point of ltl2ba (libltl2ba.so, see the Makefile)  */
+/* Written for Acacia+, a tool for synthesis of reactive systems using    */
+/* antichain-based techniques                                             */
+/* Copyright (C) 2011-2013 UMONS-ULB                                      */
+/*                                                                        */
+/* This program is free software; you can redistribute it and/or modify   */
+/* it under the terms of the GNU General Public License as published by   */
+/* the Free Software Foundation; either version 2 of the License, or      */
+/* (at your option) any later version.                                    */
+/*                                                                        */
+/* This program is distributed in the hope that it will be useful,        */
+/* but WITHOUT ANY WARRANTY; without even the implied warranty of         */
+/* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the          */
+/* GNU General Public License for more details.                           */
+/*                                                                        */
+/* You should have received a copy of the GNU General Public License      */
+/* along with this program; if not, write to the Free Software            */
+/* Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA */
+
+#include "ltl2ba.h"
+#include <setjmp.h>
+
+extern FILE *tl_out;
+extern jmp_buf tl_done;
+extern int tl_set_uform(char *);
+extern int tl_errs, tl_yychar;
+extern char **sym_table;
+extern int node_id, sym_id, astate_count, atrans_count;
+extern int init_size, gstate_id, gstate_count, gtrans_count;
+extern BState *bstates;
+extern int accept, bstate_count, btrans_count;
+extern int mod, sym_size;
+extern void tl_free_all(void);
+extern void tl_clear_symbols(void);
+extern void cache_clear(void);
+
+/* Buchi automaton translated from a formula, with the states in the order
+   of the never claim printed by the ltl2ba executable (print_spin_buchi).
+   State id is -1 for the initial state, 0 for the state accepting all
+   words and positive otherwise. The transitions are sorted by source
+   state (trans_from). The label of transition t is the cube
+   literals[literals_offsets[t]] ... literals[literals_offsets[t+1]-1],
+   a literal being i+1 (symbols[i]) or -(i+1) (!symbols[i]), in the order
+   of the never claim; the empty cube is true. The automaton owns its
+   arrays and the names of its symbols (see ltl2ba_free). */
+typedef struct LTL2BAAutomaton {
+  int nb_symbols;
+  char **symbols;
+  int nb_states;
+  int *state_ids;
+  int *state_finals;
+  char *accepting;
+  int nb_trans;
+  int *trans_from;
+  int *trans_to;
+  int *literals_offsets;
+  int *literals;
+} LTL2BAAutomaton;
+
+/********************************************************************\
+|*                   Conversion of the automaton                    *|
+\********************************************************************/
+
+static void *lib_malloc(int n)
+{
+  void *tmp = malloc(n > 0 ? n : 1);
+  if(!tmp) fatal("not enough memory", (char *)0);
+  return tmp;
+}
+
+static int cube_size(int *pos, int *neg)
+{
+  int i, j, size = 0;
+  for(i = 0; i < sym_size; i++)
+    for(j = 0; j < mod; j++) {
+      if(pos[i] & (1 << j)) size++;
+      if(neg[i] & (1 << j)) size++;
+    }
+  return size;
+}
+
+static int fill_cube(int *pos, int *neg, int *literals)
+{ /* same order as spin_print_set */
+  int i, j, size = 0;
+  for(i = 0; i < sym_size; i++)
+    for(j = 0; j < mod; j++) {
+      if(pos[i] & (1 << j)) literals[size++] = mod * i + j + 1;
+      if(neg[i] & (1 << j)) literals[size++] = -(mod * i + j + 1);
+    }
+  return size;
+}
+
+static void add_state(LTL2BAAutomaton *aut, BState *s, int id, int final, int accepting)
+{
+  if(s) s->incoming = aut->nb_states; /* no longer used: index of s in aut */
+  aut->state_ids[aut->nb_states] = id;
+  aut->state_finals[aut->nb_states] = final;
+  aut->accepting[aut->nb_states] = accepting;
+  aut->nb_states++;
+}
+
+static void add_trans(LTL2BAAutomaton *aut, int from, int to, BTrans *t)
+{
+  int size = t ? fill_cube(t->pos, t->neg, aut->literals + aut->literals_offsets[aut->nb_trans]) : 0;
+  aut->trans_from[aut->nb_trans] = from;
+  aut->trans_to[aut->nb_trans] = to;
+  aut->literals_offsets[aut->nb_trans+1] = aut->literals_offsets[aut->nb_trans] + size;
+  aut->nb_trans++;
+}
+
+static void make_automaton(LTL2BAAutomaton *aut)
+{ /* same automaton as the never claim printed by print_spin_buchi */
+  BState *s, *all = (BState *)0;
+  BTrans *t;
+  int i, nb_states = 1, nb_trans = 1, nb_literals = 0;
+
+  for(s = bstates->nxt; s != bstates; s = s->nxt, nb_states++)
+    for(t = s->trans->nxt; t != s->trans; t = t->nxt, nb_trans++)
+      nb_literals += cube_size(t->pos, t->neg);
+
+  /* the names are copied: sym_table is released with the translation */
+  aut->symbols = (char **)lib_malloc(sym_id * sizeof(char *));
+  memset(aut->symbols, 0, sym_id * sizeof(char *));
+  aut->nb_symbols = sym_id;
+  for(i = 0; i < sym_id; i++) {
+    aut->symbols[i] = (char *)lib_malloc(strlen(sym_table[i]) + 1);
+    strcpy(aut->symbols[i], sym_table[i]);
+  }
+  aut->state_ids = (int *)lib_malloc(nb_states * sizeof(int));
+  aut->state_finals = (int *)lib_malloc(nb_states * sizeof(int));
+  aut->accepting = (char *)lib_malloc(nb_states * sizeof(char));
+  aut->trans_from = (int *)lib_malloc(nb_trans * sizeof(int));
+  aut->trans_to = (int *)lib_malloc(nb_trans * sizeof(int));
+  aut->literals_offsets = (int *)lib_malloc((nb_trans + 1) * sizeof(int));
+  aut->literals = (int *)lib_malloc(nb_literals * sizeof(int));
+  aut->literals_offsets[0] = 0;
+
+  if(bstates->nxt == bstates) { /* empty automaton */
+    add_state(aut, (BState *)0, -1, 0, 0);
+    return;
+  }
+  if(bstates->nxt->nxt == bstates && bstates->nxt->id == 0) { /* true */
+    add_state(aut, (BState *)0, -1, accept, 1);
+    add_trans(aut, 0, 0, (BTrans *)0);
+    return;
+  }
+
+  for(s = bstates->prv; s != bstates; s = s->prv) {
+    if(s->id == 0) /* accept_all at the end */
+      all = s;
+    else
+      add_state(aut, s, s->id, s->final, s->final == accept);
+  }
+  if(all)
+    add_state(aut, all, 0, all->final, 1);
+
+  for(s = bstates->prv; s != bstates; s = s->prv)
+    if(s->id != 0)
+      for(t = s->trans->nxt; t != s->trans; t = t->nxt)
+        add_trans(aut, s->incoming, t->to->incoming, t);
+  if(all) /* skip */
+    add_trans(aut, all->incoming, all->incoming, (BTrans *)0);
+}
+
+/********************************************************************\
+|*                          Entry points                            *|
+\********************************************************************/
+
+static void release_translation()
+{ /* everything allocated by the translation, pools and free lists included */
+  tl_free_all();
+  tl_clear_symbols();
+  cache_clear();
+}
+
+void ltl2ba_free(LTL2BAAutomaton *aut)
+{
+  int i;
+  if(!aut) return;
+  if(aut->symbols)
+    for(i = 0; i < aut->nb_symbols; i++)
+      free(aut->symbols[i]);
+  free(aut->symbols);
+  free(aut->state_ids);
+  free(aut->state_finals);
+  free(aut->accepting);
+  free(aut->trans_from);
+  free(aut->trans_to);
+  free(aut->literals_offsets);
+  free(aut->literals);
+  free(aut);
+}
+
+LTL2BAAutomaton *ltl2ba_translate(char *formula)
+{ /* translates formula as ltl2ba -f formula, returns 0 on error (the
+     message is printed on stdout as by the executable) */
+  LTL2BAAutomaton *aut;
+
+  if(!tl_set_uform(formula)) {
+    printf("ltl2ba: formula too long\n");
+    return (LTL2BAAutomaton *)0;
+  }
+  tl_out = stdout;
+  tl_yychar = 0;
+  node_id = 1; sym_id = 0; astate_count = 0; atrans_count = 0;
+  init_size = 0; gstate_id = 1; gstate_count = 0; gtrans_count = 0;
+  bstate_count = 0; btrans_count = 0;
+
+  aut = (LTL2BAAutomaton *)calloc(1, sizeof(LTL2BAAutomaton));
+  if(!aut) return aut;
+  if(setjmp(tl_done)) { /* alldone called by a fatal error */
+    ltl2ba_free(aut);
+    release_translation();
+    return (LTL2BAAutomaton *)0;
+  }
+  tl_parse();
+  if(tl_errs) {
+    ltl2ba_free(aut);
+    release_translation();
+    return (LTL2BAAutomaton *)0;
+  }
+  make_automaton(aut);
+  release_translation();
+  return aut;
+}
@@ -31,6 +31,9 @@
 /* Written by Gerard J. Holzmann, Bell Laboratories, U.S.A.               */
 
 #include "ltl2ba.h"
+#ifdef LTL2BA_LIBRARY
+#include <setjmp.h>
+#endif
 
 FILE	*tl_out;
 
@@ -54,6 +57,36 @@ static char     out1[64];
 static void	tl_endstats(void);
 static void	non_fatal(char *, char *);
 
+#ifdef LTL2BA_LIBRARY
+jmp_buf	tl_done;	/* set by ltl2ba_translate, see ltl2ba_lib.c */
+
+void
+alldone(int estatus)
+{	/* the process is not ours: back to ltl2ba_translate */
+	longjmp(tl_done, estatus ? estatus : 1);
+}
+
+int
+tl_set_uform(char *formula)
+{	int i;
+
+	if (strlen(formula) >= sizeof(uform))
+		return 0;
+	for (i = 0; formula[i]; i++)
+	{	if (formula[i] == '\t'
+		||  formula[i] == '\"'
+		||  formula[i] == '\n')
+			uform[i] = ' ';
+		else
+			uform[i] = formula[i];
+	}
+	uform[i] = '\0';
+	hasuform = i;
+	cnt = 0;
+	tl_errs = 0;
+	return 1;
+}
+#else
 void
 alldone(int estatus)
 {
@@ -61,6 +94,7 @@ alldone(int estatus)
                 (void) unlink((const char *)out1);
         exit(estatus);
 }
+#endif
 
 FILE *
 cpyfile(char *src, char *tgt)
@@ -155,6 +189,7 @@ tl_main(int argc, char *argv[])
 	return tl_errs;
 }
 
+#ifndef LTL2BA_LIBRARY
 int
 main(int argc, char *argv[])
 {	int i;
@@ -206,6 +241,7 @@ main(int argc, char *argv[])
 		usage();
 	}
 }
+#endif
 
 /* Subtract the `struct timeval' values X and Y, storing the result X-Y in RESULT.
    Return 1 if the difference is negative, otherwise 0.  */
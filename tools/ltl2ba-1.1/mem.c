@@ -67,6 +67,46 @@ static union M *freelist[A_LARGE];
 static long	req[A_LARGE];
 static long	event[NREVENT][A_LARGE];
 
+#ifdef LTL2BA_LIBRARY
+/* blocks obtained from emalloc, released by tl_free_all at the end of
+   each translation of the library (see ltl2ba_lib.c) */
+static void	**blocks = (void **)0;
+static int	nr_blocks = 0, max_blocks = 0;
+
+static void *
+tl_block(int n)
+{	void *b = emalloc(n);
+	void **tmp;
+
+	if (nr_blocks == max_blocks)
+	{	max_blocks = max_blocks ? 2*max_blocks : 64;
+		if (!(tmp = (void **) realloc(blocks, max_blocks*sizeof(void *))))
+		{	free(b);
+			fatal("not enough memory", (char *)0);
+		}
+		blocks = tmp;
+	}
+	blocks[nr_blocks++] = b;
+	return b;
+}
+
+void
+tl_free_all(void)
+{	int i;
+
+	for (i = 0; i < nr_blocks; i++)
+		free(blocks[i]);
+	nr_blocks = 0;
+	memset(freelist, 0, sizeof(freelist));
+	memset(req, 0, sizeof(req));
+	atrans_list = (ATrans *)0;
+	gtrans_list = (GTrans *)0;
+	btrans_list = (BTrans *)0;
+}
+#else
+#define tl_block(n)	emalloc(n)
+#endif
+
 void *
 tl_emalloc(int U)
 {	union M *m;
@@ -79,7 +119,7 @@ tl_emalloc(int U)
 	{	log(ALLOC, 0, 1);
 		if (tl_verbose)
 		printf("tl_spin: memalloc %ld bytes\n", u);
-		m = (union M *) emalloc((int) u*sizeof(union M));
+		m = (union M *) tl_block((int) u*sizeof(union M));
 		All_Mem += (unsigned long) u*sizeof(union M);
 	} else
 	{	if (!freelist[u])
@@ -88,7 +128,7 @@ tl_emalloc(int U)
 				r = req[u] = NOTOOBIG;
 			log(POOL, u, r);
 			freelist[u] = (union M *)
-				emalloc((int) r*u*sizeof(union M));
+				tl_block((int) r*u*sizeof(union M));
 			All_Mem += (unsigned long) r*u*sizeof(union M);
 			m = freelist[u] + (r-2)*u;
 			for ( ; m >= freelist[u]; m -= u)
@@ -31,7 +31,7 @@ def controled_print(text, req_verb, verbosity):
         print text,
 
 #### Displays the execution parameters
-def display_parameters(player, tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, tocheck, set_of_strategies):
+def display_parameters(player, tool, opt, critical, verbosity, nbw_constr, chk_method, chk_dir, k_start, k_bound, k_step, k_search, k_budget, tocheck, set_of_strategies, warm_start):
     controled_print("Execution parameters: \n", [ALLTEXT, MINTEXT], verbosity)
     controled_print("   -Method: LTL to coBuchi translation: "+nbw_constr+", LTL synthesis: "+chk_method+",", [ALLTEXT, MINTEXT], verbosity)
     controled_print("Algorithm: "+chk_dir+"\n" , [ALLTEXT, MINTEXT], verbosity)
@@ -46,7 +46,7 @@ def display_parameters(player, tool, opt, critical, verbosity, nbw_constr, chk_m
         verb = 2
     else:
         verb = 0
-    controled_print("k values: from "+str(k_start)+" to "+str(k_bound)+" with incremental step of "+str(k_step)+", Verbosity: "+str(verb)+", To check: "+str(tocheck)+", To compute:", [ALLTEXT, MINTEXT], verbosity)
+    controled_print("k values: from "+str(k_start)+" to "+str(k_bound)+" with incremental step of "+str(k_step)+" ("+k_search+" search"+(k_search == ADAPTIVE and ", budget of "+str(k_budget)+"s" or "")+"), Verbosity: "+str(verb)+", To check: "+str(tocheck)+", To compute:", [ALLTEXT, MINTEXT], verbosity)
     if set_of_strategies == TRUE:
         controled_print("several winning strategies\n", [ALLTEXT, MINTEXT], verbosity)
     else:
@@ -57,7 +57,7 @@ def display_parameters(player, tool, opt, critical, verbosity, nbw_constr, chk_m
         opt1 = "on"
     if opt in [OPT12, OPT2]:
         opt2 = "on"  
-    controled_print("   -Optimizations: Detect bounded/unbounded states: "+opt1+", Detect k-surely losing states: "+opt2+", Critical signals: "+critical+"\n\n" , [ALLTEXT, MINTEXT], verbosity)
+    controled_print("   -Optimizations: Detect bounded/unbounded states: "+opt1+", Detect k-surely losing states: "+opt2+", Critical signals: "+critical+", Warm start: "+warm_start+"\n\n" , [ALLTEXT, MINTEXT], verbosity)
  
          
 #### Converts a boolean formula to a propositions array to create the c labels
@@ -178,7 +178,6 @@ def convert_proptab_to_int_value(prop_tab, props_size):
             
     return int(result_string, 2)
     
-
 #### Converts the list to a POINTER(c_int) (to pass to the dylib C)
 def convert_list_to_c_format(list):
     if len(list) > 0: